@@ -17,38 +17,75 @@
 ################################################################################
 '''Guerilla tool UI to update Frustum GoboMaps with published goboMaps if any.
 
+Directories of resolved gobo maps are watched while the UI is open, rows of
+gobo maps published meanwhile are resolved again.
+
 @package dlGuerillaGui.updateFrustumGoboMaps
 @author Esteban Ortega <esteban.ortega@latelieranimation.com>
 '''
 
 import os
-import re
 
 import guerilla
 
 import dlAction
-import dlConstants
 import dlGuerillaTools
+import dlGuerillaTools.goboLightIndex
+import dlGuerillaTools.goboMapCache
+import dlGuerillaTools.goboMapResolver
+import dlGuerillaTools.goboMapUpdater
 
-import ddConstants.guerilla
-import ddGuerillaApi
 import ddGui
 import ddPath
 
-__all__ = ( 'DLUpdateFrustumGoboMapsDialog' , )
+__all__ = ( 'DLGoboMapTableModel'           ,
+            'DLUpdateFrustumGoboMapsDialog' )
 
-class DLUpdateFrustumGoboMapsDialog( ddGui.QtWidgets.QDialog ):
-    '''Dialog to update and report gobo frustum maps status.
+class DLGoboMapTableModel( ddGui.QtCore.QAbstractTableModel ):
+    '''Table model of frustum gobo maps. Rows are records read from the
+    scene upfront but resolved lazily, a page at a time, as views fetch
+    them.
+
+    Directories of fetched gobo maps and of their published file are
+    watched, QFileSystemWatcher relies on inotify on Linux and polls
+    elsewhere. When one changes only the paths it holds are resolved
+    again.
     '''
 
-    ## Define color for QtreeWidgetItem when updated (green).
+    ## Define column headers.
+    # type: tuple
+    DL_HEADERS = ( 'Light Name'        ,
+                   'Frustum Full Name' ,
+                   'Status'            ,
+                   'File Path'         ,
+                   'Version'           ,
+                   'Nuke script'       )
+
+    ## Define record attribute shown in each column.
+    # type: tuple
+    DL_COLUMN_ATTRIBUTES = ( 'lightName'   ,
+                             'frustumName' ,
+                             'status'      ,
+                             'path'        ,
+                             'version'     ,
+                             'nukeScript'  )
+
+    ## Number of rows resolved per fetch.
+    # type: int
+    DL_FETCH_SIZE = 50
+
+    ## Delay in milliseconds before watched changes are resolved, a publish
+    ## changes many files.
+    # type: int
+    DL_WATCH_DELAY = 1000
+
+    ## Define color for rows when updated (green).
     # type: QColor
     _DL_UPDATE_COLOR = ddGui.QtGui.QColor( 120 ,
                                            255 ,
                                            160 )
 
-    ## Define color for QtreeWidgetItem when there is a publish file
-    # will update.
+    ## Define color for rows when there is a publish file will update.
     # type: QColor
     _DL_WILL_UPDATE_COLOR = ddGui.QtGui.QColor( 240 ,
                                                 160 ,
@@ -56,15 +93,426 @@ class DLUpdateFrustumGoboMapsDialog( ddGui.QtWidgets.QDialog ):
 
     ## Define status for gobo map.
     # type: tuple
-    _DL_STATUS = ( 'Published'               ,
-                   'Updated'                 ,
-                   'Will update'             ,
-                   'Offpipe / Not Published' ,
-                   'Empty File Path'         )
+    _DL_STATUS = dlGuerillaTools.goboMapResolver.DLGoboMapResolver.DL_STATUS
+
+    def __init__( self            ,
+                  inParent = None ):
+        '''Initialize class.
+
+        @param(QObject) inParent:
+        Parent object.
+
+        @return(None):
+        No return value.
+        '''
+
+        super( DLGoboMapTableModel , self ).__init__( inParent )
+
+        ## All records, fetched or not.
+        # type: list[dlGuerillaTools.goboFrustumRecord.DLGoboFrustumRecord]
+        self.__records = []
+
+        ## Number of rows fetched, exposed to views.
+        # type: int
+        self.__fetchedCount = 0
+
+        ## Updater resolving records, its resolutions are shared by the
+        ## records of a same gobo map.
+        # type: dlGuerillaTools.goboMapUpdater.DLGoboMapUpdater
+        self.__updater = dlGuerillaTools.goboMapUpdater.DLGoboMapUpdater()
+
+        ## Background brushes by status.
+        # type: dict[str, QBrush]
+        self.__brushes = {
+            self._DL_STATUS[ 0 ] : ddGui.QtGui.QBrush( self._DL_UPDATE_COLOR      ) ,
+            self._DL_STATUS[ 1 ] : ddGui.QtGui.QBrush( self._DL_UPDATE_COLOR      ) ,
+            self._DL_STATUS[ 2 ] : ddGui.QtGui.QBrush( self._DL_WILL_UPDATE_COLOR ) }
+
+        ## Gobo map paths by watched directory.
+        # type: dict[str, set[str]]
+        self.__pathsByDirectory = {}
+
+        ## Watched directories changed since last refresh.
+        # type: set[str]
+        self.__changedDirectories = set()
+
+        ## Watcher of gobo map directories.
+        # type: QFileSystemWatcher
+        self.__watcher = ddGui.QtCore.QFileSystemWatcher( self )
+        self.__watcher.directoryChanged.connect( self.__onDirectoryChanged )
+
+        ## Timer grouping watched changes.
+        # type: QTimer
+        self.__refreshTimer = ddGui.QtCore.QTimer( self )
+        self.__refreshTimer.setSingleShot( True )
+        self.__refreshTimer.setInterval( self.DL_WATCH_DELAY )
+        self.__refreshTimer.timeout.connect( self.__refresh )
+
+        return
+
+    def __fetch( self       ,
+                 inParent   ,
+                 inCountInt ):
+        '''Resolves next rows and exposes them to views.
+
+        @param(QModelIndex) inParent:
+        Parent index, only the root has rows.
+
+        @param(int) inCountInt:
+        Maximum number of rows to fetch.
+
+        @return(None):
+        No return value.
+        '''
+
+        if not self.canFetchMore( inParent ):
+            return
+
+        first   = self.__fetchedCount
+        last    = min( first + inCountInt    ,
+                       len( self.__records ) ) - 1
+        records = self.__records[ first:last + 1 ]
+
+        # Rows are inserted even if resolution fails, so they are not
+        # fetched again on every scroll.
+        try:
+            self.__updater.resolve( records )
+            self.watch( records )
+
+        finally:
+            self.beginInsertRows( inParent ,
+                                  first    ,
+                                  last     )
+            self.__fetchedCount = last + 1
+            self.endInsertRows()
+
+        return
+
+    def __onDirectoryChanged( self          ,
+                              inDirectoryStr ):
+        '''Executes when a watched directory changed, refresh is delayed to
+        group changes of a same publish.
+
+        @param(str) inDirectoryStr:
+        Changed directory.
+
+        @return(None):
+        No return value.
+        '''
+
+        self.__changedDirectories.add( inDirectoryStr )
+        self.__refreshTimer.start()
+
+        return
+
+    def __refresh( self ):
+        '''Resolves again fetched rows whose gobo map is in a changed
+        directory.
+
+        @return(None):
+        No return value.
+        '''
+
+        paths = set()
+
+        for directory in self.__changedDirectories:
+            paths.update( self.__pathsByDirectory.get( directory , () ) )
+
+        self.__changedDirectories = set()
+
+        if not paths:
+            return
+
+        self.__updater.forget( paths )
+
+        rows = [ row for row in range( self.__fetchedCount )
+                 if self.__records[ row ].path in paths     ]
+
+        records = [ self.__records[ row ] for row in rows ]
+
+        self.__updater.resolve( records )
+        self.watch( records )
+
+        for row in rows:
+            self.updateRow( row )
+
+        return
+
+    def canFetchMore( self     ,
+                      inParent ):
+        '''Checks if some rows are not fetched yet.
+
+        @param(QModelIndex) inParent:
+        Parent index, only the root has rows.
+
+        @return(bool):
+        True if there are rows to fetch, False otherwise.
+        '''
+
+        if inParent.isValid():
+            return False
+
+        return self.__fetchedCount < len( self.__records )
+
+    def columnCount( self                                  ,
+                     inParent = ddGui.QtCore.QModelIndex() ):
+        '''Gets number of columns.
+
+        @param(QModelIndex) inParent:
+        Parent index.
+
+        @return(int):
+        Number of columns.
+        '''
+
+        if inParent.isValid():
+            return 0
+
+        return len( self.DL_HEADERS )
+
+    def data( self                                 ,
+              inIndex                              ,
+              inRole = ddGui.QtCore.Qt.DisplayRole ):
+        '''Gets data of a cell, status colors are given as background role.
+
+        @param(QModelIndex) inIndex:
+        Index of the cell.
+
+        @param(int) inRole:
+        Data role.
+
+        @return(object):
+        Data, None if not defined for the role.
+        '''
+
+        if not inIndex.isValid():
+            return None
+
+        record = self.__records[ inIndex.row() ]
+        column = inIndex.column()
+
+        if inRole == ddGui.QtCore.Qt.DisplayRole:
+            value = getattr( record , self.DL_COLUMN_ATTRIBUTES[ column ] )
+
+            if column < 3:
+                return value
+
+            return str( value )
+
+        if inRole == ddGui.QtCore.Qt.BackgroundRole:
+            return self.__brushes.get( record.status )
+
+        if inRole == ddGui.QtCore.Qt.TextAlignmentRole and column == 4:
+            return ddGui.QtCore.Qt.AlignHCenter
+
+        return None
+
+    def fetchAll( self ):
+        '''Fetches all remaining rows at once.
+
+        @return(None):
+        No return value.
+        '''
+
+        self.__fetch( ddGui.QtCore.QModelIndex() ,
+                      len( self.__records )      )
+
+        return
+
+    def fetchMore( self     ,
+                   inParent ):
+        '''Fetches next page of rows, called by views when more rows are
+        needed to fill or scroll them.
+
+        @param(QModelIndex) inParent:
+        Parent index, only the root has rows.
+
+        @return(None):
+        No return value.
+        '''
+
+        self.__fetch( inParent           ,
+                      self.DL_FETCH_SIZE )
+
+        return
+
+    def getPathCount( self ):
+        '''Gets number of unique gobo map paths, fetched or not.
+
+        @return(int):
+        Number of unique paths.
+        '''
+
+        return len( set( record.path for record in self.__records ) )
+
+    def getRecord( self     ,
+                   inRowInt ):
+        '''Gets record of a fetched row.
+
+        @param(int) inRowInt:
+        Row number.
+
+        @return(dlGuerillaTools.goboFrustumRecord.DLGoboFrustumRecord):
+        Record of the row.
+        '''
+
+        return self.__records[ inRowInt ]
+
+    def getUpdater( self ):
+        '''Gets updater resolving records.
+
+        @return(dlGuerillaTools.goboMapUpdater.DLGoboMapUpdater):
+        Updater of the model.
+        '''
+
+        return self.__updater
+
+    def getTotalCount( self ):
+        '''Gets number of rows, fetched or not.
+
+        @return(int):
+        Number of rows.
+        '''
+
+        return len( self.__records )
+
+    def headerData( self                                 ,
+                    inSection                            ,
+                    inOrientation                        ,
+                    inRole = ddGui.QtCore.Qt.DisplayRole ):
+        '''Gets header labels.
+
+        @param(int) inSection:
+        Column or row number.
+
+        @param(Qt.Orientation) inOrientation:
+        Header orientation.
+
+        @param(int) inRole:
+        Data role.
+
+        @return(str):
+        Column label, None if not defined.
+        '''
+
+        if ( inOrientation == ddGui.QtCore.Qt.Horizontal and
+             inRole        == ddGui.QtCore.Qt.DisplayRole  ):
+            return self.DL_HEADERS[ inSection ]
+
+        return None
+
+    def rowCount( self                                  ,
+                  inParent = ddGui.QtCore.QModelIndex() ):
+        '''Gets number of fetched rows.
+
+        @param(QModelIndex) inParent:
+        Parent index, only the root has rows.
+
+        @return(int):
+        Number of fetched rows.
+        '''
+
+        if inParent.isValid():
+            return 0
+
+        return self.__fetchedCount
+
+    def setRecords( self       ,
+                    inRecords ):
+        '''Resets model with unresolved records.
+
+        @param(list) inRecords:
+        List of dlGuerillaTools.goboFrustumRecord.DLGoboFrustumRecord.
+
+        @return(None):
+        No return value.
+        '''
+
+        self.beginResetModel()
+
+        self.__records      = list( inRecords )
+        self.__fetchedCount = 0
+        self.__updater      = dlGuerillaTools.goboMapUpdater.DLGoboMapUpdater()
+
+        self.__pathsByDirectory   = {}
+        self.__changedDirectories = set()
+
+        if self.__watcher.directories():
+            self.__watcher.removePaths( self.__watcher.directories() )
+
+        self.endResetModel()
+
+        return
+
+    def watch( self      ,
+               inRecords ):
+        '''Watches directories of gobo maps of resolved records and of their
+        published file.
+
+        @param(list) inRecords:
+        List of dlGuerillaTools.goboFrustumRecord.DLGoboFrustumRecord.
+
+        @return(None):
+        No return value.
+        '''
+
+        directories = set()
+
+        for record in inRecords:
+
+            paths = [ record.path ]
+
+            if record.resolution and record.resolution[ 'publishedPath' ]:
+                paths.append( record.resolution[ 'publishedPath' ] )
+
+            for pathStr in paths:
+                if not pathStr:
+                    continue
+
+                directory = os.path.dirname( str( pathStr ) )
+
+                self.__pathsByDirectory.setdefault( directory , set() ).add(
+                    record.path                                            )
+                directories.add( directory )
+
+        directories = [ directory for directory in directories
+                        if os.path.isdir( directory )         ]
+        directories = set( directories ) - set( self.__watcher.directories() )
+
+        if directories:
+            self.__watcher.addPaths( list( directories ) )
+
+        return
+
+    def updateRow( self     ,
+                   inRowInt ):
+        '''Notifies views that the record of a fetched row changed.
+
+        @param(int) inRowInt:
+        Row number.
+
+        @return(None):
+        No return value.
+        '''
+
+        self.dataChanged.emit( self.index( inRowInt , 0                         ) ,
+                               self.index( inRowInt , len( self.DL_HEADERS ) - 1 ) )
+
+        return
+
+
+class DLUpdateFrustumGoboMapsDialog( ddGui.QtWidgets.QDialog ):
+    '''Dialog to update and report gobo frustum maps status.
+    '''
+
+    ## Define status for gobo map.
+    # type: tuple
+    _DL_STATUS = dlGuerillaTools.goboMapResolver.DLGoboMapResolver.DL_STATUS
 
     ## Define pattern to find path str.
     # type: sre.SRE_Pattern
-    DL_GROUP_PATTERN = re.compile( '\'(?P<path>.*)\'' )
+    DL_GROUP_PATTERN = (
+        dlGuerillaTools.goboMapResolver.DLGoboMapResolver.DL_GROUP_PATTERN )
 
     def __init__( self ):
         super( DLUpdateFrustumGoboMapsDialog , self ).__init__()
@@ -87,12 +535,29 @@ class DLUpdateFrustumGoboMapsDialog( ddGui.QtWidgets.QDialog ):
         self.msgQLabel.setStyleSheet( 'color: Chocolate' )
         self.msgQLabel.setVisible( False )
 
+        self.footerQLabel = ddGui.QtWidgets.QLabel()
+
         ########################################################################
-        # Create QTreeWidget
+        # Create filter
         ########################################################################
-        self.treeWidget = ddGui.QtWidgets.QTreeWidget()
-        self.treeWidget.setContextMenuPolicy( ddGui.QtGui.Qt.CustomContextMenu )
-        self.treeWidget.setToolTip(
+        self.filterQLineEdit = ddGui.QtWidgets.QLineEdit()
+        self.filterQLineEdit.setPlaceholderText( 'Filter' )
+
+        ########################################################################
+        # Create model and QTreeView
+        ########################################################################
+        self.model = DLGoboMapTableModel( self )
+
+        self.proxyModel = ddGui.QtCore.QSortFilterProxyModel( self )
+        self.proxyModel.setSourceModel( self.model )
+        self.proxyModel.setFilterKeyColumn( -1 )
+        self.proxyModel.setFilterCaseSensitivity( ddGui.QtCore.Qt.CaseInsensitive )
+        self.proxyModel.setDynamicSortFilter( True )
+
+        self.treeView = ddGui.QtWidgets.QTreeView()
+        self.treeView.setModel( self.proxyModel )
+        self.treeView.setContextMenuPolicy( ddGui.QtGui.Qt.CustomContextMenu )
+        self.treeView.setToolTip(
             '- Ctrl + click to select non consecutive elements.\n'
             '- Shift + click to select consecutive elements.\n'
             '- Click + drag to select consecutive elements.\n'
@@ -100,26 +565,22 @@ class DLUpdateFrustumGoboMapsDialog( ddGui.QtWidgets.QDialog ):
             '- To deselect all, select only one element (click)\n'
             '  then Ctrl + click in same element.'                 )
 
-        self.treeWidget.setSortingEnabled( True )
-        self.treeWidget.setSelectionMode(
+        # Rows all have the same height, no need to measure each of them.
+        self.treeView.setRootIsDecorated( False )
+        self.treeView.setUniformRowHeights( True )
+        self.treeView.setSortingEnabled( True )
+        self.treeView.sortByColumn( 0                                ,
+                                    ddGui.QtCore.Qt.AscendingOrder )
+        self.treeView.setSelectionMode(
             ddGui.QtWidgets.QAbstractItemView.ExtendedSelection )
-        self.treeWidget.setSelectionBehavior(
+        self.treeView.setSelectionBehavior(
             ddGui.QtWidgets.QAbstractItemView.SelectItems )
-        self.treeWidget.setAlternatingRowColors( True )
-
-        self.treeWidget.setColumnCount( 6 )
-        self.treeWidget.resizeColumnToContents( 0 )
-        self.treeWidget.setColumnWidth( 0   ,
-                                        100 )
-        self.treeWidget.setColumnWidth( 1   ,
-                                        200 )
-
-        self.treeWidget.setHeaderLabels( [ 'Light Name'        ,
-                                           'Frustum Full Name' ,
-                                           'Status'            ,
-                                           'File Path'         ,
-                                           'Version'           ,
-                                           'Nuke script'       ] )
+        self.treeView.setAlternatingRowColors( True )
+
+        self.treeView.setColumnWidth( 0   ,
+                                      100 )
+        self.treeView.setColumnWidth( 1   ,
+                                      200 )
 
         ########################################################################
         # Create progress bar
@@ -141,9 +602,11 @@ class DLUpdateFrustumGoboMapsDialog( ddGui.QtWidgets.QDialog ):
         ########################################################################
         # Add widgets to layout
         ########################################################################
-        mainLayout.addWidget( self.treeWidget )
+        mainLayout.addWidget( self.filterQLineEdit )
+        mainLayout.addWidget( self.treeView )
         mainLayout.addWidget( self.progressQProgressBar )
         mainLayout.addWidget( self.msgQLabel )
+        mainLayout.addWidget( self.footerQLabel )
         mainLayout.addWidget( self.buttonBox )
 
         ########################################################################
@@ -169,8 +632,13 @@ class DLUpdateFrustumGoboMapsDialog( ddGui.QtWidgets.QDialog ):
         ########################################################################
         self.buttonBox.accepted.connect( self.updateGoboMaps )
         self.buttonBox.rejected.connect( self.close )
-        self.treeWidget.itemSelectionChanged.connect( self.onSelectionChange )
-        self.treeWidget.customContextMenuRequested.connect( self.onRightClick )
+        self.filterQLineEdit.textChanged.connect( self.onFilterChange )
+        self.treeView.header().sectionClicked.connect( self.onHeaderClicked )
+        self.model.rowsInserted.connect( self.onRowsFetched )
+        self.model.dataChanged.connect( self.onRowsChanged )
+        self.treeView.selectionModel().selectionChanged.connect(
+            self.onSelectionChange                             )
+        self.treeView.customContextMenuRequested.connect( self.onRightClick )
 
     def browseLocation( self ):
         '''Will update browser window with selected light location.
@@ -179,10 +647,9 @@ class DLUpdateFrustumGoboMapsDialog( ddGui.QtWidgets.QDialog ):
         No return value.
         '''
 
-        items = self.treeWidget.selectedItems()
+        rows = self.getSelectedRows()
 
-        frustumNode = ddGuerillaApi.DDNode( items[ 0 ].text( 1 ) )
-        lightNode = frustumNode.parent
+        lightNode = self.model.getRecord( rows[ 0 ] ).frustum.parent
 
         guerilla.ui.focusview( 'Browser' )
         browserWindows = guerilla.ui.getactiveview()
@@ -204,10 +671,9 @@ class DLUpdateFrustumGoboMapsDialog( ddGui.QtWidgets.QDialog ):
 
         updates = []
 
-        for index in range( self.treeWidget.topLevelItemCount() ):
+        for index in range( self.model.rowCount() ):
 
-            item = self.treeWidget.topLevelItem( index )
-            status = item.text( 2 )
+            status = self.model.getRecord( index ).status
 
             if status == self._DL_STATUS[ 2 ]:
                 updates.append( index )
@@ -222,28 +688,7 @@ class DLUpdateFrustumGoboMapsDialog( ddGui.QtWidgets.QDialog ):
         List of ddGuerillaApi.DDNode nodes.
         '''
 
-        scene = ddGuerillaApi.DDScene()
-        frustumNodes = []
-
-        nodeTypeFilter = ddGuerillaApi.filters.DDExactTypeName(
-            ( ddConstants.guerilla.nodeType.DD_RGN_LIGHT            ,
-              ddConstants.guerilla.nodeType.DD_RGN_LIGHT_ATTRIBUTES ) )
-
-        for nodeLight in scene.findAll( nodeTypeFilter         ,
-                                        inRecursiveBool = True ):
-
-            frustumNode = nodeLight.findChild(
-                dlConstants.guerilla.goboLightShaderName.DL_GOBO_FRUSTUM_SHADER_NAME )
-
-            oldFrustumNode = nodeLight.findChild( 'Frustum' )
-
-            if frustumNode:
-                frustumNodes.append( frustumNode )
-
-            elif oldFrustumNode is not None:
-                frustumNodes.append( oldFrustumNode )
-
-        return frustumNodes
+        return dlGuerillaTools.goboLightIndex.DLGoboLightIndex.getFrustums()
 
     def getLinkedPublishedFile( self      ,
                                 inPathStr ):
@@ -257,97 +702,116 @@ class DLUpdateFrustumGoboMapsDialog( ddGui.QtWidgets.QDialog ):
         Return ddPipeApi.DDPublishFile if any, None otherwise.
         '''
 
-        pathNode      = ddPath.DDFile( inPathStr )
-        publishedFile = pathNode.getPublishedFile()
+        return dlGuerillaTools.goboMapResolver.DLGoboMapResolver.getLinkedPublishedFile(
+            inPathStr                                                                   )
 
-        if publishedFile:
-            return publishedFile
+    def getNukeScriptPath( self      ,
+                           inPathStr ):
+        '''Gets nuke script path based on passed exr image path string.
 
-        sequence      = pathNode.getSequence()
-        if sequence is not None:
-            try:
-                firstFrame    = sequence.getFile( sequence.getFirstFrame() )
-            except ValueError:
-                return publishedFile
-        else:
-            return publishedFile
+        @param(str) inPathStr:
+        String representing the path to tex file.
 
-        if sequence.isSingleFrame():
+        @return(str):
+        Path to Nuke script file which was used to render the file.
+        '''
 
-            newFilePath = ( firstFrame.sequencePrefix[ :-1 ]                  +
-                            str( ddConstants.fileExtensions.DD_FILE_EXT_TEX ) )
+        return dlGuerillaTools.goboMapResolver.DLGoboMapResolver.getNukeScriptPath(
+            inPathStr                                                              )
 
-            newPath = ddPath.DDFile( newFilePath )
-            if newPath.isLink():
-                linkedFile = newPath.getLink()
-                return linkedFile.getPublishedFile()
+    def getSelectedRows( self ):
+        '''Gets model rows with a selected cell.
 
-            else:
-                return publishedFile
-        else:
+        @return(list):
+        Sorted list of row numbers of DLGoboMapTableModel.
+        '''
 
-            linkedFile = firstFrame.getLink()
-            if linkedFile:
-                return linkedFile.getPublishedFile()
+        rows = set( self.proxyModel.mapToSource( index ).row()
+                    for index in self.treeView.selectionModel().selectedIndexes() )
 
-            else:
-                return publishedFile
+        return sorted( rows )
 
-    def getNukeScriptPath( self      ,
-                           inPathStr ):
-        '''Gets nuke script path based on passed exr image path string.
+    def onFilterChange( self      ,
+                        inTextStr ):
+        '''Executes when filter text is changed, every row is fetched so
+        the filter applies to the whole scene.
 
-        @param(str) inPathStr:
-        String representing the path to tex file.
+        @param(str) inTextStr:
+        Filter text.
 
-        @return(str):
-        Path to Nuke script file which was used to render the file.
+        @return(None):
+        No return value.
         '''
 
-        pathNode = ddPath.DDFile( inPathStr )
+        if inTextStr:
+            self.model.fetchAll()
 
-        if pathNode.lexists():
-            sequence = pathNode.getSequence()
+        self.proxyModel.setFilterFixedString( inTextStr )
 
-            if sequence is None:
-                return None
+        return
 
-            else:
-                try:
-                    firstFrame = sequence.getFile( sequence.getFirstFrame() )
+    def onHeaderClicked( self         ,
+                         inSectionInt ):
+        '''Executes when a column header is clicked, every row is fetched
+        so sorting applies to the whole scene.
 
-                except ValueError:
-                    return None
+        @param(int) inSectionInt:
+        Clicked column.
 
-            if sequence.isSingleFrame():
-                newFilePath = (
-                    firstFrame.changeExtension(
-                        ddConstants.fileExtensions.DD_FILE_EXT_EXR ) )
+        @return(None):
+        No return value.
+        '''
 
-                nukeFilePath = os.popen(
-                    'exiftool -UpstreamFiles {}'.format( newFilePath ) )
+        self.model.fetchAll()
 
-                nukeFileStr = nukeFilePath.read()
+        return
 
-                matches = self.DL_GROUP_PATTERN.search( nukeFileStr )
+    def onRowsChanged( self ):
+        '''Executes when rows changed, when gobo maps are published while
+        the UI is open, enables update if there is something to update.
 
-                if matches:
-                    return matches.group( 'path' )
+        @return(None):
+        No return value.
+        '''
 
-                else:
-                    return None
+        if self.checkForUpdates():
+            self.msgQLabel.setVisible( False )
+            self.buttonBox.button(
+                ddGui.QtWidgets.QDialogButtonBox.Ok ).setEnabled( True )
 
-        else:
-            return None
+        return
+
+    def onRowsFetched( self ):
+        '''Executes when the model fetched rows, reports progress.
+
+        @return(None):
+        No return value.
+        '''
+
+        self.progressQProgressBar.setValue( self.model.rowCount() )
+
+        self.footerQLabel.setText(
+            '{} frustums, {} resolved, {} unique gobo maps, {:.1f}x deduplication'.format(
+                self.model.getTotalCount()                                                ,
+                self.model.rowCount()                                                     ,
+                self.model.getPathCount()                                                 ,
+                self.model.getTotalCount() / float( max( self.model.getPathCount() , 1 ) ) ) )
+
+        #check if there is something to update
+        if ( not self.model.canFetchMore( ddGui.QtCore.QModelIndex() ) and
+             not self.checkForUpdates()                                ):
+            self.updateMsgQLabel()
+
+        return
 
     def onSelectionChange( self ):
-        '''Executes when selection is changed in QTreeWidget.
+        '''Executes when selection is changed in QTreeView.
 
         @return(None):
         No return value.
         '''
 
-        if self.treeWidget.selectedItems():
+        if self.getSelectedRows():
             self.buttonBox.button(
                 ddGui.QtWidgets.QDialogButtonBox.Ok ).setText( 'Update Selected' )
         else:
@@ -363,9 +827,9 @@ class DLUpdateFrustumGoboMapsDialog( ddGui.QtWidgets.QDialog ):
         No return value.
         '''
 
-        items = self.treeWidget.selectedItems()
+        rows = self.getSelectedRows()
 
-        ddPathNukeFile = ddPath.DDFile( items[ 0 ].text( 5 ) )
+        ddPathNukeFile = ddPath.DDFile( str( self.model.getRecord( rows[ 0 ] ).nukeScript ) )
         nukePublishedFile = ddPathNukeFile.getPublishedFile()
 
         context = nukePublishedFile.getContext()
@@ -381,7 +845,7 @@ class DLUpdateFrustumGoboMapsDialog( ddGui.QtWidgets.QDialog ):
 
     def onRightClick( self     ,
                       inSignal ):
-        '''Will execute when right click on QtreeWidget.
+        '''Will execute when right click on QTreeView.
 
         @param (QtCore.QPoint) inSignal:
         QPoint object storing position of the right click.
@@ -390,19 +854,19 @@ class DLUpdateFrustumGoboMapsDialog( ddGui.QtWidgets.QDialog ):
         No return value.
         '''
 
-        items = self.treeWidget.selectedItems()
+        rows = self.getSelectedRows()
 
-        if len( items ) != 1:
+        if len( rows ) != 1:
 
             return
 
         self.rightClickMenu.clear()
 
-        currentColumn = self.treeWidget.currentColumn()
+        currentColumn = self.treeView.currentIndex().column()
 
         if currentColumn == 5:
 
-            ddPathNukeFile = ddPath.DDFile( items[ 0 ].text( 5 ) )
+            ddPathNukeFile = ddPath.DDFile( str( self.model.getRecord( rows[ 0 ] ).nukeScript ) )
             nukePublishedFile = ddPathNukeFile.getPublishedFile()
 
             if nukePublishedFile:
@@ -412,7 +876,7 @@ class DLUpdateFrustumGoboMapsDialog( ddGui.QtWidgets.QDialog ):
                     self.openPublishedNukeScript         )
 
                 self.rightClickMenu.exec_(
-                    self.treeWidget.viewport().mapToGlobal( inSignal ) )
+                    self.treeView.viewport().mapToGlobal( inSignal ) )
 
         elif currentColumn == 1 or currentColumn == 0:
 
@@ -420,7 +884,7 @@ class DLUpdateFrustumGoboMapsDialog( ddGui.QtWidgets.QDialog ):
             self.actionMenuFindLight.triggered.connect( self.browseLocation )
 
             self.rightClickMenu.exec_(
-                self.treeWidget.viewport().mapToGlobal( inSignal ) )
+                self.treeView.viewport().mapToGlobal( inSignal ) )
 
         else:
 
@@ -431,95 +895,48 @@ class DLUpdateFrustumGoboMapsDialog( ddGui.QtWidgets.QDialog ):
         return
 
     def populateTreeWidget( self ):
-        '''Gets goboMaps file status / data and populate treeWidget.
+        '''Reads gobo frustums and populate the model.
+
+        Only frustum paths are read here, on the main thread, rows are
+        resolved lazily as the view fetches them so the dialog opens
+        without waiting for the whole scene to be resolved.
 
         @return(None):
         No return value.
         '''
 
-        self.treeWidget.clear()
+        # Guerilla scene is only accessed here and when updating.
+        records = dlGuerillaTools.goboMapUpdater.DLGoboMapUpdater.getRecords()
 
-        frustums = self.getGoboFrustums()
-        progress = 0
+        self.model.setRecords( records )
 
-        if not frustums:
+        if not records:
             self.msgQLabel.setVisible( True )
 
             return
 
         self.progressQProgressBar.setVisible( True )
-        self.progressQProgressBar.setMaximum( len( frustums ) )
-
-        for frustum in frustums:
-
-            path       = frustum.Input5.Value.get()
-            status     = self._DL_STATUS[ 4 ]
-            version    = None
-            nukeScript = None
+        self.progressQProgressBar.setMaximum( len( records ) )
+        self.progressQProgressBar.setValue( 0 )
 
-            if path:
+        self.treeView.resizeColumnToContents( 0 )
+        self.treeView.setColumnWidth( 1   ,
+                                      200 )
 
-                publishedFile = self.getLinkedPublishedFile( path )
-                if publishedFile:
-                    # Check for a sequence and change padding
-                    publishedFilePath = publishedFile.localPath
-
-                    if isinstance( publishedFilePath , ddPath.sequence.DDSequence ):
-                        if '%06d' == publishedFilePath.patternFrame:
-                            publishedFilePath = (
-                                publishedFilePath.convertToPattern(
-                                    inPatternStr = ddPath.constant.DD_PATTERN_DOLLAR_FRAME ) )
-
-                    if path == publishedFilePath:
-
-                        status = self._DL_STATUS[ 0 ]
-                        version    = publishedFile.versionNumber
-                        nukeScript = publishedFile.work.name
-
-                    else:
-                        status = self._DL_STATUS[ 2 ]
-                        nukeScript = self.getNukeScriptPath( path )
-                        pathNode = ddPath.DDFile( path )
-                        version = pathNode.getVersion()
-
-                else:
-                    status     = self._DL_STATUS[ 3 ]
-                    nukeScript = self.getNukeScriptPath( path )
-                    pathNode = ddPath.DDFile( path )
-                    version = pathNode.getVersion()
-
-            item = ddGui.QtWidgets.QTreeWidgetItem( [ frustum.parent.name     ,
-                                                      frustum.fullName        ,
-                                                      status                  ,
-                                                      str( path )             ,
-                                                      str( version )          ,
-                                                      str( nukeScript )       ] )
-
-            item.setTextAlignment( 4                            ,
-                                   ddGui.QtCore.Qt.AlignHCenter )
-            self.treeWidget.addTopLevelItem( item )
-
-            if status == self._DL_STATUS[ 2 ]:
-                for column in range( self.treeWidget.columnCount() ):
-                    item.setBackgroundColor( column                     ,
-                                             self._DL_WILL_UPDATE_COLOR )
-
-            if status == self._DL_STATUS[ 0 ]:
-                for column in range( self.treeWidget.columnCount() ):
-                    item.setBackgroundColor( column                ,
-                                             self._DL_UPDATE_COLOR )
+        return
 
-            progress += 1
+    def hideEvent( self     ,
+                   inQEvent ):
+        '''Executes when UI is hidden, saves resolutions fetched so far.
 
-            self.progressQProgressBar.setValue( progress )
+        @param (ddGui.QtCore.QEvent) inQEvent:
+        QEvent.
 
-        self.treeWidget.resizeColumnToContents( 0 )
-        self.treeWidget.setColumnWidth( 1   ,
-                                        200 )
+        @return (None):
+        No return value.
+        '''
 
-        #check if there is something to update
-        if not self.checkForUpdates():
-            self.updateMsgQLabel()
+        dlGuerillaTools.goboMapCache.DLGoboMapCache.getInstance().save()
 
         return
 
@@ -545,104 +962,51 @@ class DLUpdateFrustumGoboMapsDialog( ddGui.QtWidgets.QDialog ):
         No return value.
         '''
 
+        rows = self.getSelectedRows()
+
+        if not rows:
+            # Checking all requires the rows not fetched yet.
+            self.model.fetchAll()
+
         if not self.checkForUpdates():
             self.updateMsgQLabel()
 
             return
 
-        if self.buttonBox.button(
-            ddGui.QtWidgets.QDialogButtonBox.Ok ).text() == 'Update All':
+        if not rows:
 
             if self.msgBox.exec_() == self.msgBox.Cancel :
 
                 return
 
-        self.progressQProgressBar.reset()
-
-        progress    = 0
-        version     = None
-        nukeScript  = None
-        widgetItems = []
-
-        if self.treeWidget.selectedItems():
-
-            widgetItems = self.treeWidget.selectedItems()
-            self.progressQProgressBar.setMaximum( len( widgetItems ) )
-
-        else:
-
-            for index in range( self.treeWidget.topLevelItemCount() ):
-
-                item = self.treeWidget.topLevelItem( index )
-
-                if item.text( 2 ) == self._DL_STATUS[ 2 ]:
-                    widgetItems.append( self.treeWidget.topLevelItem( index ) )
-
-            self.progressQProgressBar.setMaximum( len( widgetItems ) )
-
-        with ddGuerillaApi.DDModifier() as mod:
-
-            for widgetItem in widgetItems:
-
-                path            = widgetItem.text( 3 )
-                frustumFullName = widgetItem.text( 1 )
-                frustumNode     = ddGuerillaApi.DDNode( frustumFullName )
-                status          = widgetItem.text( 2 )
-
-                if status == self._DL_STATUS[ 0 ] or status == self._DL_STATUS[ 4 ]:
-
-                    progress += 1
-                    self.progressQProgressBar.setValue( progress )
-
-                    continue
-
-                if path:
-                    # This can be in another definition to update
-                    publishedFile = self.getLinkedPublishedFile( path )
-
-                    if publishedFile:
-                        # Check for a sequence and change padding
-                        publishedFilePath = publishedFile.localPath
-
-                        if isinstance( publishedFilePath          ,
-                                       ddPath.sequence.DDSequence ):
-                            if '%06d' == publishedFilePath.patternFrame:
-                                publishedFilePath = (
-                                    publishedFilePath.convertToPattern(
-                                        inPatternStr = ddPath.constant.DD_PATTERN_DOLLAR_FRAME ) )
+            rows = self.checkForUpdates()
 
+        self.progressQProgressBar.reset()
+        self.progressQProgressBar.setMaximum( len( rows ) )
 
-                        frustumNode.Input5.Value.set( publishedFilePath )
+        records = [ self.model.getRecord( row ) for row in rows ]
 
-                        path       = publishedFilePath
-                        status     = self._DL_STATUS[ 1 ]
-                        version    = publishedFile.versionNumber
-                        nukeScript = publishedFile.work.name
+        # Records are resolved already, only frustums whose path changed
+        # since are read and resolved again.
+        self.model.getUpdater().apply( records )
+        self.model.watch( records )
 
-                    else:
-                        nukeScript = self.getNukeScriptPath( path )
-                        pathNode   = ddPath.DDFile( path )
-                        version    = pathNode.getVersion()
-                        status     = self._DL_STATUS[ 3 ]
+        paths = set()
 
+        for progress , row in enumerate( rows , 1 ):
 
-                if status == self._DL_STATUS[ 1 ]:
-                    for column in range( self.treeWidget.columnCount() ):
-                        widgetItem.setBackgroundColor( column                ,
-                                                       self._DL_UPDATE_COLOR )
+            paths.add( self.model.getRecord( row ).path )
 
-                widgetItem.setText( 2      ,
-                                    status )
-                widgetItem.setText( 3           ,
-                                    str( path ) )
-                widgetItem.setText( 4              ,
-                                    str( version ) )
-                widgetItem.setText( 5                 ,
-                                    str( nukeScript ) )
+            self.model.updateRow( row )
+            self.progressQProgressBar.setValue( progress )
 
-                progress += 1
+        self.footerQLabel.setText(
+            '{} frustums processed, {} unique gobo maps, {:.1f}x deduplication'.format(
+                len( rows )                                                            ,
+                len( paths )                                                           ,
+                len( rows ) / float( max( len( paths ) , 1 ) )                         ) )
 
-                self.progressQProgressBar.setValue( progress )
+        dlGuerillaTools.goboMapCache.DLGoboMapCache.getInstance().save()
 
         return
 
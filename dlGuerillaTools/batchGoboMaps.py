@@ -0,0 +1,282 @@
+################################################################################
+# L ATELIER ANIMATION INC.
+#
+# [2012] - [2020] L ATELIER ANIMATION INC. All Rights Reserved.
+#
+# NOTICE: All information contained herein is, and remains
+#         the property of L Atelier Animation Inc. and its suppliers,
+#         if any.  The intellectual and technical concepts contained
+#         herein are proprietary to L Atelier Animation Inc. and its
+#         suppliers and may be covered by Canadian, U.S. and/or
+#         Foreign Patents, patents in process, and are protected
+#         by trade secret or copyright law. Dissemination of this
+#         information or reproduction of this material is strictly
+#         forbidden unless prior written permission is obtained from
+#         L ATELIER ANIMATION INC.
+#
+################################################################################
+'''Headless batch update of frustum gobo maps in several Guerilla scenes.
+
+Each scene is opened in its own Guerilla worker process, out of date
+frustums are updated with their published gobo map and the scene is saved:
+    python batchGoboMaps.py --report report.json scene1.gproject scene2.gproject
+
+Worker command is taken from DL_GUERILLA_BATCH_COMMAND environment variable,
+it must run a python script in a Guerilla session without UI.
+
+@package dlGuerillaTools.batchGoboMaps
+@author  Esteban Ortega <esteban.ortega@latelieranimation.com>
+'''
+
+import argparse
+import multiprocessing
+import multiprocessing.pool
+import os
+import shlex
+import subprocess
+import sys
+import tempfile
+
+try:
+    import simplejson as json
+except ImportError:
+    import json
+
+__all__ = ( 'DLBatchGoboMaps' , )
+
+class DLBatchGoboMaps( object ):
+    '''Updates frustum gobo maps of several scenes, each one in its own
+    Guerilla worker process, and gathers a report of every scene.
+    '''
+
+    ## Environment variable overriding the worker command.
+    # type: str
+    DL_ENV_COMMAND = 'DL_GUERILLA_BATCH_COMMAND'
+
+    ## Default worker command, script path and arguments are appended.
+    # type: str
+    DL_COMMAND = 'guerilla_render --python'
+
+    def __init__( self                     ,
+                  inProcessCountInt = None ,
+                  inCommandStr      = None ,
+                  inDryRunBool      = False ):
+        '''Initialize class.
+
+        @param(int) inProcessCountInt:
+        Amount of parallel worker processes, cpu count if None.
+
+        @param(str) inCommandStr:
+        Worker command, DL_ENV_COMMAND or DL_COMMAND if None.
+
+        @param(bool) inDryRunBool:
+        Only report out of date frustums if True, scenes are not saved.
+
+        @return(None):
+        No return value.
+        '''
+
+        ## Amount of parallel worker processes.
+        # type: int
+        self.processCount = inProcessCountInt or multiprocessing.cpu_count()
+
+        ## Worker command.
+        # type: list[str]
+        self.command = shlex.split(
+            inCommandStr or os.environ.get( self.DL_ENV_COMMAND ,
+                                            self.DL_COMMAND     ) )
+
+        ## Only report out of date frustums if True.
+        # type: bool
+        self.dryRun = inDryRunBool
+
+        return
+
+    def __runWorker( self           ,
+                     inScenePathStr ):
+        '''Updates passed scene in a Guerilla worker process.
+
+        @param(str) inScenePathStr:
+        Path of the scene.
+
+        @return(dict):
+        Report of the scene, status is 'updated', 'outdated' in dry run,
+        'upToDate' or 'failed'.
+        '''
+
+        fileDescriptor , resultPath = tempfile.mkstemp( suffix = '.json' )
+        os.close( fileDescriptor )
+
+        scriptPath = os.path.splitext( os.path.abspath( __file__ ) )[ 0 ] + '.py'
+
+        command = self.command + [ scriptPath                        ,
+                                   '--worker'                        ,
+                                   os.path.abspath( inScenePathStr ) ,
+                                   resultPath                        ]
+
+        if self.dryRun:
+            command.append( '--dry-run' )
+
+        try:
+            returnCode = subprocess.call( command )
+
+            if returnCode:
+                return { 'status' : 'failed'                                       ,
+                         'error'  : 'Worker exited with code {}'.format( returnCode ) }
+
+            with open( resultPath ) as resultFile:
+                return json.load( resultFile )
+
+        except ( IOError , OSError , ValueError ) as error:
+            return { 'status' : 'failed'     ,
+                     'error'  : str( error ) }
+
+        finally:
+            os.remove( resultPath )
+
+    def run( self     ,
+             inScenes ):
+        '''Updates passed scenes in parallel worker processes.
+
+        @param(list) inScenes:
+        List of scene paths.
+
+        @return(dict):
+        Dict { scene path : report } where report is the one of
+        updateScene with a status key, 'updated', 'outdated', 'upToDate' or
+        'failed'.
+        '''
+
+        pool = multiprocessing.pool.ThreadPool(
+            max( min( self.processCount , len( inScenes ) ) , 1 ) )
+
+        try:
+            reports = pool.map( self.__runWorker ,
+                                inScenes         )
+
+        finally:
+            pool.close()
+            pool.join()
+
+        return dict( zip( inScenes ,
+                          reports  ) )
+
+    @staticmethod
+    def updateScene( inScenePathStr       ,
+                     inDryRunBool = False ):
+        '''Worker side: loads a scene in the current Guerilla session,
+        updates its out of date frustums and saves it.
+
+        @param(str) inScenePathStr:
+        Path of the scene.
+
+        @param(bool) inDryRunBool:
+        Only report out of date frustums if True, scene is not saved.
+
+        @return(dict):
+        Report of dlGuerillaTools.goboMapUpdater.DLGoboMapUpdater.run
+        with a status key, 'updated', 'outdated' in dry run or 'upToDate'.
+        '''
+
+        # Guerilla is only available in workers, not in the batch process.
+        import guerilla
+
+        import dlGuerillaTools.goboMapUpdater
+
+        document = guerilla.Document()
+        document.load( inScenePathStr )
+
+        updater = dlGuerillaTools.goboMapUpdater.DLGoboMapUpdater()
+        report  = updater.run( inDryRunBool )
+
+        if report[ 'updated' ] and inDryRunBool:
+            report[ 'status' ] = 'outdated'
+
+        elif report[ 'updated' ]:
+            report[ 'status' ] = 'updated'
+
+            document.save( inScenePathStr )
+
+        else:
+            report[ 'status' ] = 'upToDate'
+
+        return report
+
+
+def main( inArgs = None ):
+    '''Command line entry point.
+
+    @param(list) inArgs:
+    List of command line arguments, sys.argv if None.
+
+    @return(int):
+    Exit code.
+    '''
+
+    parser = argparse.ArgumentParser(
+        description = 'Update frustum gobo maps of Guerilla scenes.' )
+
+    parser.add_argument( '--worker'                       ,
+                         nargs   = 2                      ,
+                         metavar = ( 'SCENE_PATH'       ,
+                                     'RESULT_PATH'      ) ,
+                         help    = argparse.SUPPRESS      )
+    parser.add_argument( 'scenes'                              ,
+                         nargs = '*'                           ,
+                         help  = 'Guerilla scenes to update.'  )
+    parser.add_argument( '--report'                                            ,
+                         help = 'JSON report path, standard output if not set.' )
+    parser.add_argument( '--processes'                                  ,
+                         type = int                                     ,
+                         help = 'Amount of parallel worker processes.'  )
+    parser.add_argument( '--dry-run'                                         ,
+                         action = 'store_true'                               ,
+                         help   = 'Report out of date frustums, do not save.' )
+
+    args = parser.parse_args( inArgs )
+
+    if args.worker:
+        scenePath , resultPath = args.worker
+
+        report = DLBatchGoboMaps.updateScene( scenePath    ,
+                                              args.dry_run )
+
+        with open( resultPath , 'w' ) as resultFile:
+            json.dump( report     ,
+                       resultFile )
+
+        return 0
+
+    if not args.scenes:
+        parser.error( 'at least one scene is required' )
+
+    batch  = DLBatchGoboMaps( args.processes              ,
+                              inDryRunBool = args.dry_run )
+    report = batch.run( args.scenes )
+
+    if args.report:
+        with open( args.report , 'w' ) as reportFile:
+            json.dump( report           ,
+                       reportFile       ,
+                       indent    = 4    ,
+                       sort_keys = True )
+
+    else:
+        json.dump( report           ,
+                   sys.stdout       ,
+                   indent    = 4    ,
+                   sort_keys = True )
+        sys.stdout.write( '\n' )
+
+    for scenePath , sceneReport in sorted( report.items() ):
+        sys.stderr.write( '{}: {}\n'.format( scenePath               ,
+                                             sceneReport[ 'status' ] ) )
+
+    if any( sceneReport[ 'status' ] == 'failed' for sceneReport in report.values() ):
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit( main() )
@@ -22,11 +22,14 @@
 @author Camelia Slimani <camelia.slimani@latelieranimation.com>
 '''
 
+import collections
 import math
 import re
 
 import dlConstants
 import dlGuerillaApi
+import dlGuerillaTools.instanceIndex
+import dlGuerillaTools.sceneGraphIndex
 
 import ddBuilder
 import ddConstants.guerilla
@@ -48,10 +51,6 @@ class DLGoboMapSetup( object ):
     # type: int
     __DL_GOBO_RENDERPASS_RESOLUTION = 2048
 
-    ## Store edge upstream node in the selected node tree.
-    # type: []
-    __DL_EDGE_NODES = []
-
     ## Store downstream connected scene graph nodes.
     # type: []
     __DL_SCENEGRAPH_NODES = []
@@ -91,6 +90,20 @@ class DLGoboMapSetup( object ):
         else:
             self._isSelectionConnected = False
 
+        ## Scene graph indexes by shot node name, built once per setup.
+        # type: dict[str, dlGuerillaTools.sceneGraphIndex.DLSceneGraphIndex]
+        self.__sceneGraphIndexes = {}
+
+        ## Index of nodes instancing inventory primitives, built once per
+        # setup.
+        # type: dlGuerillaTools.instanceIndex.DLInstanceIndex
+        self.__instanceIndex = None
+
+        ## Upstream leaf nodes by full name of the node they were searched
+        # from, walked once per setup.
+        # type: dict[str, list]
+        self.__leafNodes = {}
+
         return
 
     def __createFrustum( self ):
@@ -979,8 +992,43 @@ class DLGoboMapSetup( object ):
 
         return 0
 
-    @staticmethod
-    def getSelectedLightParentInstances( inShotList ,
+    def __getInstanceIndex( self ):
+        '''Gets index of nodes instancing inventory primitives, built on
+        first call.
+
+        @return(dlGuerillaTools.instanceIndex.DLInstanceIndex):
+        Index of instancing nodes.
+        '''
+
+        if self.__instanceIndex is None:
+            self.__instanceIndex = dlGuerillaTools.instanceIndex.DLInstanceIndex(
+                ddGuerillaApi.DDInventory.get()                                 )
+
+        return self.__instanceIndex
+
+    def __getSceneGraphIndex( self              ,
+                              inShotNodeNameStr ):
+        '''Gets index of scene graph nodes of a shot, built on first call.
+
+        @param(str) inShotNodeNameStr:
+        Name of the shot node.
+
+        @return(dlGuerillaTools.sceneGraphIndex.DLSceneGraphIndex):
+        Index of the shot scene graph nodes.
+        '''
+
+        if inShotNodeNameStr not in self.__sceneGraphIndexes:
+            shotNode = ddGuerillaApi.DDNode( inShotNodeNameStr )
+
+            self.__sceneGraphIndexes[ inShotNodeNameStr ] = (
+                dlGuerillaTools.sceneGraphIndex.DLSceneGraphIndex(
+                    shotNode.findAll(
+                        inNodeTypeStr = ddConstants.guerilla.nodeType.DD_SCENE_GRAPH_NODE ) ) )
+
+        return self.__sceneGraphIndexes[ inShotNodeNameStr ]
+
+    def getSelectedLightParentInstances( self       ,
+                                         inShotList ,
                                          inDDNodes  ):
         '''Gets the instances objects based on previous comboBox light
         selected object.
@@ -998,9 +1046,8 @@ class DLGoboMapSetup( object ):
         representing the potential parent for camera constraint.
         '''
 
-        inventory    = ddGuerillaApi.DDInventory.get()
         pathStrList  = []
-        matchedNodes = []
+        matchedNodes = collections.OrderedDict()
 
         #Check if it is a sequence context and add it as part of the name.
         context     = ddPipeApi.getCurrentContext()
@@ -1018,41 +1065,26 @@ class DLGoboMapSetup( object ):
 
             elif isinstance( ddNode , ddGuerillaApi.DDRenderGraphNodeSceneGraph ):
 
-                matchedNodes.append( ddNode )
-
-        sceneGraphNodeType = ddConstants.guerilla.nodeType.DD_SCENE_GRAPH_NODE
-        primitiveType      = ddConstants.guerilla.nodeType.DD_PRIMITIVE
+                matchedNodes.setdefault( ddNode.fullName ,
+                                         ddNode          )
 
         for pathStr in pathStrList:
-            pathStrSplitted = pathStr.split('|')
-            pattern = '\|'.join( pathStrSplitted )
 
             for shot in inShotList:
-                ddNode = ddGuerillaApi.DDNode( sequenceStr + shot.data() )
+                sceneGraphIndex = self.__getSceneGraphIndex(
+                    sequenceStr + shot.data()              )
 
-                for element in ddNode.findAll(
-                        inNodeTypeStr = sceneGraphNodeType ):
+                for element in sceneGraphIndex.find( pathStr ):
+                    matchedNodes.setdefault( element.fullName ,
+                                             element          )
 
-                    match = re.search( pattern          ,
-                                       element.fullName )
-
-                    if match:
-                        matchedNodes.append( element )
-
-                for node in inventory.findAll(
-                        inLuaPattern  = pattern       ,
-                        inNodeTypeStr = primitiveType ):
-
-                    for dependency in node.Instances.getbackdependencies():
-                        if dependency.name != 'Instances':
-                            continue
+            # Instancing nodes don't depend on the shot.
+            for fullName , parent in self.__getInstanceIndex().findParents(
+                    pathStr ).items():
+                matchedNodes.setdefault( fullName ,
+                                         parent   )
 
-                        parent = ddGuerillaApi.DDNode( dependency.parent )
-
-                        if parent not in matchedNodes:
-                            matchedNodes.append( parent )
-
-        return matchedNodes
+        return list( matchedNodes.values() )
 
     def getSelectedParentInstances( self            ,
                                     inShotList      ,
@@ -1072,14 +1104,13 @@ class DLGoboMapSetup( object ):
         representing the potential parent for camera constraint.
         '''
 
-        inventory = ddGuerillaApi.DDInventory.get()
-        scene     = ddGuerillaApi.DDScene()
+        scene = ddGuerillaApi.DDScene()
 
         # isLightAttributes = inSelectionBool
         isLightAttributes = self._isLightAttributes
 
         pathStrList  = []
-        matchedNodes = []
+        matchedNodes = collections.OrderedDict()
 
         #Check if it is a sequence context and add it as part of the name.
         context     = ddPipeApi.getCurrentContext()
@@ -1103,7 +1134,8 @@ class DLGoboMapSetup( object ):
                 ddGuerillaApi.renderGraphNodeSceneGraph.DDRenderGraphNodeSceneGraph ) and
                 not isLightAttributes                                                   ):
 
-                matchedNodes.append( ddNode )
+                matchedNodes.setdefault( ddNode.fullName ,
+                                         ddNode          )
 
             elif ( isinstance(
                 ddNode                                                  ,
@@ -1118,29 +1150,18 @@ class DLGoboMapSetup( object ):
 
             if not isLightAttributes:
                 for shot in inShotList:
-                    ddNode = ddGuerillaApi.DDNode( sequenceStr + shot.data() )
-
-                    for element in ddNode.findAll(
-                            inNodeTypeStr = ddConstants.guerilla.nodeType.DD_SCENE_GRAPH_NODE ):
-
-                        match = re.search( pattern          ,
-                                           element.fullName )
-
-                        if match:
-                            matchedNodes.append( element )
+                    sceneGraphIndex = self.__getSceneGraphIndex(
+                        sequenceStr + shot.data()              )
 
-                    for node in inventory.findAll(
-                            inLuaPattern = pattern                                     ,
-                            inNodeTypeStr = ddConstants.guerilla.nodeType.DD_PRIMITIVE ):
+                    for element in sceneGraphIndex.find( pathStr ):
+                        matchedNodes.setdefault( element.fullName ,
+                                                 element          )
 
-                        for dependency in node.Instances.getbackdependencies():
-                            if dependency.name != 'Instances':
-                                continue
-
-                            parent = ddGuerillaApi.DDNode( dependency.parent )
-
-                            if parent not in matchedNodes:
-                                matchedNodes.append( parent )
+                # Instancing nodes don't depend on the shot.
+                for fullName , parent in self.__getInstanceIndex().findParents(
+                        pathStr ).items():
+                    matchedNodes.setdefault( fullName ,
+                                             parent   )
 
             else:
                 for element in scene.findAll(
@@ -1154,9 +1175,10 @@ class DLGoboMapSetup( object ):
                                        element.fullName )
 
                     if match:
-                        matchedNodes.append( element )
+                        matchedNodes.setdefault( element.fullName ,
+                                                 element          )
 
-        return matchedNodes
+        return list( matchedNodes.values() )
 
     def __getRenderGraph( self           ,
                           inShotIndex    ):
@@ -1256,30 +1278,53 @@ class DLGoboMapSetup( object ):
         '''Finds all path and scene graph nodes
         in the edge (upstream) of the node tree where the selected node is.
 
+        The graph is walked depth first, inputs in order, each node once
+        even if several downstream nodes share it. Result is kept for the
+        setup lifetime.
+
         @param (ddGuerillaApi.DDNode) inDDNode:
         Node to check its connections.
 
         @return (list):
-        List of ddGuerillaApi.DDNode.
+        List of ddGuerillaApi.DDNode, without duplicates.
         '''
 
-        if not self._isConnected( inDDNode ):
+        if inDDNode.fullName in self.__leafNodes:
+            return list( self.__leafNodes[ inDDNode.fullName ] )
+
+        leafNodes = []
+        visited   = set()
+        stack     = [ inDDNode ]
+
+        while stack:
 
-            self.__DL_EDGE_NODES.append( inDDNode )
+            node = stack.pop()
 
-            return self.__DL_EDGE_NODES
+            if node.fullName in visited:
+                continue
 
-        inputs = inDDNode.getinputs()
+            visited.add( node.fullName )
 
-        for input in inputs:
-            connectedPlug = input.getconnected()
+            if not self._isConnected( node ):
+                leafNodes.append( node )
 
-            if connectedPlug:
-                parentNode = connectedPlug.parent
+                continue
 
-                self.__findLeafNodes( ddGuerillaApi.DDNode( parentNode ) )
+            parentNodes = []
 
-        return self.__DL_EDGE_NODES
+            for input in node.getinputs():
+                connectedPlug = input.getconnected()
+
+                if connectedPlug:
+                    parentNodes.append(
+                        ddGuerillaApi.DDNode( connectedPlug.parent ) )
+
+            # Reversed so first input is walked first.
+            stack.extend( reversed( parentNodes ) )
+
+        self.__leafNodes[ inDDNode.fullName ] = leafNodes
+
+        return list( leafNodes )
 
     def getParentInstancesNodes( self     ,
                                  inDDNode ):
@@ -1292,9 +1337,6 @@ class DLGoboMapSetup( object ):
         List of ddGuerillaApi.DDNode
         '''
 
-        global __DL_EDGE_NODES
-        self.__DL_EDGE_NODES = []
-
         nodes = self.__findLeafNodes( inDDNode )
 
         parentInstancesNodes = []
@@ -0,0 +1,426 @@
+################################################################################
+# L ATELIER ANIMATION INC.
+#
+# [2012] - [2020] L ATELIER ANIMATION INC. All Rights Reserved.
+#
+# NOTICE: All information contained herein is, and remains
+#         the property of L Atelier Animation Inc. and its suppliers,
+#         if any.  The intellectual and technical concepts contained
+#         herein are proprietary to L Atelier Animation Inc. and its
+#         suppliers and may be covered by Canadian, U.S. and/or
+#         Foreign Patents, patents in process, and are protected
+#         by trade secret or copyright law. Dissemination of this
+#         information or reproduction of this material is strictly
+#         forbidden unless prior written permission is obtained from
+#         L ATELIER ANIMATION INC.
+#
+################################################################################
+'''Module to read OpenEXR header attributes without external tools.
+
+Usage:
+    header = DLExrHeader( '/path/to/image.exr' )
+    header.getAttribute( 'upstreamFiles' )
+
+Benchmark against exiftool:
+    python exrHeader.py --repeat 10 /path/to/image.exr
+
+@package dlGuerillaTools.exrHeader
+@author  Esteban Ortega <esteban.ortega@latelieranimation.com>
+'''
+
+import argparse
+import mmap
+import os
+import re
+import struct
+import sys
+import time
+
+__all__ = ( 'DLExrHeader' , )
+
+class DLExrHeader( object ):
+    '''Attributes of an OpenEXR header. The file is memory mapped and only
+    the header pages are touched, parsing stops at the end of the header
+    before offset tables and pixel data.
+    '''
+
+    ## OpenEXR magic number.
+    # type: bytes
+    DL_MAGIC = b'\x76\x2f\x31\x01'
+
+    ## Version flag of multi part files, made of several headers.
+    # type: int
+    DL_MULTI_PART_FLAG = 0x1000
+
+    ## Attribute name of upstream files, compared normalized as exiftool
+    ## tag names are.
+    # type: str
+    DL_UPSTREAM_FILES = 'upstreamFiles'
+
+    ## Struct formats of decoded numeric attribute types.
+    # type: dict[str, str]
+    DL_NUMERIC_FORMATS = { 'int'    : '<i' ,
+                           'float'  : '<f' ,
+                           'double' : '<d' }
+
+    def __init__( self           ,
+                  inPathStr      ,
+                  inNames = None ):
+        '''Initialize class and read the header.
+
+        @param(str) inPathStr:
+        Path of the OpenEXR file.
+
+        @param(list) inNames:
+        Names of the attributes to read, parsing stops once they are all
+        found. Every attribute if None.
+
+        @return(None):
+        No return value.
+        '''
+
+        ## Path of the OpenEXR file.
+        # type: str
+        self.path = inPathStr
+
+        ## Attribute values by name, of the first part defining them.
+        # type: dict
+        self.attributes = {}
+
+        ## Attribute types by name.
+        # type: dict
+        self.types = {}
+
+        with open( inPathStr , 'rb' ) as exrFile:
+
+            if os.fstat( exrFile.fileno() ).st_size < 8:
+                raise ValueError( 'Not an OpenEXR file "{}"'.format( inPathStr ) )
+
+            mappedFile = mmap.mmap( exrFile.fileno()          ,
+                                    0                         ,
+                                    access = mmap.ACCESS_READ )
+
+            try:
+                self.__parse( mappedFile ,
+                              inNames    )
+
+            finally:
+                mappedFile.close()
+
+        return
+
+    def __parse( self         ,
+                 inMappedFile ,
+                 inNames      ):
+        '''Parses the attribute table of each header.
+
+        @param(mmap.mmap) inMappedFile:
+        Memory mapped file.
+
+        @param(list) inNames:
+        Names of the attributes to read, every attribute if None.
+
+        @return(None):
+        No return value.
+        '''
+
+        if inMappedFile[ 0:4 ] != self.DL_MAGIC:
+            raise ValueError( 'Not an OpenEXR file "{}"'.format( self.path ) )
+
+        version   = self.__readInt( inMappedFile ,
+                                        4            )
+        multiPart = bool( version & self.DL_MULTI_PART_FLAG )
+        remaining = None if inNames is None else set( inNames )
+        offset    = 8
+
+        while True:
+
+            name , offset = self.__readString( inMappedFile ,
+                                               offset       )
+
+            if not name:
+                # End of a header, multi part files end with an empty one.
+                if not multiPart or inMappedFile[ offset:offset + 1 ] == b'\x00':
+                    return
+
+                continue
+
+            typeName , offset = self.__readString( inMappedFile ,
+                                                   offset       )
+            size = self.__readInt( inMappedFile ,
+                                   offset       )
+            offset += 4
+
+            if size < 0 or offset + size > len( inMappedFile ):
+                raise ValueError( 'Truncated OpenEXR header "{}"'.format(
+                    self.path                                           ) )
+
+            if ( ( remaining is None or name in remaining ) and
+                 name not in self.attributes                ):
+
+                try:
+                    self.attributes[ name ] = self.decode(
+                        typeName                                  ,
+                        inMappedFile[ offset:offset + size ]      )
+
+                except ValueError as error:
+                    raise ValueError(
+                        'Invalid OpenEXR attribute "{}" in "{}": {}'.format(
+                            name                                          ,
+                            self.path                                     ,
+                            error                                         ) )
+
+                self.types[ name ] = typeName
+
+                if remaining is not None:
+                    remaining.discard( name )
+
+                    if not remaining:
+                        return
+
+            offset += size
+
+    def __readInt( self         ,
+                   inMappedFile ,
+                   inOffsetInt  ):
+        '''Reads a little endian 32 bits integer.
+
+        @param(mmap.mmap) inMappedFile:
+        Memory mapped file.
+
+        @param(int) inOffsetInt:
+        Offset of the integer.
+
+        @return(int):
+        Integer value.
+        '''
+
+        if inOffsetInt + 4 > len( inMappedFile ):
+            raise ValueError( 'Truncated OpenEXR header "{}"'.format(
+                self.path                                           ) )
+
+        return struct.unpack_from( '<i'         ,
+                                   inMappedFile ,
+                                   inOffsetInt  )[ 0 ]
+
+    def __readString( self         ,
+                      inMappedFile ,
+                      inOffsetInt  ):
+        '''Reads a null terminated string.
+
+        @param(mmap.mmap) inMappedFile:
+        Memory mapped file.
+
+        @param(int) inOffsetInt:
+        Offset of the string.
+
+        @return(tuple):
+        Tuple ( string , offset after the null character ).
+        '''
+
+        end = inMappedFile.find( b'\x00' , inOffsetInt )
+
+        if end < 0:
+            raise ValueError( 'Truncated OpenEXR header "{}"'.format(
+                self.path                                           ) )
+
+        return ( inMappedFile[ inOffsetInt:end ].decode( 'latin-1' ) ,
+                 end + 1                                             )
+
+    @classmethod
+    def decode( cls       ,
+                inTypeStr ,
+                inData    ):
+        '''Decodes an attribute value. Only simple types are decoded, others
+        are returned as raw bytes.
+
+        @param(str) inTypeStr:
+        OpenEXR attribute type name.
+
+        @param(bytes) inData:
+        Raw attribute value.
+
+        @return(object):
+        Decoded value.
+        '''
+
+        if inTypeStr in cls.DL_NUMERIC_FORMATS:
+            numericFormat = cls.DL_NUMERIC_FORMATS[ inTypeStr ]
+
+            if len( inData ) != struct.calcsize( numericFormat ):
+                raise ValueError( 'Invalid {} size {}'.format( inTypeStr     ,
+                                                               len( inData ) ) )
+
+            return struct.unpack( numericFormat ,
+                                  inData        )[ 0 ]
+
+        if inTypeStr == 'string':
+            return inData.decode( 'utf-8' , 'replace' )
+
+        if inTypeStr == 'stringvector':
+            values = []
+            offset = 0
+
+            while offset + 4 <= len( inData ):
+                size = struct.unpack_from( '<i' , inData , offset )[ 0 ]
+                offset += 4
+
+                if size < 0 or offset + size > len( inData ):
+                    raise ValueError( 'Truncated stringvector' )
+
+                values.append(
+                    inData[ offset:offset + size ].decode( 'utf-8' , 'replace' ) )
+                offset += size
+
+            return values
+
+        return inData
+
+    def getAttribute( self             ,
+                      inNameStr        ,
+                      inDefault = None ):
+        '''Gets an attribute value. Name is compared ignoring namespace
+        prefix, case and non alphanumeric characters, like exiftool tag
+        names.
+
+        @param(str) inNameStr:
+        Attribute name.
+
+        @param(object) inDefault:
+        Value returned if there is no such attribute.
+
+        @return(object):
+        Attribute value.
+        '''
+
+        if inNameStr in self.attributes:
+            return self.attributes[ inNameStr ]
+
+        key = self.normalize( inNameStr )
+
+        for name , value in self.attributes.items():
+            if self.normalize( name ) == key:
+                return value
+
+        return inDefault
+
+    @classmethod
+    def getUpstreamFiles( cls       ,
+                          inPathStr ):
+        '''Gets upstream files attribute of an OpenEXR file as a string,
+        vectors joined, as exiftool -UpstreamFiles reports it.
+
+        @param(str) inPathStr:
+        Path of the OpenEXR file.
+
+        @return(str):
+        Upstream files, None if the file has no such attribute.
+        '''
+
+        value = cls( inPathStr ).getAttribute( cls.DL_UPSTREAM_FILES )
+
+        if isinstance( value , list ):
+            return ', '.join( value )
+
+        if isinstance( value , bytes ):
+            return None
+
+        return value
+
+    @staticmethod
+    def normalize( inNameStr ):
+        '''Normalizes an attribute name, without namespace prefix like
+        'nuke/', lower case alphanumeric only.
+
+        @param(str) inNameStr:
+        Attribute name.
+
+        @return(str):
+        Normalized name.
+        '''
+
+        return re.sub( r'[^0-9a-z]'                            ,
+                       ''                                      ,
+                       inNameStr.rpartition( '/' )[ 2 ].lower() )
+
+
+def benchmark( inPaths          ,
+               inRepeatInt = 10 ):
+    '''Times upstream files reading with exiftool and with DLExrHeader.
+
+    @param(list) inPaths:
+    Paths of OpenEXR files.
+
+    @param(int) inRepeatInt:
+    Number of times each file is read.
+
+    @return(dict):
+    Seconds per read by method name.
+    '''
+
+    timings = {}
+
+    for methodName , method in (
+            ( 'exiftool'                                                      ,
+              lambda pathStr : os.popen(
+                  'exiftool -UpstreamFiles {}'.format( pathStr ) ).read() )   ,
+            ( 'DLExrHeader'                                                   ,
+              DLExrHeader.getUpstreamFiles                                    ) ):
+
+        startTime = time.time()
+
+        for _ in range( inRepeatInt ):
+            for pathStr in inPaths:
+                method( pathStr )
+
+        timings[ methodName ] = ( ( time.time() - startTime ) /
+                                  ( inRepeatInt * len( inPaths ) ) )
+
+    return timings
+
+
+def main( inArgs = None ):
+    '''Command line entry point benchmarking against exiftool.
+
+    @param(list) inArgs:
+    List of command line arguments, sys.argv if None.
+
+    @return(int):
+    Exit code.
+    '''
+
+    parser = argparse.ArgumentParser(
+        description = 'Benchmark OpenEXR header reading against exiftool.' )
+
+    parser.add_argument( 'paths'                                 ,
+                         nargs = '+'                             ,
+                         help  = 'OpenEXR files.'                )
+    parser.add_argument( '--repeat'                              ,
+                         type    = int                           ,
+                         default = 10                            ,
+                         help    = 'Number of reads per file.'   )
+
+    args = parser.parse_args( inArgs )
+
+    for pathStr in args.paths:
+        sys.stdout.write( '{}: {}\n'.format(
+            pathStr                                       ,
+            DLExrHeader.getUpstreamFiles( pathStr )       ) )
+
+    timings = benchmark( args.paths  ,
+                         args.repeat )
+
+    for methodName in sorted( timings ):
+        sys.stdout.write( '{:<12} {:.6f}s per file\n'.format(
+            methodName                                      ,
+            timings[ methodName ]                           ) )
+
+    if timings[ 'DLExrHeader' ]:
+        sys.stdout.write( 'speedup      {:.1f}x\n'.format(
+            timings[ 'exiftool' ] / timings[ 'DLExrHeader' ] ) )
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit( main() )
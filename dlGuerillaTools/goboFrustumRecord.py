@@ -0,0 +1,166 @@
+################################################################################
+# L ATELIER ANIMATION INC.
+#
+# [2012] - [2020] L ATELIER ANIMATION INC. All Rights Reserved.
+#
+# NOTICE: All information contained herein is, and remains
+#         the property of L Atelier Animation Inc. and its suppliers,
+#         if any.  The intellectual and technical concepts contained
+#         herein are proprietary to L Atelier Animation Inc. and its
+#         suppliers and may be covered by Canadian, U.S. and/or
+#         Foreign Patents, patents in process, and are protected
+#         by trade secret or copyright law. Dissemination of this
+#         information or reproduction of this material is strictly
+#         forbidden unless prior written permission is obtained from
+#         L ATELIER ANIMATION INC.
+#
+################################################################################
+'''Module holding the gobo map state of a frustum.
+
+@package dlGuerillaTools.goboFrustumRecord
+@author  Esteban Ortega <esteban.ortega@latelieranimation.com>
+'''
+
+import dlGuerillaTools.goboMapResolver
+
+__all__ = ( 'DLGoboFrustumRecord' , )
+
+class DLGoboFrustumRecord( object ):
+    '''Gobo map state of a frustum, read from the scene once and resolved
+    once, so updating doesn't query the scene, the file system nor the
+    tracker again unless the frustum path changed in between.
+    '''
+
+    ## Define status for gobo map.
+    # type: tuple
+    DL_STATUS = dlGuerillaTools.goboMapResolver.DLGoboMapResolver.DL_STATUS
+
+    def __init__( self      ,
+                  inFrustum ):
+        '''Initialize class, reads the frustum, must be called on the main
+        thread.
+
+        @param(ddGuerillaApi.DDNode) inFrustum:
+        Frustum node of a light.
+
+        @return(None):
+        No return value.
+        '''
+
+        ## Frustum node.
+        # type: ddGuerillaApi.DDNode
+        self.frustum = inFrustum
+
+        ## Name of the light.
+        # type: str
+        self.lightName = inFrustum.parent.name
+
+        ## Full name of the frustum node.
+        # type: str
+        self.frustumName = inFrustum.fullName
+
+        ## Gobo map path set on the frustum when read.
+        # type: str
+        self.path = inFrustum.Input5.Value.get()
+
+        ## Resolution of path, see DLGoboMapResolver.resolveDict, None until
+        ## resolved.
+        # type: dict
+        self.resolution = None
+
+        ## One of DL_STATUS, None until resolved.
+        # type: str
+        self.status = None
+
+        ## Version of the gobo map, None if unknown.
+        # type: int
+        self.version = None
+
+        ## Nuke script of the gobo map, None if unknown.
+        # type: str
+        self.nukeScript = None
+
+        return
+
+    def apply( self ):
+        '''Sets the published path on the frustum, must be called on the main
+        thread, in a ddGuerillaApi.DDModifier.
+
+        @return(bool):
+        True if the frustum has been updated, False otherwise.
+        '''
+
+        targetPath = self.getTargetPath()
+
+        if targetPath is None:
+            return False
+
+        self.frustum.Input5.Value.set( targetPath )
+
+        self.path       = targetPath
+        self.status     = self.DL_STATUS[ 1 ]
+        self.version    = self.resolution[ 'publishedVersion' ]
+        self.nukeScript = self.resolution[ 'publishedNukeScript' ]
+
+        return True
+
+    def getTargetPath( self ):
+        '''Gets path the frustum should be updated to.
+
+        @return(str):
+        Published path, None if there is nothing to update.
+        '''
+
+        if self.resolution is None or self.status != self.DL_STATUS[ 2 ]:
+            return None
+
+        return self.resolution[ 'publishedPath' ]
+
+    def isPathChanged( self ):
+        '''Checks if the frustum path changed since read, must be called on
+        the main thread.
+
+        @return(bool):
+        True if the path set on the frustum is not path anymore.
+        '''
+
+        return self.frustum.Input5.Value.get() != self.path
+
+    def refresh( self ):
+        '''Reads path from the frustum again, resolution is reset, must be
+        called on the main thread.
+
+        @return(None):
+        No return value.
+        '''
+
+        self.path = self.frustum.Input5.Value.get()
+
+        self.setResolution( None )
+
+        return
+
+    def setResolution( self         ,
+                       inResolution ):
+        '''Sets resolution of path.
+
+        @param(dict) inResolution:
+        Resolution, see DLGoboMapResolver.resolveDict, None to reset.
+
+        @return(None):
+        No return value.
+        '''
+
+        self.resolution = inResolution
+
+        if inResolution is None:
+            self.status     = None
+            self.version    = None
+            self.nukeScript = None
+
+        else:
+            self.status     = inResolution[ 'status' ]
+            self.version    = inResolution[ 'version' ]
+            self.nukeScript = inResolution[ 'nukeScript' ]
+
+        return
@@ -0,0 +1,72 @@
+################################################################################
+# L ATELIER ANIMATION INC.
+#
+# [2012] - [2020] L ATELIER ANIMATION INC. All Rights Reserved.
+#
+# NOTICE: All information contained herein is, and remains
+#         the property of L Atelier Animation Inc. and its suppliers,
+#         if any.  The intellectual and technical concepts contained
+#         herein are proprietary to L Atelier Animation Inc. and its
+#         suppliers and may be covered by Canadian, U.S. and/or
+#         Foreign Patents, patents in process, and are protected
+#         by trade secret or copyright law. Dissemination of this
+#         information or reproduction of this material is strictly
+#         forbidden unless prior written permission is obtained from
+#         L ATELIER ANIMATION INC.
+#
+################################################################################
+'''Module finding gobo frustums of the scene lights.
+
+Usage:
+    frustums = dlGuerillaTools.goboLightIndex.DLGoboLightIndex.getFrustums()
+
+@package dlGuerillaTools.goboLightIndex
+@author  Esteban Ortega <esteban.ortega@latelieranimation.com>
+'''
+
+import dlConstants
+
+import ddConstants.guerilla
+import ddGuerillaApi
+
+__all__ = ( 'DLGoboLightIndex' , )
+
+class DLGoboLightIndex( object ):
+    '''Finds frustum light shaders of scene lights and light attributes in a
+    single traversal of the scene.
+
+    Guerilla has no scene change callbacks, so nothing is kept between
+    calls and each call reads the current scene.
+    '''
+
+    ## Name of the frustum light shader of legacy gobo setups.
+    # type: str
+    DL_LEGACY_FRUSTUM_NAME = 'Frustum'
+
+    @classmethod
+    def getFrustums( cls ):
+        '''Gets frustums of all lights, new frustum first then legacy one.
+
+        @return(list):
+        List of ddGuerillaApi.DDNode nodes, in scene order.
+        '''
+
+        frustums = []
+
+        nodeTypeFilter = ddGuerillaApi.filters.DDExactTypeName(
+            ( ddConstants.guerilla.nodeType.DD_RGN_LIGHT            ,
+              ddConstants.guerilla.nodeType.DD_RGN_LIGHT_ATTRIBUTES ) )
+
+        for nodeLight in ddGuerillaApi.DDScene().findAll( nodeTypeFilter         ,
+                                                          inRecursiveBool = True ):
+
+            frustumNode = nodeLight.findChild(
+                dlConstants.guerilla.goboLightShaderName.DL_GOBO_FRUSTUM_SHADER_NAME )
+
+            if frustumNode is None:
+                frustumNode = nodeLight.findChild( cls.DL_LEGACY_FRUSTUM_NAME )
+
+            if frustumNode is not None:
+                frustums.append( frustumNode )
+
+        return frustums
@@ -0,0 +1,316 @@
+################################################################################
+# L ATELIER ANIMATION INC.
+#
+# [2012] - [2020] L ATELIER ANIMATION INC. All Rights Reserved.
+#
+# NOTICE: All information contained herein is, and remains
+#         the property of L Atelier Animation Inc. and its suppliers,
+#         if any.  The intellectual and technical concepts contained
+#         herein are proprietary to L Atelier Animation Inc. and its
+#         suppliers and may be covered by Canadian, U.S. and/or
+#         Foreign Patents, patents in process, and are protected
+#         by trade secret or copyright law. Dissemination of this
+#         information or reproduction of this material is strictly
+#         forbidden unless prior written permission is obtained from
+#         L ATELIER ANIMATION INC.
+#
+################################################################################
+'''Module to cache gobo map path resolutions on disk.
+
+@package dlGuerillaTools.goboMapCache
+@author  Esteban Ortega <esteban.ortega@latelieranimation.com>
+'''
+
+import json
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+__all__ = ( 'DLGoboMapCache' , )
+
+class DLGoboMapCache( object ):
+    '''Persistent cache of gobo map resolutions, keyed by path and a file
+    system signature. The signature covers the path, its link target and
+    its directory, where sibling .tex links and sequence frames live, so a
+    new publish or relink invalidates the entry. Least recently used
+    entries are evicted above a maximum count.
+
+    Several processes may share the cache file, saving merges the entries
+    of the file under an exclusive lock so none of them is dropped.
+    '''
+
+    ## Environment variable overriding the cache directory.
+    # type: str
+    DL_ENV_CACHE_DIR = 'DL_GUERILLA_GOBO_CACHE_DIR'
+
+    ## Name of the cache file.
+    # type: str
+    DL_FILE_NAME = 'goboMaps.json'
+
+    ## Maximum number of cached resolutions.
+    # type: int
+    DL_MAX_ENTRIES = 10000
+
+    ## Shared cache.
+    # type: DLGoboMapCache
+    __instance = None
+
+    def __init__( self                 ,
+                  inCacheDirStr = None ,
+                  inMaxEntries  = None ):
+        '''Initialize class.
+
+        @param(str) inCacheDirStr:
+        Directory where the cache file is stored, user cache directory if None.
+
+        @param(int) inMaxEntries:
+        Maximum number of cached resolutions, DL_MAX_ENTRIES if None.
+
+        @return(None):
+        No return value.
+        '''
+
+        if inCacheDirStr is None:
+            inCacheDirStr = os.environ.get( self.DL_ENV_CACHE_DIR )
+
+        if inCacheDirStr is None:
+            inCacheDirStr = os.path.join(
+                os.environ.get( 'XDG_CACHE_HOME'                          ,
+                                os.path.expanduser( '~/.cache' )          ) ,
+                'dlGuerillaTools'                                           )
+
+        ## Path of the cache file.
+        # type: str
+        self.path = os.path.join( inCacheDirStr     ,
+                                  self.DL_FILE_NAME )
+
+        ## Maximum number of cached resolutions.
+        # type: int
+        self.maxEntries = inMaxEntries or self.DL_MAX_ENTRIES
+
+        ## Cached entries by path, loaded on first access.
+        # type: dict
+        self.__entries = None
+
+        ## True if entries changed since last save.
+        # type: bool
+        self.__modified = False
+
+        ## Lock protecting entries, resolutions run in worker threads.
+        # type: threading.Lock
+        self.__lock = threading.Lock()
+
+        return
+
+    def __read( self ):
+        '''Reads the cache file.
+
+        @return(dict):
+        Cached entries by path, empty if missing or unreadable.
+        '''
+
+        try:
+            with open( self.path ) as cacheFile:
+                return json.load( cacheFile )
+
+        except ( IOError , OSError , ValueError ):
+            return {}
+
+    def __load( self ):
+        '''Loads cache file on first access, must be called with lock held.
+
+        @return(dict):
+        Cached entries by path.
+        '''
+
+        if self.__entries is None:
+            self.__entries = self.__read()
+
+        return self.__entries
+
+    def __write( self ):
+        '''Merges, evicts and writes entries, must be called with both
+        locks held.
+
+        @return(bool):
+        True if the cache file has been written, False otherwise.
+        '''
+
+        entries = self.__load()
+
+        for pathStr , entry in self.__read().items():
+            current = entries.get( pathStr )
+
+            if current is None or entry[ 'lastUsed' ] > current[ 'lastUsed' ]:
+                entries[ pathStr ] = entry
+
+        if len( entries ) > self.maxEntries:
+            leastUsed = sorted(
+                entries                                                 ,
+                key = lambda pathStr : entries[ pathStr ][ 'lastUsed' ] )
+
+            for pathStr in leastUsed[ :len( entries ) - self.maxEntries ]:
+                del entries[ pathStr ]
+
+        tempPathStr = '{}.{}.tmp'.format( self.path   ,
+                                          os.getpid() )
+
+        try:
+            with open( tempPathStr , 'w' ) as cacheFile:
+                json.dump( entries       ,
+                           cacheFile     ,
+                           default = str )
+
+            os.rename( tempPathStr ,
+                       self.path   )
+
+        except ( IOError , OSError ):
+            if os.path.exists( tempPathStr ):
+                os.remove( tempPathStr )
+
+            return False
+
+        self.__modified = False
+
+        return True
+
+    def get( self      ,
+             inPathStr ):
+        '''Gets cached resolution of a path if its signature did not change.
+
+        @param(str) inPathStr:
+        Gobo map path.
+
+        @return(dict):
+        Resolution, None if not cached or outdated.
+        '''
+
+        signature = self.getSignature( inPathStr )
+
+        with self.__lock:
+            entry = self.__load().get( inPathStr )
+
+            if entry is None or entry[ 'signature' ] != signature:
+                return None
+
+            entry[ 'lastUsed' ] = time.time()
+            self.__modified     = True
+
+            return entry[ 'resolution' ]
+
+    @classmethod
+    def getInstance( cls ):
+        '''Gets the shared cache.
+
+        @return(DLGoboMapCache):
+        Shared cache.
+        '''
+
+        if cls.__instance is None:
+            cls.__instance = cls()
+
+        return cls.__instance
+
+    @staticmethod
+    def getSignature( inPathStr ):
+        '''Gets file system signature of a path, mtime and inode of the path
+        itself, its link target and its directory. Sequence patterns don't
+        exist as files, their directory still covers frames changes.
+
+        @param(str) inPathStr:
+        Gobo map path.
+
+        @return(list):
+        Signature, JSON serializable.
+        '''
+
+        signature = []
+
+        for pathStr , statFunction in ( ( inPathStr                    , os.lstat ) ,
+                                        ( inPathStr                    , os.stat  ) ,
+                                        ( os.path.dirname( inPathStr ) , os.stat  ) ):
+            try:
+                stat = statFunction( pathStr )
+
+            except OSError:
+                signature.append( None )
+
+                continue
+
+            signature.append( [ stat.st_mtime ,
+                                stat.st_ino   ] )
+
+        return signature
+
+    def save( self ):
+        '''Merges entries written by other processes, most recently used
+        first, evicts least recently used entries above maximum count, then
+        writes the cache file in a temporary file renamed to be atomic. The
+        whole update is done under an exclusive lock of the cache file.
+
+        @return(bool):
+        True if the cache file has been written, False otherwise.
+        '''
+
+        with self.__lock:
+
+            if not self.__modified:
+                return False
+
+            try:
+                if not os.path.isdir( os.path.dirname( self.path ) ):
+                    os.makedirs( os.path.dirname( self.path ) )
+
+                lockFile = open( '{}.lock'.format( self.path ) , 'w' )
+
+            except ( IOError , OSError ):
+                return False
+
+            try:
+                if fcntl is not None:
+                    fcntl.flock( lockFile.fileno() ,
+                                 fcntl.LOCK_EX     )
+
+                return self.__write()
+
+            finally:
+                # Closing the file releases the lock.
+                lockFile.close()
+
+    def set( self               ,
+             inPathStr          ,
+             inResolution       ,
+             inSignature = None ):
+        '''Caches resolution of a path with its signature.
+
+        @param(str) inPathStr:
+        Gobo map path.
+
+        @param(dict) inResolution:
+        JSON serializable resolution.
+
+        @param(list) inSignature:
+        Signature taken before resolving, so a change during resolution
+        is not hidden, current signature if None.
+
+        @return(None):
+        No return value.
+        '''
+
+        signature = inSignature
+
+        if signature is None:
+            signature = self.getSignature( inPathStr )
+
+        with self.__lock:
+            self.__load()[ inPathStr ] = { 'signature'  : signature    ,
+                                           'resolution' : inResolution ,
+                                           'lastUsed'   : time.time()  }
+            self.__modified = True
+
+        return
@@ -0,0 +1,271 @@
+################################################################################
+# L ATELIER ANIMATION INC.
+#
+# [2012] - [2020] L ATELIER ANIMATION INC. All Rights Reserved.
+#
+# NOTICE: All information contained herein is, and remains
+#         the property of L Atelier Animation Inc. and its suppliers,
+#         if any.  The intellectual and technical concepts contained
+#         herein are proprietary to L Atelier Animation Inc. and its
+#         suppliers and may be covered by Canadian, U.S. and/or
+#         Foreign Patents, patents in process, and are protected
+#         by trade secret or copyright law. Dissemination of this
+#         information or reproduction of this material is strictly
+#         forbidden unless prior written permission is obtained from
+#         L ATELIER ANIMATION INC.
+#
+################################################################################
+'''Module to resolve the publish state of gobo map paths.
+
+Resolution only touches the file system and the tracker, never the
+Guerilla scene, so it can run in worker threads.
+
+@package dlGuerillaTools.goboMapResolver
+@author  Esteban Ortega <esteban.ortega@latelieranimation.com>
+'''
+
+import re
+
+import ddConstants.fileExtensions
+import ddPath
+
+import dlGuerillaTools.exrHeader
+import dlGuerillaTools.goboMapCache
+
+__all__ = ( 'DLGoboMapResolver' , )
+
+class DLGoboMapResolver( object ):
+    '''Resolves gobo map paths to their publish status, version and Nuke
+    script.
+    '''
+
+    ## Define status for gobo map.
+    # type: tuple
+    DL_STATUS = ( 'Published'               ,
+                  'Updated'                 ,
+                  'Will update'             ,
+                  'Offpipe / Not Published' ,
+                  'Empty File Path'         )
+
+    ## Define pattern to find path str.
+    # type: sre.SRE_Pattern
+    DL_GROUP_PATTERN = re.compile( '\'(?P<path>.*)\'' )
+
+    ## Resolutions are cached on disk if True.
+    # type: bool
+    DL_USE_CACHE = True
+
+    @staticmethod
+    def getLinkedPublishedFile( inPathStr ):
+        '''Gets published file based on passed path str from frustum node
+        if any and returns a published.
+
+        @param(str) inPathStr:
+        String representing path to image gobo map.
+
+        @return(DDPublishFile):
+        Return ddPipeApi.DDPublishFile if any, None otherwise.
+        '''
+
+        pathNode      = ddPath.DDFile( inPathStr )
+        publishedFile = pathNode.getPublishedFile()
+
+        if publishedFile:
+            return publishedFile
+
+        sequence      = pathNode.getSequence()
+        if sequence is not None:
+            try:
+                firstFrame    = sequence.getFile( sequence.getFirstFrame() )
+            except ValueError:
+                return publishedFile
+        else:
+            return publishedFile
+
+        if sequence.isSingleFrame():
+
+            newFilePath = ( firstFrame.sequencePrefix[ :-1 ]                  +
+                            str( ddConstants.fileExtensions.DD_FILE_EXT_TEX ) )
+
+            newPath = ddPath.DDFile( newFilePath )
+            if newPath.isLink():
+                linkedFile = newPath.getLink()
+                return linkedFile.getPublishedFile()
+
+            else:
+                return publishedFile
+        else:
+
+            linkedFile = firstFrame.getLink()
+            if linkedFile:
+                return linkedFile.getPublishedFile()
+
+            else:
+                return publishedFile
+
+    @classmethod
+    def getNukeScriptPath( cls       ,
+                           inPathStr ):
+        '''Gets nuke script path based on passed exr image path string.
+
+        @param(str) inPathStr:
+        String representing the path to tex file.
+
+        @return(str):
+        Path to Nuke script file which was used to render the file.
+        '''
+
+        pathNode = ddPath.DDFile( inPathStr )
+
+        if pathNode.lexists():
+            sequence = pathNode.getSequence()
+
+            if sequence is None:
+                return None
+
+            else:
+                try:
+                    firstFrame = sequence.getFile( sequence.getFirstFrame() )
+
+                except ValueError:
+                    return None
+
+            if sequence.isSingleFrame():
+                newFilePath = (
+                    firstFrame.changeExtension(
+                        ddConstants.fileExtensions.DD_FILE_EXT_EXR ) )
+
+                # Read in process, exiftool costs an interpreter start per file.
+                try:
+                    nukeFileStr = (
+                        dlGuerillaTools.exrHeader.DLExrHeader.getUpstreamFiles(
+                            str( newFilePath )                                ) )
+
+                except ( IOError , OSError , ValueError ):
+                    return None
+
+                if nukeFileStr is None:
+                    return None
+
+                matches = cls.DL_GROUP_PATTERN.search( nukeFileStr )
+
+                if matches:
+                    return matches.group( 'path' )
+
+                else:
+                    return None
+
+        else:
+            return None
+
+    @staticmethod
+    def getPublishedFilePath( inPublishedFile ):
+        '''Gets published file path as set on frustums, sequences use the
+        dollar frame pattern.
+
+        @param(ddPipeApi.DDPublishedFile) inPublishedFile:
+        Published gobo map.
+
+        @return(str|ddPath.sequence.DDSequence):
+        Published file path.
+        '''
+
+        publishedFilePath = inPublishedFile.localPath
+
+        # Check for a sequence and change padding
+        if isinstance( publishedFilePath , ddPath.sequence.DDSequence ):
+            if '%06d' == publishedFilePath.patternFrame:
+                publishedFilePath = (
+                    publishedFilePath.convertToPattern(
+                        inPatternStr = ddPath.constant.DD_PATTERN_DOLLAR_FRAME ) )
+
+        return publishedFilePath
+
+    @classmethod
+    def resolve( cls       ,
+                 inPathStr ):
+        '''Resolves publish state of a gobo map path.
+
+        @param(str) inPathStr:
+        Gobo map path set on a frustum.
+
+        @return(tuple):
+        Tuple ( status , version , nuke script ).
+        '''
+
+        resolution = cls.resolveDict( inPathStr )
+
+        return ( resolution[ 'status' ]     ,
+                 resolution[ 'version' ]    ,
+                 resolution[ 'nukeScript' ] )
+
+    @classmethod
+    def resolveDict( cls       ,
+                     inPathStr ):
+        '''Resolves publish state of a gobo map path, from cache if the path
+        and its link target did not change, no file system walk nor tracker
+        query is done then.
+
+        @param(str) inPathStr:
+        Gobo map path set on a frustum.
+
+        @return(dict):
+        Resolution with keys status, version, nukeScript, publishedFileId,
+        publishedPath, publishedVersion and publishedNukeScript, published
+        ones None if there is no linked published file.
+        '''
+
+        resolution = { 'status'              : cls.DL_STATUS[ 4 ] ,
+                       'version'             : None               ,
+                       'nukeScript'          : None               ,
+                       'publishedFileId'     : None               ,
+                       'publishedPath'       : None               ,
+                       'publishedVersion'    : None               ,
+                       'publishedNukeScript' : None               }
+
+        if not inPathStr:
+            return resolution
+
+        inPathStr = str( inPathStr )
+        cache     = None
+        signature = None
+
+        if cls.DL_USE_CACHE:
+            cache  = dlGuerillaTools.goboMapCache.DLGoboMapCache.getInstance()
+            cached = cache.get( inPathStr )
+
+            if cached is not None:
+                return cached
+
+            signature = cache.getSignature( inPathStr )
+
+        publishedFile = cls.getLinkedPublishedFile( inPathStr )
+
+        if publishedFile:
+            publishedPath = str( cls.getPublishedFilePath( publishedFile ) )
+
+            resolution[ 'publishedFileId' ]     = publishedFile.id
+            resolution[ 'publishedPath' ]       = publishedPath
+            resolution[ 'publishedVersion' ]    = publishedFile.versionNumber
+            resolution[ 'publishedNukeScript' ] = publishedFile.work.name
+
+        if publishedFile and inPathStr == resolution[ 'publishedPath' ]:
+            resolution[ 'status' ]     = cls.DL_STATUS[ 0 ]
+            resolution[ 'version' ]    = resolution[ 'publishedVersion' ]
+            resolution[ 'nukeScript' ] = resolution[ 'publishedNukeScript' ]
+
+        else:
+            if publishedFile:
+                resolution[ 'status' ] = cls.DL_STATUS[ 2 ]
+            else:
+                resolution[ 'status' ] = cls.DL_STATUS[ 3 ]
+
+            resolution[ 'nukeScript' ] = cls.getNukeScriptPath( inPathStr )
+            resolution[ 'version' ]    = ddPath.DDFile( inPathStr ).getVersion()
+
+        if cache is not None:
+            cache.set( inPathStr  ,
+                       resolution ,
+                       signature  )
+
+        return resolution
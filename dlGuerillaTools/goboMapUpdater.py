@@ -0,0 +1,257 @@
+################################################################################
+# L ATELIER ANIMATION INC.
+#
+# [2012] - [2020] L ATELIER ANIMATION INC. All Rights Reserved.
+#
+# NOTICE: All information contained herein is, and remains
+#         the property of L Atelier Animation Inc. and its suppliers,
+#         if any.  The intellectual and technical concepts contained
+#         herein are proprietary to L Atelier Animation Inc. and its
+#         suppliers and may be covered by Canadian, U.S. and/or
+#         Foreign Patents, patents in process, and are protected
+#         by trade secret or copyright law. Dissemination of this
+#         information or reproduction of this material is strictly
+#         forbidden unless prior written permission is obtained from
+#         L ATELIER ANIMATION INC.
+#
+################################################################################
+'''Module to report and update gobo maps of the current scene frustums,
+without UI.
+
+Usage:
+    updater = DLGoboMapUpdater()
+    report  = updater.run()
+
+@package dlGuerillaTools.goboMapUpdater
+@author  Esteban Ortega <esteban.ortega@latelieranimation.com>
+'''
+
+import collections
+import multiprocessing.pool
+
+import ddGuerillaApi
+import ddLogger
+
+import dlGuerillaTools.goboFrustumRecord
+import dlGuerillaTools.goboLightIndex
+import dlGuerillaTools.goboMapCache
+import dlGuerillaTools.goboMapResolver
+
+__all__ = ( 'DLGoboMapUpdater' , )
+
+class DLGoboMapUpdater( object ):
+    '''Resolves gobo map status of frustum records and updates out of date
+    ones with their published gobo map. Scene is only accessed from the
+    calling thread, paths are resolved in worker threads, once each.
+    '''
+
+    ## Define status for gobo map.
+    # type: tuple
+    DL_STATUS = dlGuerillaTools.goboMapResolver.DLGoboMapResolver.DL_STATUS
+
+    ## Number of threads resolving gobo map paths.
+    # type: int
+    DL_RESOLVE_THREADS = 16
+
+    def __init__( self                   ,
+                  inThreadCountInt = None ):
+        '''Initialize class.
+
+        @param(int) inThreadCountInt:
+        Number of threads resolving paths, DL_RESOLVE_THREADS if None.
+
+        @return(None):
+        No return value.
+        '''
+
+        ## Number of threads resolving paths.
+        # type: int
+        self.threadCount = inThreadCountInt or self.DL_RESOLVE_THREADS
+
+        ## Resolutions by path, shared by the records of a same gobo map.
+        # type: dict[str, dict]
+        self.resolutions = {}
+
+        return
+
+    def apply( self      ,
+               inRecords ):
+        '''Updates out of date frustums with their published gobo map, in a
+        single modification. Records whose frustum path changed since read
+        are read and resolved again first.
+
+        @param(list) inRecords:
+        List of dlGuerillaTools.goboFrustumRecord.DLGoboFrustumRecord.
+
+        @return(list):
+        List of updated records.
+        '''
+
+        changedRecords = [ record for record in inRecords
+                           if record.isPathChanged()      ]
+
+        for record in changedRecords:
+            record.refresh()
+
+        self.forget( [ record.path for record in changedRecords ] )
+        self.resolve( changedRecords )
+
+        updatedRecords = []
+
+        with ddGuerillaApi.DDModifier():
+            for record in inRecords:
+                if record.apply():
+                    updatedRecords.append( record )
+
+        return updatedRecords
+
+    def forget( self    ,
+                inPaths ):
+        '''Forgets resolutions of paths, they are resolved again by next
+        resolve.
+
+        @param(list) inPaths:
+        Gobo map paths.
+
+        @return(None):
+        No return value.
+        '''
+
+        for pathStr in inPaths:
+            self.resolutions.pop( pathStr , None )
+
+        return
+
+    @staticmethod
+    def getOutdatedRecords( inRecords ):
+        '''Gets records having a published gobo map to update to.
+
+        @param(list) inRecords:
+        List of dlGuerillaTools.goboFrustumRecord.DLGoboFrustumRecord.
+
+        @return(list):
+        List of out of date records.
+        '''
+
+        return [ record for record in inRecords
+                 if record.getTargetPath() is not None ]
+
+    @staticmethod
+    def getRecords():
+        '''Reads frustums of the current scene.
+
+        @return(list):
+        List of unresolved
+        dlGuerillaTools.goboFrustumRecord.DLGoboFrustumRecord.
+        '''
+
+        frustums = dlGuerillaTools.goboLightIndex.DLGoboLightIndex.getFrustums()
+
+        return [ dlGuerillaTools.goboFrustumRecord.DLGoboFrustumRecord( frustum )
+                 for frustum in frustums                                          ]
+
+    def resolve( self      ,
+                 inRecords ):
+        '''Resolves records, paths not resolved yet are resolved
+        concurrently, once each.
+
+        @param(list) inRecords:
+        List of dlGuerillaTools.goboFrustumRecord.DLGoboFrustumRecord.
+
+        @return(None):
+        No return value.
+        '''
+
+        paths = list( collections.OrderedDict.fromkeys(
+            record.path for record in inRecords
+            if record.path not in self.resolutions ) )
+
+        if paths:
+            pool = multiprocessing.pool.ThreadPool(
+                min( self.threadCount , len( paths ) ) )
+
+            try:
+                self.resolutions.update( pool.map( self._resolveJob ,
+                                                   paths            ) )
+
+            finally:
+                pool.close()
+                pool.join()
+
+        for record in inRecords:
+            record.setResolution( self.resolutions[ record.path ] )
+
+        return
+
+    def run( self                 ,
+             inDryRunBool = False ):
+        '''Resolves all frustums of the current scene and updates out of
+        date ones.
+
+        @param(bool) inDryRunBool:
+        Only report out of date frustums if True.
+
+        @return(dict):
+        Report with keys frustums, uniqueGoboMaps, statuses, a dict of
+        count by status before update, and updated, a list of dict with
+        keys light, frustum, path and version.
+        '''
+
+        records = self.getRecords()
+
+        self.resolve( records )
+
+        statuses = collections.Counter( record.status for record in records )
+        outdated = self.getOutdatedRecords( records )
+
+        if inDryRunBool:
+            updatedRecords = outdated
+
+        else:
+            updatedRecords = self.apply( outdated )
+
+        dlGuerillaTools.goboMapCache.DLGoboMapCache.getInstance().save()
+
+        updated = []
+
+        for record in updatedRecords:
+            updated.append(
+                { 'light'   : record.lightName                             ,
+                  'frustum' : record.frustumName                           ,
+                  'path'    : str( record.getTargetPath() or record.path ) ,
+                  'version' : record.resolution[ 'publishedVersion' ]      } )
+
+        return { 'frustums'       : len( records )                                  ,
+                 'uniqueGoboMaps' : len( set( record.path for record in records ) ) ,
+                 'statuses'       : dict( statuses )                                ,
+                 'updated'        : updated                                         }
+
+    @staticmethod
+    def _resolveJob( inPathStr ):
+        '''Thread pool job resolving a gobo map path, without Guerilla scene
+        access. A path failing to resolve is reported as not published, so
+        it never aborts the resolution of the other paths.
+
+        @param(str) inPathStr:
+        Gobo map path.
+
+        @return(tuple):
+        Tuple ( path , resolution ).
+        '''
+
+        resolver = dlGuerillaTools.goboMapResolver.DLGoboMapResolver
+
+        try:
+            resolution = resolver.resolveDict( inPathStr )
+
+        # Any file system or tracker error, raised in a worker thread.
+        except Exception as error:
+            ddLogger.DD_GUERILLA.warning(
+                'Not able to resolve gobo map "{}": {}'.format( inPathStr ,
+                                                                error     ) )
+
+            resolution = dict( resolver.resolveDict( None ) ,
+                               status = resolver.DL_STATUS[ 3 ] )
+
+        return ( inPathStr  ,
+                 resolution )
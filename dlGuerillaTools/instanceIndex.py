@@ -0,0 +1,105 @@
+################################################################################
+# L ATELIER ANIMATION INC.
+#
+# [2012] - [2020] L ATELIER ANIMATION INC. All Rights Reserved.
+#
+# NOTICE: All information contained herein is, and remains
+#         the property of L Atelier Animation Inc. and its suppliers,
+#         if any.  The intellectual and technical concepts contained
+#         herein are proprietary to L Atelier Animation Inc. and its
+#         suppliers and may be covered by Canadian, U.S. and/or
+#         Foreign Patents, patents in process, and are protected
+#         by trade secret or copyright law. Dissemination of this
+#         information or reproduction of this material is strictly
+#         forbidden unless prior written permission is obtained from
+#         L ATELIER ANIMATION INC.
+#
+################################################################################
+'''Module indexing nodes instancing inventory primitives.
+
+Usage:
+    index   = DLInstanceIndex( ddGuerillaApi.DDInventory.get() )
+    parents = index.findParents( 'Props|Tree' )
+
+@package dlGuerillaTools.instanceIndex
+@author  Esteban Ortega <esteban.ortega@latelieranimation.com>
+'''
+
+import collections
+
+import ddConstants.guerilla
+import ddGuerillaApi
+
+import dlGuerillaTools.sceneGraphIndex
+
+__all__ = ( 'DLInstanceIndex' , )
+
+class DLInstanceIndex( object ):
+    '''Reverse index from inventory primitives to the nodes instancing
+    them, built once from a single traversal of the inventory. Primitives
+    are found by path in a DLSceneGraphIndex, so queries cost the number
+    of results, not the inventory size.
+    '''
+
+    ## Name of the primitive plug instances are connected to.
+    # type: str
+    DL_INSTANCES_PLUG = 'Instances'
+
+    def __init__( self        ,
+                  inInventory ):
+        '''Initialize class and index instancing nodes of all primitives.
+
+        @param(ddGuerillaApi.DDInventory) inInventory:
+        Inventory of the scene.
+
+        @return(None):
+        No return value.
+        '''
+
+        ## Index of primitives by full name.
+        # type: dlGuerillaTools.sceneGraphIndex.DLSceneGraphIndex
+        self.primitives = dlGuerillaTools.sceneGraphIndex.DLSceneGraphIndex(
+            inInventory.findAll(
+                inNodeTypeStr = ddConstants.guerilla.nodeType.DD_PRIMITIVE ) )
+
+        ## Instancing nodes by full name, by primitive full name.
+        # type: dict[str, collections.OrderedDict]
+        self.__parentsByPrimitive = {}
+
+        for primitive in self.primitives.nodes:
+
+            parents = collections.OrderedDict()
+
+            for dependency in primitive.Instances.getbackdependencies():
+                if dependency.name != self.DL_INSTANCES_PLUG:
+                    continue
+
+                parent = ddGuerillaApi.DDNode( dependency.parent )
+                parents.setdefault( parent.fullName ,
+                                    parent          )
+
+            self.__parentsByPrimitive[ primitive.fullName ] = parents
+
+        return
+
+    def findParents( self      ,
+                     inPathStr ):
+        '''Finds nodes instancing the primitives matching passed path.
+
+        @param(str) inPathStr:
+        Path of a path node, '|' separated.
+
+        @return(collections.OrderedDict):
+        Instancing nodes by full name, without duplicates, in traversal
+        order.
+        '''
+
+        parents = collections.OrderedDict()
+
+        for primitive in self.primitives.find( inPathStr ):
+            for fullName , parent in self.__parentsByPrimitive[
+                    primitive.fullName ].items():
+                parents.setdefault( fullName ,
+                                    parent   )
+
+        return parents
@@ -0,0 +1,220 @@
+################################################################################
+# L ATELIER ANIMATION INC.
+#
+# [2012] - [2020] L ATELIER ANIMATION INC. All Rights Reserved.
+#
+# NOTICE: All information contained herein is, and remains
+#         the property of L Atelier Animation Inc. and its suppliers,
+#         if any.  The intellectual and technical concepts contained
+#         herein are proprietary to L Atelier Animation Inc. and its
+#         suppliers and may be covered by Canadian, U.S. and/or
+#         Foreign Patents, patents in process, and are protected
+#         by trade secret or copyright law. Dissemination of this
+#         information or reproduction of this material is strictly
+#         forbidden unless prior written permission is obtained from
+#         L ATELIER ANIMATION INC.
+#
+################################################################################
+'''Module indexing scene graph nodes by full name components.
+
+Usage:
+    index = DLSceneGraphIndex( ddGuerillaApi.DDNode( 'Shot_010' ).findAll(
+        inNodeTypeStr = ddConstants.guerilla.nodeType.DD_SCENE_GRAPH_NODE ) )
+    nodes = index.find( 'Set|Tree' )
+
+@package dlGuerillaTools.sceneGraphIndex
+@author  Esteban Ortega <esteban.ortega@latelieranimation.com>
+'''
+
+import re
+
+__all__ = ( 'DLSceneGraphIndex' , )
+
+class DLSceneGraphIndex( object ):
+    '''Scene graph nodes, or inventory primitives, read in a single
+    traversal and indexed in two tries over their '|' separated full name
+    components.
+
+    The prefix trie goes from the first component and lists, on each
+    level, the nodes below it. The suffix trie goes from the last
+    component of every full name prefix, nodes or their parents, and
+    lists the prefixes ending there. Queries cost the length of the path
+    plus the number of results.
+    '''
+
+    ## Separator of full name components.
+    # type: str
+    DL_SEPARATOR = '|'
+
+    ## Characters making a path a pattern, not indexed.
+    # type: sre.SRE_Pattern
+    DL_PATTERN_CHARACTERS = re.compile( r'[\\*?+.\[\](){}^$]' )
+
+    def __init__( self    ,
+                  inNodes ):
+        '''Initialize class and index nodes.
+
+        @param(iterable) inNodes:
+        Nodes to index, as returned by a findAll traversal.
+
+        @return(None):
+        No return value.
+        '''
+
+        ## Indexed nodes in traversal order.
+        # type: list[ddGuerillaApi.DDNode]
+        self.nodes = list( inNodes )
+
+        ## Full name components of nodes.
+        # type: list[list[str]]
+        self.__components = [ node.fullName.split( self.DL_SEPARATOR )
+                              for node in self.nodes                   ]
+
+        ## Trie from the first component, as a tuple ( children by
+        ## component , node indices below ).
+        # type: tuple
+        self.__prefixTrie = ( {} , [] )
+
+        ## Distinct full name prefixes of nodes, as component tuples.
+        # type: list[tuple]
+        self.__prefixes = []
+
+        ## Trie from the last component, as a tuple ( children by
+        ## component , prefix indices below ).
+        # type: tuple
+        self.__suffixTrie = ( {} , [] )
+
+        prefixIndices = {}
+
+        for index , components in enumerate( self.__components ):
+            self.__insert( self.__prefixTrie ,
+                           components        ,
+                           index             )
+
+            for length in range( 1 , len( components ) + 1 ):
+                prefix = tuple( components[ :length ] )
+
+                if prefix in prefixIndices:
+                    continue
+
+                prefixIndices[ prefix ] = len( self.__prefixes )
+                self.__prefixes.append( prefix )
+
+                self.__insert( self.__suffixTrie       ,
+                               prefix[ ::-1 ]          ,
+                               prefixIndices[ prefix ] )
+
+        return
+
+    @staticmethod
+    def __insert( inTrie       ,
+                  inComponents ,
+                  inIndexInt   ):
+        '''Inserts a node index in a trie, listing it on every level.
+
+        @param(tuple) inTrie:
+        Trie root.
+
+        @param(list) inComponents:
+        Components of the node, in trie order.
+
+        @param(int) inIndexInt:
+        Index of the node.
+
+        @return(None):
+        No return value.
+        '''
+
+        level = inTrie
+
+        for component in inComponents:
+            level = level[ 0 ].setdefault( component ,
+                                           ( {} , [] ) )
+            level[ 1 ].append( inIndexInt )
+
+        return
+
+    @staticmethod
+    def __lookup( inTrie       ,
+                  inComponents ):
+        '''Gets node indices below a trie level.
+
+        @param(tuple) inTrie:
+        Trie root.
+
+        @param(list) inComponents:
+        Components of the level, in trie order.
+
+        @return(list):
+        Node indices, empty if there is no such level.
+        '''
+
+        level = inTrie
+
+        for component in inComponents:
+            level = level[ 0 ].get( component )
+
+            if level is None:
+                return []
+
+        return level[ 1 ]
+
+    def find( self      ,
+              inPathStr ):
+        '''Finds nodes whose full name contains passed path as whole
+        components, the matched nodes and every node below them. Paths
+        with pattern characters are matched as regular expressions.
+
+        @param(str) inPathStr:
+        Path of a path node, '|' separated.
+
+        @return(list):
+        List of ddGuerillaApi.DDNode, in traversal order.
+        '''
+
+        if self.DL_PATTERN_CHARACTERS.search( inPathStr ):
+            pattern = re.compile( inPathStr.replace( self.DL_SEPARATOR ,
+                                                     r'\|'             ) )
+
+            return [ node for node in self.nodes
+                     if pattern.search( node.fullName ) ]
+
+        indices = set()
+
+        # Full names ending with the path, then every node below them.
+        for prefix in self.findSuffix( inPathStr ):
+            indices.update( self.__lookup( self.__prefixTrie ,
+                                           prefix            ) )
+
+        return [ self.nodes[ index ] for index in sorted( indices ) ]
+
+    def findPrefix( self      ,
+                    inPathStr ):
+        '''Finds indices of nodes whose full name starts with passed path.
+
+        @param(str) inPathStr:
+        Full name prefix, '|' separated.
+
+        @return(list):
+        Indices in nodes.
+        '''
+
+        return self.__lookup( self.__prefixTrie                    ,
+                              inPathStr.split( self.DL_SEPARATOR ) )
+
+    def findSuffix( self      ,
+                    inPathStr ):
+        '''Finds full names of nodes or of their parents ending with passed
+        path.
+
+        @param(str) inPathStr:
+        Full name suffix, '|' separated.
+
+        @return(list):
+        List of full names as component tuples.
+        '''
+
+        indices = self.__lookup( self.__suffixTrie                            ,
+                                 inPathStr.split( self.DL_SEPARATOR )[ ::-1 ] )
+
+        return [ self.__prefixes[ index ] for index in indices ]
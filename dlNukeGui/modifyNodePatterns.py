@@ -21,9 +21,12 @@
 @author Esteban Ortega <esteban.ortega@laterlieranimation.com>
 '''
 
+import time
+
 import nuke
 
 import ddGui
+import ddLogger
 
 import dlNukeApi
 
@@ -31,8 +34,17 @@ __all_ = ( 'DLModifyNodePatterns' , )
 
 class DLModifyNodePatterns( ddGui.QtWidgets.QDialog ):
     '''Dialog to select how DeepOpenEXRId's  knob patterns will be processed.
+
+    Nodes are processed in chunks scheduled on the Qt event loop, so the
+    dialog stays responsive, shows progress and can be cancelled between
+    two nodes.
     '''
 
+    ## Maximum duration of a chunk in seconds, before giving back control
+    ## to the event loop.
+    # type: float
+    DL_CHUNK_DURATION = 0.05
+
     def __init__( self       ,
                   *inArgs    ,
                   **inKWArgs ):
@@ -46,6 +58,18 @@ class DLModifyNodePatterns( ddGui.QtWidgets.QDialog ):
         # type: []
         self.__nodes = []
 
+        ## Index of the next node to process.
+        # type: int
+        self.__nodeIndex = 0
+
+        ## Id of the checked pattern while processing.
+        # type: int
+        self.__patternId = None
+
+        ## Time processing started.
+        # type: float
+        self.__startTime = None
+
         super( DLModifyNodePatterns , self ).__init__( *inArgs    ,
                                                        **inKWArgs )
 
@@ -54,7 +78,7 @@ class DLModifyNodePatterns( ddGui.QtWidgets.QDialog ):
         mainLayout = ddGui.QtWidgets.QVBoxLayout()
         self.setLayout( mainLayout )
         self.setFixedSize( 250 ,
-                           120 )
+                           170 )
 
         ########################################################################
         # Create Check boxes.
@@ -85,19 +109,120 @@ class DLModifyNodePatterns( ddGui.QtWidgets.QDialog ):
 
         mainLayout.addLayout( checkBoxesLayout )
 
+        ########################################################################
+        # Create Progress
+        ########################################################################
+        self.progressQProgressBar = ddGui.QtWidgets.QProgressBar()
+        self.progressQLabel       = ddGui.QtWidgets.QLabel()
+
+        mainLayout.addWidget( self.progressQProgressBar )
+        mainLayout.addWidget( self.progressQLabel )
+
         ########################################################################
         # Create Button layout
         ########################################################################
-        buttonBox = ddGui.QtWidgets.QDialogButtonBox(
+        self.buttonBox = ddGui.QtWidgets.QDialogButtonBox(
             ddGui.QtWidgets.QDialogButtonBox.Ok     |
             ddGui.QtWidgets.QDialogButtonBox.Cancel )
-        mainLayout.addWidget( buttonBox )
+        mainLayout.addWidget( self.buttonBox )
+
+        ########################################################################
+        # Create Timer
+        ########################################################################
+        self.__chunkQTimer = ddGui.QtCore.QTimer( self )
+        self.__chunkQTimer.setInterval( 0 )
 
         ########################################################################
         # Connect signals
         ########################################################################
-        buttonBox.accepted.connect( self.onAccept )
-        buttonBox.rejected.connect( self.close )
+        self.buttonBox.accepted.connect( self.onAccept )
+        self.buttonBox.rejected.connect( self.onReject )
+        self.__chunkQTimer.timeout.connect( self.__processChunk )
+
+        return
+
+    def __cancel( self ):
+        '''Stops processing if running. Nodes already processed are kept.
+
+        @return(None):
+        No return value.
+        '''
+
+        if not self.__chunkQTimer.isActive():
+            return
+
+        self.__chunkQTimer.stop()
+
+        ddLogger.DD_NUKE.info(
+            'Patterns modification cancelled after {} / {} nodes'.format(
+                self.__nodeIndex                                        ,
+                len( self.__nodes )                                     ) )
+
+        return
+
+    def __processChunk( self ):
+        '''Processes nodes until chunk duration is reached, then updates
+        progress. Each node is fully processed, so stopping between two
+        chunks leaves every node consistent.
+
+        @return(None):
+        No return value.
+        '''
+
+        chunkStartTime = time.time()
+
+        while ( self.__nodeIndex < len( self.__nodes ) and
+                time.time() - chunkStartTime < self.DL_CHUNK_DURATION ):
+
+            node = self.__nodes[ self.__nodeIndex ]
+            self.__nodeIndex += 1
+
+            try:
+                dlDeepNode = dlNukeApi.DLDeepOpenExrId( node )
+
+                if self.__patternId == 1:
+                    dlDeepNode.setPatternToTagsOnly()
+
+                elif self.__patternId == 2:
+                    dlDeepNode.setPatternToNoShapeName()
+
+                elif self.__patternId == 3:
+                    dlDeepNode.setPatternToObjectName()
+
+            except ValueError as error:
+                # Node deleted while processing.
+                ddLogger.DD_NUKE.warning( 'Skipping node: {}'.format( error ) )
+
+        count   = len( self.__nodes )
+        elapsed = time.time() - self.__startTime
+        eta     = elapsed / self.__nodeIndex * ( count - self.__nodeIndex )
+
+        self.progressQProgressBar.setValue( self.__nodeIndex )
+        self.progressQLabel.setText( '{} / {} nodes, {:.0f}s left'.format(
+            self.__nodeIndex                                            ,
+            count                                                       ,
+            eta                                                         ) )
+
+        if self.__nodeIndex >= count:
+            self.__chunkQTimer.stop()
+            self.close()
+
+        return
+
+    def closeEvent( self     ,
+                    inQEvent ):
+        '''Cancel processing on close.
+
+        @param (ddGui.QtGui.QCloseEvent) inQEvent:
+        QCloseEvent.
+
+        @return (None):
+        No return value.
+        '''
+
+        self.__cancel()
+
+        super( DLModifyNodePatterns , self ).closeEvent( inQEvent )
 
         return
 
@@ -108,20 +233,38 @@ class DLModifyNodePatterns( ddGui.QtWidgets.QDialog ):
         No return value.
         '''
 
-        id = self.checkBoxGrp.checkedId()
+        if not self.__nodes:
+            self.close()
+
+            return
+
+        self.__patternId = self.checkBoxGrp.checkedId()
+        self.__nodeIndex = 0
+        self.__startTime = time.time()
 
-        for node in self.__nodes:
-            dlDeepNode = dlNukeApi.DLDeepOpenExrId( node )
+        for button in self.checkBoxGrp.buttons():
+            button.setEnabled( False )
 
-            if id == 1:
-                dlDeepNode.setPatternToTagsOnly()
+        self.buttonBox.button(
+            ddGui.QtWidgets.QDialogButtonBox.Ok ).setEnabled( False )
+
+        self.progressQProgressBar.setRange( 0                   ,
+                                            len( self.__nodes ) )
+        self.progressQProgressBar.setValue( 0 )
+
+        self.__chunkQTimer.start()
+
+        return
 
-            elif id == 2:
-                dlDeepNode.setPatternToNoShapeName()
+    def onReject( self ):
+        '''Execute when cancel button is clicked, stops processing if
+        running and closes the dialog.
 
-            elif id == 3:
-                dlDeepNode.setPatternToObjectName()
+        @return(None):
+        No return value.
+        '''
 
+        self.__cancel()
         self.close()
 
         return
@@ -137,9 +280,27 @@ class DLModifyNodePatterns( ddGui.QtWidgets.QDialog ):
         No return value.
         '''
 
+        # Shown again while applying, keep the running nodes and state.
+        if self.__chunkQTimer.isActive():
+            super( DLModifyNodePatterns , self ).showEvent( inQEvent )
+
+            return
+
         self.__nodes = [ node for node in nuke.selectedNodes() if
                          node.Class() == 'DeepOpenEXRId'        ]
 
+        self.progressQProgressBar.setRange( 0                   ,
+                                            len( self.__nodes ) )
+        self.progressQProgressBar.setValue( 0 )
+        self.progressQLabel.setText( '{} nodes selected'.format(
+            len( self.__nodes )                                 ) )
+
+        for button in self.checkBoxGrp.buttons():
+            button.setEnabled( True )
+
+        self.buttonBox.button(
+            ddGui.QtWidgets.QDialogButtonBox.Ok ).setEnabled( True )
+
         super( DLModifyNodePatterns , self ).showEvent( inQEvent )
 
         return
@@ -22,9 +22,12 @@ nuke gizmo nodes between Compositing and DI.
 @author Esteban Ortega <esteban.ortega@laterlieranimation.com>
 '''
 
-import ddNukeApi
-
 import ddGui
+import ddLogger
+
+import dlNukePipe.knobBatch
+import dlNukePipe.nodeRegistry
+import dlNukePipe.switchDiMode
 
 __all__ = ( )
 
@@ -36,8 +39,7 @@ class DLSwitchDiModeDialog( ddGui.QtWidgets.QDialog ):
     ## Stores modes for gizmo node
     # type: []
 
-    _DL_MODES = ( 'Compositing' ,
-                  'DI'          )
+    _DL_MODES = dlNukePipe.switchDiMode.DLSwitchDiMode.DL_MODES
 
     def __init__( self       ,
                   *inArgs    ,
@@ -88,12 +90,23 @@ class DLSwitchDiModeDialog( ddGui.QtWidgets.QDialog ):
         '''
 
         diMode           = self.diModeQComboBox.currentIndex()
-        classTargetNodes = [ 'tbvDiOutput' ,
-                             'tbvDiCreate' ]
+        classTargetNodes = dlNukePipe.switchDiMode.DLSwitchDiMode.DL_CLASS_NAMES
+
+        registry = dlNukePipe.nodeRegistry.DLNodeRegistry.getInstance()
+        batch    = dlNukePipe.knobBatch.DLKnobBatch()
+
+        for node in registry.getNodes( *classTargetNodes ):
+            batch.add( node                                                ,
+                       dlNukePipe.switchDiMode.DLSwitchDiMode.DL_KNOB_MODE ,
+                       diMode                                              )
+
+        changed , skipped = batch.apply( 'Switch DiMode' )
 
-        for node in ddNukeApi.DDRoot().findAll():
-            if node.Class() in classTargetNodes:
-                node.knob( 'mode' ).setValue( diMode )
+        ddLogger.DD_NUKE.info(
+            'Switched {} nodes to {}, {} already were'.format(
+                changed                                      ,
+                self._DL_MODES[ diMode ]                     ,
+                skipped                                      ) )
 
         self.close()
 
@@ -21,9 +21,11 @@
 @author Esteban Ortega <esteban.ortega@laterlieranimation.com>
 '''
 
+import ddLogger
 import ddQt
 
-import ddNukeApi
+import dlNukePipe.knobBatch
+import dlNukePipe.nodeRegistry
 
 __all__ = ( 'DLSwitchUnpremultMask' , )
 
@@ -116,8 +118,6 @@ class DLSwitchUnpremultMask( ddQt.QtWidgets.QDialog ):
         No return value.
         '''
 
-        root = ddNukeApi.DDRoot()
-
         nodesClassToSwitch = []
 
         for index in xrange( self.__checkBoxLayout.count() ):
@@ -134,12 +134,23 @@ class DLSwitchUnpremultMask( ddQt.QtWidgets.QDialog ):
 
             return
 
-        for node in root.findAll(
-            ddNukeApi.filters.DDClassType( nodesClassToSwitch ) ):
+        registry = dlNukePipe.nodeRegistry.DLNodeRegistry.getInstance()
+        batch    = dlNukePipe.knobBatch.DLKnobBatch()
+
+        for node in registry.getNodes( *nodesClassToSwitch ):
 
             if node.input( 1 ) is not None:
 
-                node.knob( 'unPremult' ).setValue( True )
+                batch.add( node        ,
+                           'unPremult' ,
+                           True        )
+
+        changed , skipped = batch.apply( 'Switch Unpremult Mask' )
+
+        ddLogger.DD_NUKE.info(
+            'Switched unpremult mask on {} nodes, {} already were'.format(
+                changed                                                  ,
+                skipped                                                  ) )
 
         self.close()
 
@@ -0,0 +1,535 @@
+################################################################################
+# L ATELIER ANIMATION INC.
+#
+# [2012] - [2020] L ATELIER ANIMATION INC. All Rights Reserved.
+#
+# NOTICE: All information contained herein is, and remains
+#         the property of L Atelier Animation Inc. and its suppliers,
+#         if any.  The intellectual and technical concepts contained
+#         herein are proprietary to L Atelier Animation Inc. and its
+#         suppliers and may be covered by Canadian, U.S. and/or
+#         Foreign Patents, patents in process, and are protected
+#         by trade secret or copyright law. Dissemination of this
+#         information or reproduction of this material is strictly
+#         forbidden unless prior written permission is obtained from
+#         L ATELIER ANIMATION INC.
+#
+################################################################################
+'''Headless batch generation of lightKey references and last shot renders
+contact sheets for a project or a list of sequences.
+
+Must be run with Nuke in terminal mode:
+    nuke -t batchContactSheets.py --project <shortName> --output <dir>
+    nuke -t batchContactSheets.py --sequences <name> <name> --output <dir>
+
+Shot renders use the main nomenclature of the current context unless
+--nomenclature <id> is passed.
+
+@package dlNukePipe.batchContactSheets
+@author  Esteban Ortega <esteban.ortega@latelieranimation.com>
+'''
+
+import argparse
+import hashlib
+import multiprocessing
+import multiprocessing.pool
+import os
+import subprocess
+import sys
+import tempfile
+
+import nuke
+
+import ddLogger
+import ddPipeApi
+
+import dlNukePipe.lightKeyReferences
+
+try:
+    import simplejson as json
+except ImportError:
+    import json
+
+__all__ = ( 'DLBatchContactSheets' , )
+
+class DLBatchContactSheets( object ):
+    '''Renders lightKey references and last shot renders contact sheets for
+    several sequences, each one in its own Nuke worker process. Sequences
+    whose published inputs did not change since last run are skipped.
+    '''
+
+    ## File type of rendered contact sheets.
+    # type: str
+    DL_FILE_TYPE = 'jpg'
+
+    ## Frame rendered for contact sheets, Reads use nearest frame on error.
+    # type: int
+    DL_FRAME = 1
+
+    def __init__( self                       ,
+                  inOutputDirStr             ,
+                  inProcessCountInt   = None ,
+                  inNukeExecutableStr = None ,
+                  inMainNomenclature  = None ):
+        '''Initialize class.
+
+        @param(str) inOutputDirStr:
+        Directory where contact sheets and their state files are written.
+
+        @param(int) inProcessCountInt:
+        Amount of parallel worker processes, cpu count if None.
+
+        @param(str) inNukeExecutableStr:
+        Nuke executable used by workers, current one if None.
+
+        @param(ddPipeApi.DDNomenclature) inMainNomenclature:
+        Main nomenclature of shot renders, current context one if None.
+
+        @return(None):
+        No return value.
+        '''
+
+        if inMainNomenclature is None:
+            inMainNomenclature = ddPipeApi.getCurrentContext().mainNomenclature
+
+        ## Directory where contact sheets are written.
+        # type: str
+        self.outputDir = inOutputDirStr
+
+        ## Amount of parallel worker processes.
+        # type: int
+        self.processCount = inProcessCountInt or multiprocessing.cpu_count()
+
+        ## Nuke executable used by workers.
+        # type: str
+        self.nukeExecutable = inNukeExecutableStr or nuke.EXE_PATH
+
+        ## Main nomenclature of shot renders.
+        # type: ddPipeApi.DDNomenclature
+        self.mainNomenclature = inMainNomenclature
+
+        return
+
+    def __getStatePath( self       ,
+                        inSequence ):
+        '''Gets the path of the state file of passed sequence.
+
+        @param(ddPipeApi.DDSequence) inSequence:
+        Sequence to get the state file for.
+
+        @return(str):
+        Path of the json state file.
+        '''
+
+        return os.path.join( self.outputDir                        ,
+                             '{}.json'.format( inSequence.name ) )
+
+    def __runWorker( self    ,
+                     inEntry ):
+        '''Renders contact sheets of a sequence in a Nuke worker process,
+        from the published files the signature was computed from, passed in
+        a JSON inputs file.
+
+        @param(tuple) inEntry:
+        Tuple ( ddPipeApi.DDSequence , signature , output paths ,
+        ( references , renders ) ).
+
+        @return(int):
+        Worker process return code.
+        '''
+
+        sequence , _ , _ , publishedFiles = inEntry
+
+        tool       = dlNukePipe.lightKeyReferences.DLLightKeyReferencesRenders
+        scriptPath = os.path.splitext( os.path.abspath( __file__ ) )[ 0 ] + '.py'
+
+        publishedReferences , publishedRenders = publishedFiles
+
+        inputs = { 'references'     : [ publishedFile.id
+                                        for publishedFile in publishedReferences ] ,
+                   'renders'        : [ publishedFile.id
+                                        for publishedFile in publishedRenders    ] ,
+                   'referencePath'  : self.getOutputPath( sequence            ,
+                                                          tool.DL_REFERENCE   ) ,
+                   'shotRenderPath' : self.getOutputPath( sequence            ,
+                                                          tool.DL_SHOT_RENDER ) }
+
+        fileDescriptor , inputsPath = tempfile.mkstemp( suffix = '.json' )
+
+        try:
+            with os.fdopen( fileDescriptor , 'w' ) as inputsFile:
+                json.dump( inputs     ,
+                           inputsFile )
+
+            return subprocess.call( [ self.nukeExecutable ,
+                                      '-t'                ,
+                                      scriptPath          ,
+                                      '--worker'          ,
+                                      inputsPath          ] )
+
+        finally:
+            os.remove( inputsPath )
+
+    @staticmethod
+    def getPublishedFiles( inSequence                ,
+                           inMainNomenclature = None ):
+        '''Gets lightKey references and last shot renders of passed sequence.
+
+        @param(ddPipeApi.DDSequence) inSequence:
+        Sequence to query.
+
+        @param(ddPipeApi.DDNomenclature) inMainNomenclature:
+        Main nomenclature of shot renders, current context one if None.
+
+        @return(tuple):
+        Tuple of lists of ddPipeApi.DDPublishedFile ( references , renders ).
+        '''
+
+        tool = dlNukePipe.lightKeyReferences.DLLightKeyReferencesRenders
+
+        publishedReferences = tool.getPublishedReferences( inSequence )
+        publishedRenders    = tool.getLastPublishedRenders( inSequence.shots   ,
+                                                            inMainNomenclature )
+
+        return publishedReferences or [] , publishedRenders or []
+
+    @staticmethod
+    def getSignature( inPublishedFiles ):
+        '''Gets a signature of the published inputs of a sequence.
+
+        @param(tuple) inPublishedFiles:
+        Tuple of lists of ddPipeApi.DDPublishedFile ( references , renders ).
+
+        @return(str):
+        Hexadecimal digest of published file ids and versions.
+        '''
+
+        digest = hashlib.sha1()
+
+        for publishedFiles in inPublishedFiles:
+            for publishedFile in publishedFiles:
+                digest.update( '{}:{};'.format( publishedFile.id            ,
+                                                publishedFile.versionNumber ).encode() )
+            digest.update( b'|' )
+
+        return digest.hexdigest()
+
+    def getOutputPath( self       ,
+                       inSequence ,
+                       inLabelStr ):
+        '''Gets the path of a contact sheet image of passed sequence.
+
+        @param(ddPipeApi.DDSequence) inSequence:
+        Sequence of the contact sheet.
+
+        @param(str) inLabelStr:
+        Label of the contact sheet, reference or shotRender.
+
+        @return(str):
+        Path of the contact sheet image.
+        '''
+
+        return os.path.join( self.outputDir                            ,
+                             '{}_{}.{}'.format( inSequence.name        ,
+                                                inLabelStr             ,
+                                                self.DL_FILE_TYPE      ) )
+
+    @staticmethod
+    def getSequences( inProjectShortNameStr = None ,
+                      inSequenceNamesList   = None ):
+        '''Gets sequences of passed project or sequences by name.
+
+        @param(str) inProjectShortNameStr:
+        Short name of the project, current project if None.
+
+        @param(list) inSequenceNamesList:
+        List of sequence names, all project sequences if None.
+
+        @return(list):
+        List of ddPipeApi.DDSequence.
+        '''
+
+        if inProjectShortNameStr is None:
+            project = ddPipeApi.getCurrentProject()
+
+        else:
+            project = ddPipeApi.DDProject.getFirst(
+                inFilters = [ ddPipeApi.DDProject.shortName ==
+                              inProjectShortNameStr            ] )
+
+        filters = [ ddPipeApi.DDSequence.project == project ]
+
+        if inSequenceNamesList:
+            filters.append( ddPipeApi.DDSequence.name.in_( inSequenceNamesList ) )
+
+        return ddPipeApi.DDSequence.getAll( inFilters = filters )
+
+    def getOutputPaths( self             ,
+                        inSequence       ,
+                        inPublishedFiles ):
+        '''Gets the paths of the contact sheet images rendered for passed
+        sequence, a contact sheet is only rendered if it has inputs.
+
+        @param(ddPipeApi.DDSequence) inSequence:
+        Sequence of the contact sheets.
+
+        @param(tuple) inPublishedFiles:
+        Tuple of lists of ddPipeApi.DDPublishedFile ( references , renders ).
+
+        @return(list):
+        List of contact sheet image paths.
+        '''
+
+        tool = dlNukePipe.lightKeyReferences.DLLightKeyReferencesRenders
+
+        return [ self.getOutputPath( inSequence ,
+                                     label      )
+                 for publishedFiles , label in zip( inPublishedFiles    ,
+                                                    ( tool.DL_REFERENCE   ,
+                                                      tool.DL_SHOT_RENDER ) )
+                 if publishedFiles                                          ]
+
+    def isUpToDate( self          ,
+                    inSequence    ,
+                    inSignature   ,
+                    inOutputPaths ):
+        '''Checks if contact sheets of passed sequence were rendered from
+        the same published inputs and their images still exist.
+
+        @param(ddPipeApi.DDSequence) inSequence:
+        Sequence to check.
+
+        @param(str) inSignature:
+        Current signature of the sequence inputs.
+
+        @param(list) inOutputPaths:
+        Paths of the contact sheet images of the sequence.
+
+        @return(bool):
+        True if contact sheets are up to date, False otherwise.
+        '''
+
+        if not all( os.path.isfile( path ) for path in inOutputPaths ):
+            return False
+
+        try:
+            with open( self.__getStatePath( inSequence ) ) as stateFile:
+                state = json.load( stateFile )
+
+        except ( IOError , ValueError ):
+            return False
+
+        return state.get( 'signature' ) == inSignature
+
+    def run( self        ,
+             inSequences ):
+        '''Renders contact sheets of passed sequences in parallel worker
+        processes, skipping sequences whose inputs did not change.
+
+        @param(list) inSequences:
+        List of ddPipeApi.DDSequence.
+
+        @return(dict):
+        Dict { sequence name : status } where status is 'skipped',
+        'empty' if the sequence has nothing published, 'rendered' or
+        'failed'.
+        '''
+
+        if not os.path.isdir( self.outputDir ):
+            os.makedirs( self.outputDir )
+
+        report   = {}
+        toRender = []
+
+        for sequence in inSequences:
+
+            publishedFiles = self.getPublishedFiles( sequence              ,
+                                                     self.mainNomenclature )
+
+            if not any( publishedFiles ):
+
+                report[ sequence.name ] = 'empty'
+
+                continue
+
+            signature   = self.getSignature( publishedFiles )
+            outputPaths = self.getOutputPaths( sequence       ,
+                                               publishedFiles )
+
+            if self.isUpToDate( sequence    ,
+                                signature   ,
+                                outputPaths ):
+
+                report[ sequence.name ] = 'skipped'
+
+                continue
+
+            toRender.append( ( sequence       ,
+                               signature      ,
+                               outputPaths    ,
+                               publishedFiles ) )
+
+        pool = multiprocessing.pool.ThreadPool( self.processCount )
+
+        try:
+            returnCodes = pool.map( self.__runWorker ,
+                                    toRender         )
+
+        finally:
+            pool.close()
+            pool.join()
+
+        for ( sequence , signature , outputPaths , _ ) , returnCode in zip(
+                toRender                                                   ,
+                returnCodes                                                ):
+
+            missingPaths = [ path for path in outputPaths
+                             if not os.path.isfile( path ) ]
+
+            if not returnCode and missingPaths:
+                ddLogger.DD_NUKE.warning(
+                    'Contact sheets of {} are missing: {}'.format(
+                        sequence.name                           ,
+                        ', '.join( missingPaths )               ) )
+
+            if returnCode or missingPaths:
+
+                report[ sequence.name ] = 'failed'
+
+                ddLogger.DD_NUKE.warning(
+                    'Contact sheets of {} failed with code {}'.format(
+                        sequence.name                                ,
+                        returnCode                                   ) )
+
+                continue
+
+            with open( self.__getStatePath( sequence ) , 'w' ) as stateFile:
+                json.dump( { 'signature' : signature } ,
+                           stateFile                   )
+
+            report[ sequence.name ] = 'rendered'
+
+        return report
+
+    @classmethod
+    def renderSequence( cls             ,
+                        inInputsPathStr ):
+        '''Worker side: builds both contact sheets of a sequence in the
+        current Nuke script and renders them to images. The tracker is not
+        queried again, contact sheets are built from exactly the published
+        files the batch signature was computed from.
+
+        @param(str) inInputsPathStr:
+        Path of the JSON inputs file, with keys references and renders,
+        lists of published file ids, referencePath and shotRenderPath,
+        paths of the contact sheet images.
+
+        @return(None):
+        No return value.
+        '''
+
+        with open( inInputsPathStr ) as inputsFile:
+            inputs = json.load( inputsFile )
+
+        publishedReferences = [ ddPipeApi.DDPublishedFile( publishedFileId )
+                                for publishedFileId in inputs[ 'references' ] ]
+        publishedRenders    = [ ddPipeApi.DDPublishedFile( publishedFileId )
+                                for publishedFileId in inputs[ 'renders' ]    ]
+
+        tool = dlNukePipe.lightKeyReferences.DLLightKeyReferencesRenders()
+
+        # Proxies are local to artists workstations.
+        tool.DL_USE_PROXY_CACHE = False
+
+        for publishedFiles , referenceBool , outputPath in (
+                ( publishedReferences , True  , inputs[ 'referencePath' ]  ) ,
+                ( publishedRenders    , False , inputs[ 'shotRenderPath' ] ) ):
+
+            if not publishedFiles:
+                continue
+
+            readNodes = tool.createReadNodes( publishedFiles                  ,
+                                              inReferenceBool = referenceBool )
+
+            contactSheetNode = tool.createContactSheet(
+                readNodes                                 ,
+                inReferenceBool = referenceBool           )
+
+            writeNode = nuke.nodes.Write( file      = outputPath       ,
+                                          file_type = cls.DL_FILE_TYPE )
+            writeNode.setInput( 0                ,
+                                contactSheetNode )
+
+            nuke.execute( writeNode     ,
+                          cls.DL_FRAME  ,
+                          cls.DL_FRAME  )
+
+        return
+
+
+def main( inArgs = None ):
+    '''Command line entry point.
+
+    @param(list) inArgs:
+    List of command line arguments, sys.argv if None.
+
+    @return(int):
+    Exit code.
+    '''
+
+    parser = argparse.ArgumentParser(
+        description = 'Render lightKey contact sheets of sequences.' )
+
+    parser.add_argument( '--worker'                  ,
+                         metavar = 'INPUTS_PATH'     ,
+                         help    = argparse.SUPPRESS )
+    parser.add_argument( '--project'                                      ,
+                         help = 'Project short name, current if not set.' )
+    parser.add_argument( '--sequences'                              ,
+                         nargs = '+'                                ,
+                         help  = 'Sequence names, all if not set.'  )
+    parser.add_argument( '--output'                                     ,
+                         help = 'Directory of rendered contact sheets.' )
+    parser.add_argument( '--processes'                                  ,
+                         type = int                                     ,
+                         help = 'Amount of parallel worker processes.'  )
+    parser.add_argument( '--nomenclature'                                    ,
+                         type = int                                          ,
+                         help = 'Main nomenclature id of shot renders, '
+                                'current context one if not set.'            )
+
+    args = parser.parse_args( inArgs )
+
+    if args.worker:
+        DLBatchContactSheets.renderSequence( args.worker )
+
+        return 0
+
+    if not args.output:
+        parser.error( '--output is required' )
+
+    sequences = DLBatchContactSheets.getSequences( args.project   ,
+                                                   args.sequences )
+
+    mainNom = None
+
+    if args.nomenclature is not None:
+        mainNom = ddPipeApi.DDNomenclature( args.nomenclature )
+
+    batch  = DLBatchContactSheets( args.output                  ,
+                                   args.processes               ,
+                                   inMainNomenclature = mainNom )
+    report = batch.run( sequences )
+
+    for sequenceName , status in sorted( report.items() ):
+        ddLogger.DD_NUKE.info( '{}: {}'.format( sequenceName ,
+                                                status       ) )
+
+    if 'failed' in report.values():
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit( main() )
@@ -0,0 +1,299 @@
+################################################################################
+# L ATELIER ANIMATION INC.
+#
+# [2012] - [2020] L ATELIER ANIMATION INC. All Rights Reserved.
+#
+# NOTICE: All information contained herein is, and remains
+#         the property of L Atelier Animation Inc. and its suppliers,
+#         if any.  The intellectual and technical concepts contained
+#         herein are proprietary to L Atelier Animation Inc. and its
+#         suppliers and may be covered by Canadian, U.S. and/or
+#         Foreign Patents, patents in process, and are protected
+#         by trade secret or copyright law. Dissemination of this
+#         information or reproduction of this material is strictly
+#         forbidden unless prior written permission is obtained from
+#         L ATELIER ANIMATION INC.
+#
+################################################################################
+'''Layout math for contact sheets, independent of Nuke.
+
+@package dlNukePipe.contactSheetLayout
+@author  Esteban Ortega <esteban.ortega@latelieranimation.com>
+'''
+
+import math
+
+__all__ = ( 'DLContactSheetLayout' , )
+
+class DLContactSheetLayout( object ):
+    '''Computes columns, rows and tile size of a contact sheet from the
+    amount of images and their aspect ratio, keeping the whole sheet under
+    a pixel budget so memory per viewer frame stays bounded.
+    '''
+
+    ## Gap in pixels between tiles.
+    # type: int
+    DL_GAP = 0
+
+    ## Maximum amount of pixels of the whole contact sheet.
+    # type: int
+    DL_MAX_PIXELS = 4096 * 2304
+
+    ## Maximum width of a tile in pixels.
+    # type: int
+    DL_MAX_TILE_WIDTH = 1024
+
+    ## Aspect ratio the whole contact sheet tends to, a viewer aspect ratio.
+    # type: float
+    DL_SHEET_ASPECT_RATIO = 16.0 / 9.0
+
+    def __init__( self                           ,
+                  inCountInt                     ,
+                  inAspectRatioFloat             ,
+                  inMaxPixelsInt          = None ,
+                  inMaxTileWidthInt       = None ,
+                  inSheetAspectRatioFloat = None ,
+                  inGapInt                = None ):
+        '''Initialize class and compute the layout.
+
+        @param(int) inCountInt:
+        Amount of images in the contact sheet.
+
+        @param(float) inAspectRatioFloat:
+        Width / height aspect ratio of the images.
+
+        @param(int) inMaxPixelsInt:
+        Pixel budget of the whole contact sheet, DL_MAX_PIXELS if None.
+
+        @param(int) inMaxTileWidthInt:
+        Maximum width of a tile, DL_MAX_TILE_WIDTH if None.
+
+        @param(float) inSheetAspectRatioFloat:
+        Aspect ratio the contact sheet tends to, DL_SHEET_ASPECT_RATIO if None.
+
+        @param(int) inGapInt:
+        Gap in pixels between tiles, DL_GAP if None.
+
+        @return(None):
+        No return value.
+        '''
+
+        if inCountInt < 1:
+            raise ValueError( 'Contact sheet needs at least one image, '
+                              'got {}'.format( inCountInt )            )
+
+        if inAspectRatioFloat <= 0:
+            raise ValueError( 'Invalid aspect ratio {}'.format(
+                inAspectRatioFloat                             ) )
+
+        maxPixels        = inMaxPixelsInt or self.DL_MAX_PIXELS
+        maxTileWidth     = inMaxTileWidthInt or self.DL_MAX_TILE_WIDTH
+        sheetAspectRatio = inSheetAspectRatioFloat or self.DL_SHEET_ASPECT_RATIO
+        gap              = self.DL_GAP if inGapInt is None else inGapInt
+
+        if gap < 0:
+            raise ValueError( 'Invalid gap {}'.format( gap ) )
+
+        ## Gap in pixels between tiles.
+        # type: int
+        self.gap = gap
+
+        ## Amount of images.
+        # type: int
+        self.count = inCountInt
+
+        ## Amount of columns.
+        # type: int
+        self.columns = self.getColumns( inCountInt         ,
+                                        inAspectRatioFloat ,
+                                        sheetAspectRatio   )
+
+        ## Amount of rows.
+        # type: int
+        self.rows = int( math.ceil( inCountInt / float( self.columns ) ) )
+
+        tileWidth = float( maxTileWidth )
+
+        if self.__getSheetPixels( tileWidth , inAspectRatioFloat ) > maxPixels:
+            # Largest tile width keeping tiles and gaps under the budget,
+            # positive root of sheet width * sheet height = maxPixels.
+            gapWidth  = ( self.columns - 1 ) * gap
+            gapHeight = ( self.rows    - 1 ) * gap
+
+            a = self.columns * self.rows / inAspectRatioFloat
+            b = self.columns * gapHeight + self.rows * gapWidth / inAspectRatioFloat
+            c = gapWidth * gapHeight - maxPixels
+
+            tileWidth = max( 0.0 , ( -b + math.sqrt( max( 0.0 , b * b - 4 * a * c ) ) ) /
+                                   ( 2 * a )                                          )
+
+        tileHeight = tileWidth / inAspectRatioFloat
+
+        ## Width of a tile in pixels.
+        # type: int
+        self.tileWidth = max( 1 , int( tileWidth ) )
+
+        ## Height of a tile in pixels.
+        # type: int
+        self.tileHeight = max( 1 , int( tileHeight ) )
+
+        ## Width of the contact sheet in pixels.
+        # type: int
+        self.width = self.columns * self.tileWidth + ( self.columns - 1 ) * gap
+
+        ## Height of the contact sheet in pixels.
+        # type: int
+        self.height = self.rows * self.tileHeight + ( self.rows - 1 ) * gap
+
+        return
+
+    def __getSheetPixels( self               ,
+                          inTileWidthFloat   ,
+                          inAspectRatioFloat ):
+        '''Gets the amount of pixels of the contact sheet for passed tile
+        width, gaps included.
+
+        @param(float) inTileWidthFloat:
+        Width of a tile.
+
+        @param(float) inAspectRatioFloat:
+        Width / height aspect ratio of the tiles.
+
+        @return(float):
+        Amount of pixels of the contact sheet.
+        '''
+
+        return ( ( self.columns * inTileWidthFloat + ( self.columns - 1 ) * self.gap ) *
+                 ( self.rows * inTileWidthFloat / inAspectRatioFloat +
+                   ( self.rows - 1 ) * self.gap                                     ) )
+
+    def __repr__( self ):
+        '''Representation of the layout.
+
+        @return(str):
+        String representing the layout.
+        '''
+
+        return ( '{}( columns = {} , rows = {} , tile = {}x{} , '
+                 'sheet = {}x{} )' ).format( type( self ).__name__ ,
+                                              self.columns          ,
+                                              self.rows             ,
+                                              self.tileWidth        ,
+                                              self.tileHeight       ,
+                                              self.width            ,
+                                              self.height           )
+
+    @classmethod
+    def fromAspectRatios( cls               ,
+                          inAspectRatioList ,
+                          **inKwargs        ):
+        '''Creates the layout of images with mixed aspect ratios, tiles
+        use the geometric mean aspect ratio so wide and tall images are
+        letterboxed evenly.
+
+        @param(list) inAspectRatioList:
+        Width / height aspect ratio of every image.
+
+        @param(dict) inKwargs:
+        Optional arguments of the constructor.
+
+        @return(DLContactSheetLayout):
+        Layout of passed images.
+        '''
+
+        if any( aspectRatio <= 0 for aspectRatio in inAspectRatioList ):
+            raise ValueError( 'Invalid aspect ratios {}'.format(
+                inAspectRatioList                               ) )
+
+        aspectRatio = 1.0
+
+        if inAspectRatioList:
+            aspectRatio = math.exp(
+                sum( math.log( ratio ) for ratio in inAspectRatioList ) /
+                len( inAspectRatioList )                                 )
+
+        return cls( len( inAspectRatioList ) ,
+                    aspectRatio              ,
+                    **inKwargs               )
+
+    def getCell( self       ,
+                 inIndexInt ):
+        '''Gets the position of the tile of passed image, images are laid
+        out row by row from the top left corner.
+
+        @param(int) inIndexInt:
+        Index of the image.
+
+        @return(tuple):
+        x and y offsets in pixels of the tile from the top left corner.
+        '''
+
+        if not 0 <= inIndexInt < self.count:
+            raise IndexError( 'Image index {} out of range'.format(
+                inIndexInt                                         ) )
+
+        row , column = divmod( inIndexInt   ,
+                               self.columns )
+
+        return ( column * ( self.tileWidth  + self.gap ) ,
+                 row    * ( self.tileHeight + self.gap ) )
+
+    def getFit( self               ,
+                inAspectRatioFloat ):
+        '''Gets the size of an image fitted in a tile, keeping its aspect
+        ratio.
+
+        @param(float) inAspectRatioFloat:
+        Width / height aspect ratio of the image.
+
+        @return(tuple):
+        Width and height in pixels of the image in the tile.
+        '''
+
+        if inAspectRatioFloat <= 0:
+            raise ValueError( 'Invalid aspect ratio {}'.format(
+                inAspectRatioFloat                             ) )
+
+        if inAspectRatioFloat >= self.tileWidth / float( self.tileHeight ):
+            return ( self.tileWidth                                                ,
+                     max( 1 , int( round( self.tileWidth / inAspectRatioFloat ) ) ) )
+
+        return ( max( 1 , int( round( self.tileHeight * inAspectRatioFloat ) ) ) ,
+                 self.tileHeight                                                )
+
+    @staticmethod
+    def getColumns( inCountInt              ,
+                    inAspectRatioFloat      ,
+                    inSheetAspectRatioFloat ):
+        '''Gets the amount of columns which makes the contact sheet aspect
+        ratio closest to the target one.
+
+        @param(int) inCountInt:
+        Amount of images in the contact sheet.
+
+        @param(float) inAspectRatioFloat:
+        Width / height aspect ratio of the images.
+
+        @param(float) inSheetAspectRatioFloat:
+        Aspect ratio the contact sheet tends to.
+
+        @return(int):
+        Amount of columns.
+        '''
+
+        bestColumns   = 1
+        bestDeviation = None
+
+        for columns in range( 1 , inCountInt + 1 ):
+
+            rows = int( math.ceil( inCountInt / float( columns ) ) )
+
+            sheetAspectRatio = columns * inAspectRatioFloat / rows
+            deviation = abs( math.log( sheetAspectRatio         /
+                                       inSheetAspectRatioFloat ) )
+
+            if bestDeviation is None or deviation < bestDeviation:
+                bestColumns   = columns
+                bestDeviation = deviation
+
+        return bestColumns
@@ -0,0 +1,129 @@
+################################################################################
+# L ATELIER ANIMATION INC.
+#
+# [2012] - [2020] L ATELIER ANIMATION INC. All Rights Reserved.
+#
+# NOTICE: All information contained herein is, and remains
+#         the property of L Atelier Animation Inc. and its suppliers,
+#         if any.  The intellectual and technical concepts contained
+#         herein are proprietary to L Atelier Animation Inc. and its
+#         suppliers and may be covered by Canadian, U.S. and/or
+#         Foreign Patents, patents in process, and are protected
+#         by trade secret or copyright law. Dissemination of this
+#         information or reproduction of this material is strictly
+#         forbidden unless prior written permission is obtained from
+#         L ATELIER ANIMATION INC.
+#
+################################################################################
+'''Cmd Module to write knob values on many nodes in a single undo.
+
+Usage:
+    batch = dlNukePipe.knobBatch.DLKnobBatch()
+    for node in nodes:
+        batch.add( node , 'mode' , 1 )
+    changed , skipped = batch.apply( 'Switch DI Mode' )
+
+@package dlNukePipe.knobBatch
+@author  Esteban Ortega <esteban.ortega@latelieranimation.com>
+'''
+
+import nuke
+
+__all__ = ( 'DLKnobBatch' , )
+
+class DLKnobBatch( object ):
+    '''Batch of knob writes applied in a single undo, skipping knobs which
+    already have the value so gizmos are not needlessly invalidated.
+    '''
+
+    def __init__( self ):
+        '''Initialize class.
+
+        @return(None):
+        No return value.
+        '''
+
+        ## Pending writes as ( node , knob name , value ).
+        # type: list[tuple]
+        self.__writes = []
+
+        return
+
+    def __len__( self ):
+
+        return len( self.__writes )
+
+    def add( self      ,
+             inNode    ,
+             inKnobStr ,
+             inValue   ):
+        '''Adds a knob write to the batch.
+
+        @param(nuke.Node) inNode:
+        Node to modify.
+
+        @param(str) inKnobStr:
+        Name of the knob.
+
+        @param(object) inValue:
+        Value to set, index for enumeration knobs.
+
+        @return(None):
+        No return value.
+        '''
+
+        self.__writes.append( ( inNode    ,
+                                inKnobStr ,
+                                inValue   ) )
+
+        return
+
+    def apply( self               ,
+               inUndoNameStr = '' ):
+        '''Applies the writes whose value differs from the current one, in
+        a single undo. The batch is emptied.
+
+        @param(str) inUndoNameStr:
+        Name of the undo.
+
+        @return(tuple):
+        Tuple ( changed nodes count , skipped nodes count ).
+        '''
+
+        # Nodes are identified by full name, unique in the script.
+        changedNodes = set()
+        skippedNodes = set()
+        writes       = []
+
+        for node , knobStr , value in self.__writes:
+
+            knob = node.knob( knobStr )
+
+            # getValue returns the index of enumeration knobs, comparable
+            # with the value to set.
+            if knob is None or knob.getValue() == value:
+                skippedNodes.add( node.fullName() )
+
+                continue
+
+            writes.append( ( knob  ,
+                             value ) )
+            changedNodes.add( node.fullName() )
+
+        self.__writes = []
+
+        # A node with at least one change is not counted as skipped.
+        skippedNodes -= changedNodes
+
+        if writes:
+            nuke.Undo.begin( inUndoNameStr )
+
+            try:
+                for knob , value in writes:
+                    knob.setValue( value )
+
+            finally:
+                nuke.Undo.end()
+
+        return ( len( changedNodes ) ,
+                 len( skippedNodes ) )
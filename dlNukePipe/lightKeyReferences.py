@@ -21,12 +21,20 @@
 @author  Esteban Ortega <esteban.ortega@latelieranimation.com>
 '''
 
+import multiprocessing.pool
+import time
+
 import nuke
 import nukescripts
 
 import ddNukeApi
+import ddPath
 import ddPipeApi
 
+import dlNukePipe.contactSheetLayout
+import dlNukePipe.proxyCache
+import dlNukePipe.queryCache
+
 __all__ = ( 'DLLightKeyReferencesRenders' , )
 
 class DLLightKeyReferencesRenders():
@@ -50,6 +58,34 @@ class DLLightKeyReferencesRenders():
     # type: str
     DL_SHOT_RENDER = 'shotRender'
 
+    ## Name of the knob storing the published file id on Read nodes.
+    # type: str
+    DL_KNOB_PUBLISHED_FILE_ID = 'dlPublishedFileId'
+
+    ## Name of the knob storing the published file version on Read nodes.
+    # type: str
+    DL_KNOB_PUBLISHED_FILE_VERSION = 'dlPublishedFileVersion'
+
+    ## Name of the knob storing the slot (reference or shot) of Read nodes.
+    # type: str
+    DL_KNOB_SLOT = 'dlSlot'
+
+    ## Amount of bytes read to warm the header of published files.
+    # type: int
+    DL_HEADER_BYTES = 65536
+
+    ## Seconds to wait between two progress updates while prefetching.
+    # type: float
+    DL_PREFETCH_POLL_INTERVAL = 0.1
+
+    ## Number of threads used to prefetch publish data and file headers.
+    # type: int
+    DL_PREFETCH_THREADS = 8
+
+    ## Use local downscaled proxies in Read nodes instead of published files.
+    # type: bool
+    DL_USE_PROXY_CACHE = True
+
     def __init__( self ):
         '''Initialize class.
 
@@ -61,132 +97,222 @@ class DLLightKeyReferencesRenders():
         # type: ddNukeAPi.DDBrackdrop
         self.__preShotRefBackdrop = None
 
+        ## Stores script nodes by label, built with a single traversal and
+        # updated as nodes are created or deleted.
+        # type: {str: [ddNukeApi.DDNode]}
+        self.__labelIndex = {}
+
         for node in ddNukeApi.DDRoot().findAll():
 
-            if node.Class() == 'ddBackdrop' and node.label == 'preShotReference':
+            #Avoid ValueError: A PythonObject is not attached to a node
+            newNode = ddNukeApi.DDNode( node )
+
+            if newNode is None:
+                continue
+
+            self.__indexNode( newNode )
+
+        for node in self.__labelIndex.get( 'preShotReference' , [] ):
+
+            if node.Class() == 'ddBackdrop':
 
                 self.__preShotRefBackdrop = node
 
                 break
 
+        ## Local cache of downscaled published frames.
+        # type: dlNukePipe.proxyCache.DLProxyCache
+        self.__proxyCache = dlNukePipe.proxyCache.DLProxyCache()
+
         return
 
-    def addAllReferences( self ):
-        '''Add reference frames (lightKey) and last shot rendered in backdrop
-        preShotReference.
+    def __createReadNode( self            ,
+                          inPublishedFile ,
+                          inLabelStr      ,
+                          inReferenceBool ):
+        '''Create a DDRead node for passed published file, tagged with
+        published file id, version and slot for incremental refresh.
 
-        @return(None):
-        NO return value.
+        @param(ddPipeApi.DDPublishedFile) inPublishedFile:
+        Published file to read.
+
+        @param(str) inLabelStr:
+        Label of the node.
+
+        @param(bool) inReferenceBool:
+        True for reference frames, for shot renders if False.
+
+        @return(ddNukeApi.DDRead):
+        Created Read node.
         '''
 
-        self.addReferenceFrames()
-        self.addShotRenderFrames()
+        proxyPath = None
 
-        self.createBackdrop()
-        self.createBackdrop( inReferenceBool = False )
+        if self.DL_USE_PROXY_CACHE:
+            proxyPath = self.__proxyCache.getProxy( inPublishedFile )
 
-        nukescripts.clear_selection_recursive()
+        if proxyPath is None:
+            readNode = ddNukeApi.DDRead.create( inPublishedFile.localPath )
 
-        nuke.message( 'Process completed!' )
+        else:
+            # Original path is kept on the node for full res toggling.
+            readNode = ddNukeApi.DDRead.create( proxyPath )
+            self.__proxyCache.setReadPaths( readNode                  ,
+                                            inPublishedFile.localPath ,
+                                            proxyPath                 )
 
-        return
+        readNode.knob( 'label').setValue( inLabelStr )
+        readNode.knob( 'on_error' ).setValue( 'nearest frame' )
+
+        nkNode = readNode.nkNode
 
-    def addReferenceFrames( self ):
-        '''Add last published reference frames in backdrop.
+        for knobName in ( self.DL_KNOB_PUBLISHED_FILE_ID      ,
+                          self.DL_KNOB_PUBLISHED_FILE_VERSION ,
+                          self.DL_KNOB_SLOT                   ):
+            knob = nuke.String_Knob( knobName )
+            knob.setVisible( False )
+            nkNode.addKnob( knob )
+
+        nkNode.knob( self.DL_KNOB_PUBLISHED_FILE_ID ).setValue(
+            str( inPublishedFile.id )                         )
+        nkNode.knob( self.DL_KNOB_PUBLISHED_FILE_VERSION ).setValue(
+            str( inPublishedFile.versionNumber )                   )
+        nkNode.knob( self.DL_KNOB_SLOT ).setValue(
+            self.getSlotKey( inPublishedFile ,
+                             inReferenceBool ) )
+
+        self.__indexNode( readNode )
+
+        return readNode
+
+    def __deleteNode( self     ,
+                      inDDNode ):
+        '''Deletes passed node and removes it from label index.
+
+        @param(ddNukeApi.DDNode) inDDNode:
+        Node to delete.
 
         @return(None):
         No return value.
         '''
 
-        nukescripts.clear_selection_recursive()
+        labelNodes = self.__labelIndex.get( inDDNode.label , [] )
+        labelNodes[ : ] = [ node for node in labelNodes if node is not inDDNode ]
 
-        for node in ddNukeApi.DDRoot().findAll():
+        inDDNode.delete()
 
-            #Avoid ValueError: A PythonObject is not attached to a node
-            newNode = ddNukeApi.DDNode( node )
+        return
 
-            if newNode is None:
-                continue
+    def __indexNode( self     ,
+                     inDDNode ):
+        '''Adds passed node to label index.
 
-            if newNode.label == self.DL_REFERENCE:
-                newNode.delete()
+        @param(ddNukeApi.DDNode) inDDNode:
+        Node to index.
 
-        ########################################################################
-        # Get published reference frames
-        ########################################################################
-        publishedReferences = self.getPublishedReferences()
+        @return(None):
+        No return value.
+        '''
 
-        if not publishedReferences:
+        self.__labelIndex.setdefault( inDDNode.label , [] ).append( inDDNode )
 
-            nuke.message( 'There are not Reference Frames published' )
+        return
 
+    def addAllReferences( self ):
+        '''Add reference frames (lightKey) and last shot rendered in backdrop
+        preShotReference.
+
+        @return(None):
+        NO return value.
+        '''
+
+        prefetched = self.prefetch()
+
+        if prefetched is None:
             return
 
-        readNodes = self.createReadNodes( publishedReferences )
+        publishedReferences , publishedRenders = prefetched
 
-        self.arrangeNodeInBackdrop( readNodes )
+        # Backdrops are rebuilt only when their nodes changed.
+        if self.addReferenceFrames( publishedReferences ) and publishedReferences:
+            self.createBackdrop()
 
-        self.createContactSheet( readNodes )
+        if self.addShotRenderFrames( publishedRenders ) and publishedRenders:
+            self.createBackdrop( inReferenceBool = False )
 
         nukescripts.clear_selection_recursive()
 
+        nuke.message( 'Process completed!' )
+
         return
 
-    def addShotRenderFrames( self ):
-        '''Add last published shot renders frames in backdrop.
+    def addReferenceFrames( self                         ,
+                            inPublishedReferences = None ):
+        '''Add or refresh last published reference frames in backdrop.
 
-        @return(None):
-        No return value.
+        @param(list) inPublishedReferences:
+        List of prefetched ddPipeApi.DDPublishedFile, queried if None.
+
+        @return(bool):
+        True if nodes have been modified, False otherwise.
         '''
 
-        nukescripts.clear_selection_recursive()
+        ########################################################################
+        # Get published reference frames
+        ########################################################################
+        publishedReferences = inPublishedReferences
 
-        for node in ddNukeApi.DDRoot().findAll():
+        if publishedReferences is None:
+            publishedReferences = self.getPublishedReferences()
 
-            #Avoid ValueError: A PythonObject is not attached to a node
-            newNode = ddNukeApi.DDNode( node )
+        modified = self.refreshReadNodes( publishedReferences )
 
-            if newNode is None:
-                continue
+        if not publishedReferences:
+
+            nuke.message( 'There are not Reference Frames published' )
+
+        return modified
 
-            if newNode.label == self.DL_SHOT_RENDER:
-                newNode.delete()
+    def addShotRenderFrames( self                      ,
+                             inPublishedRenders = None ):
+        '''Add or refresh last published shot renders frames in backdrop.
+
+        @param(list) inPublishedRenders:
+        List of prefetched ddPipeApi.DDPublishedFile, queried if None.
+
+        @return(bool):
+        True if nodes have been modified, False otherwise.
+        '''
 
         ########################################################################
         # Get published shot renders.
         ########################################################################
-        publishedRenders = []
+        publishedRenders = inPublishedRenders
 
-        context  = ddPipeApi.getCurrentContext()
-        sequence = context.sequence
-        shots    = sequence.shots
-
-        for shot in shots:
+        if publishedRenders is None:
 
-            publishedRender = self.getLastPublishedRender( shot )
+            publishedRenders = []
 
-            if publishedRender:
+            context  = ddPipeApi.getCurrentContext()
+            sequence = context.sequence
+            shots    = sequence.shots
 
-                publishedRenders.append( publishedRender )
+            for shot in shots:
 
-        if not publishedRenders:
+                publishedRender = self.getLastPublishedRender( shot )
 
-            nuke.message( 'There are not Shot Frames published' )
+                if publishedRender:
 
-            return
+                    publishedRenders.append( publishedRender )
 
-        readNodes = self.createReadNodes( publishedRenders        ,
+        modified = self.refreshReadNodes( publishedRenders        ,
                                           inReferenceBool = False )
 
-        self.arrangeNodeInBackdrop( readNodes          ,
-                                    inLeftBool = False )
-
-        self.createContactSheet( readNodes               ,
-                                 inReferenceBool = False )
+        if not publishedRenders:
 
-        nukescripts.clear_selection_recursive()
+            nuke.message( 'There are not Shot Frames published' )
 
-        return
+        return modified
 
     def arrangeNodeInBackdrop( self              ,
                                inNodesDict       ,
@@ -274,11 +400,9 @@ class DLLightKeyReferencesRenders():
 
         nukescripts.clear_selection_recursive()
 
-        for node in ddNukeApi.DDRoot().findAll():
-
-            if node.label == label:
+        for node in self.__labelIndex.get( label , [] ):
 
-                node.setSelected( True )
+            node.setSelected( True )
 
         backdrop = nukescripts.autoBackdrop()
         backdrop.knob( 'label' ).setValue( label )
@@ -288,6 +412,8 @@ class DLLightKeyReferencesRenders():
         backdrop.knob( 'bdheight' ).setValue(
             backdrop.knob( 'bdheight' ).value() + 40 )
 
+        self.__indexNode( ddNukeApi.DDNode( backdrop ) )
+
         return
 
     def createContactSheet( self                   ,
@@ -301,8 +427,8 @@ class DLLightKeyReferencesRenders():
         @param(bool) inReferenceBool:
         True to create DDReads for reference frames, for shot renders if False.
 
-        @return(None):
-        No return value.
+        @return(nuke.Node):
+        Created ContactSheet node, None if there is no Read node.
         '''
 
         if not inReadNodesDict:
@@ -313,23 +439,42 @@ class DLLightKeyReferencesRenders():
         else:
             label = self.DL_SHOT_RENDER
 
+        aspectRatios = [ ( readNode.nkNode.width() /
+                           float( readNode.nkNode.height() or 1 ) ) or 1.0
+                         for readNode in inReadNodesDict.values()          ]
+
+        layout = dlNukePipe.contactSheetLayout.DLContactSheetLayout.fromAspectRatios(
+            aspectRatios                                                            )
+
         contactSheetNode = nuke.nodes.ContactSheet()
         contactSheetNode.knob( 'label').setValue( label )
         contactSheetNode.knob( 'center' ).setValue( True )
 
-        numRows = len( inReadNodesDict ) / 4
-
-        if len( inReadNodesDict ) % 4 != 0:
-
-            numRows += 1
-
-        contactSheetNode.knob( 'rows'   ).setValue( numRows )
-        contactSheetNode.knob( 'width'  ).setValue( 4000 )
-        contactSheetNode.knob( 'height' ).setValue( 1000 * numRows )
+        contactSheetNode.knob( 'rows'    ).setValue( layout.rows    )
+        contactSheetNode.knob( 'columns' ).setValue( layout.columns )
+        contactSheetNode.knob( 'width'   ).setValue( layout.width   )
+        contactSheetNode.knob( 'height'  ).setValue( layout.height  )
+        contactSheetNode.knob( 'gap'     ).setValue( layout.gap     )
 
+        # Inputs are reformatted to tile size, so memory stays bounded.
         for index , readNode in inReadNodesDict.items():
-            contactSheetNode.setInput( index           ,
-                                       readNode.nkNode )
+            reformatNode = nuke.nodes.Reformat( type          = 'to box'          ,
+                                                box_fixed     = True              ,
+                                                box_width     = layout.tileWidth  ,
+                                                box_height    = layout.tileHeight ,
+                                                resize        = 'fit'             ,
+                                                black_outside = True              )
+            reformatNode.knob( 'label' ).setValue( label )
+            reformatNode.knob( 'xpos' ).setValue( readNode.knob( 'xpos' ).value() )
+            reformatNode.knob( 'ypos' ).setValue(
+                readNode.knob( 'ypos' ).value() + 100 )
+            reformatNode.setInput( 0               ,
+                                   readNode.nkNode )
+
+            contactSheetNode.setInput( index        ,
+                                       reformatNode )
+
+            self.__indexNode( ddNukeApi.DDNode( reformatNode ) )
 
         if len( inReadNodesDict ) % 2 == 0:
 
@@ -351,7 +496,9 @@ class DLLightKeyReferencesRenders():
             contactSheetNode.knob( 'xpos' ).setValue( xpos )
             contactSheetNode.knob( 'ypos' ).setValue( ypos + 200 )
 
-        return
+        self.__indexNode( ddNukeApi.DDNode( contactSheetNode ) )
+
+        return contactSheetNode
 
     def createReadNodes( self                   ,
                          inPublishedFilesList   ,
@@ -380,31 +527,38 @@ class DLLightKeyReferencesRenders():
         readNodes = {}
 
         for index , publishFile in enumerate( inPublishedFilesList ):
-            readNode = ddNukeApi.DDRead.create( publishFile.localPath )
-            readNode.knob( 'label').setValue( label )
-            readNode.knob( 'on_error' ).setValue( 'nearest frame' )
-            readNodes[ index ] = readNode
+            readNodes[ index ] = self.__createReadNode( publishFile     ,
+                                                        label           ,
+                                                        inReferenceBool )
 
         return readNodes
 
     @staticmethod
-    def getPublishedReferences():
+    def getPublishedReferences( inSequenceEntity = None ):
         '''Gets render references for every shot in current sequence.
 
+        @param(ddPipeApi.DDSequence) inSequenceEntity:
+        Sequence under which references should be query, current context
+        sequence if None.
+
         @return(list):
         List of ddPipeApi.DDPublishedFile if any, [] if there is no published files.
         '''
         import ddLogger
 
-        context = ddPipeApi.getCurrentContext()
+        context = inSequenceEntity
 
         if context is None:
 
-            ddLogger.DD_NUKE.warning( 'There is no context!' )
+            context = ddPipeApi.getCurrentContext()
 
-            raise AttributeError( 'Not able to find a context!' )
+            if context is None:
+
+                ddLogger.DD_NUKE.warning( 'There is no context!' )
 
-        context = context.sequence
+                raise AttributeError( 'Not able to find a context!' )
+
+            context = context.sequence
 
         # Lighting and Concept are valid main nomenclature in this case
         mainNoms = [
@@ -428,9 +582,18 @@ class DLLightKeyReferencesRenders():
                 ddPipeApi.step.DD_ID_SEQUENCE_LIGHTING                        )
         ]
 
-        return ddPipeApi.DDPublishedFile.getAll(
-                inFilters = filters                                          ,
-                inOrder   = ddPipeApi.DDPublishedFile.DD_ORDER_ID_DESCENDING )
+        # References are published a few times a week, query is cached on
+        # disk and only refetched when a newer reference is published.
+        key = ( 'references'                                             ,
+                sorted( nomenclature.id for nomenclature in mainNoms )   ,
+                subNom.id                                                ,
+                ddPipeApi.step.DD_ID_SEQUENCE_LIGHTING                   ,
+                fileTypes                                                )
+
+        return dlNukePipe.queryCache.DLQueryCache().getPublishedFiles(
+            context.id ,
+            key        ,
+            filters    )
 
     @staticmethod
     def getLastPublishedRender( inShotEntity ):
@@ -459,3 +622,271 @@ class DLLightKeyReferencesRenders():
         return ddPipeApi.DDPublishedFile.getFirst(
                 inFilters = filters                                          ,
                 inOrder   = ddPipeApi.DDPublishedFile.DD_ORDER_ID_DESCENDING )
+
+    @staticmethod
+    def getLastPublishedRenders( inShotEntities            ,
+                                 inMainNomenclature = None ):
+        '''Gets last published render file for every passed shot with a single
+        query instead of one query per shot.
+
+        @param(list) inShotEntities:
+        List of ddPipeApi.DDShot under which renders should be query.
+
+        @param(ddPipeApi.DDNomenclature) inMainNomenclature:
+        Main nomenclature of the renders, current context one if None.
+
+        @return(list):
+        List of ddPipeApi.DDPublishedFile ordered as passed shots, shots
+        without published render are skipped.
+        '''
+
+        if not inShotEntities:
+            return []
+
+        if inMainNomenclature is None:
+            inMainNomenclature = ddPipeApi.getCurrentContext().mainNomenclature
+
+        subNom = ddPipeApi.DDNomenclature( ddPipeApi.nomenclature.DD_ID_RENDER )
+
+        filters = [
+            ddPipeApi.DDPublishedFile.entity.in_( inShotEntities )          ,
+            ddPipeApi.DDPublishedFile.mainNomenclature == inMainNomenclature ,
+            ddPipeApi.DDPublishedFile.subNomenclature  == subNom             ,
+            ddPipeApi.DDPublishedFile.type             ==
+                ddPipeApi.publishedFileType.DD_ID_EXR                        ,
+            ddPipeApi.DDPublishedFile.step             == ddPipeApi.DDStep(
+                ddPipeApi.step.DD_ID_SHOT_LIGHTING                        )  ,
+            ddPipeApi.DDPublishedFile.token2           == None               ]
+
+        publishedRenders = ddPipeApi.DDPublishedFile.getAll(
+                inFilters = filters                                          ,
+                inOrder   = ddPipeApi.DDPublishedFile.DD_ORDER_ID_DESCENDING )
+
+        # Files are ordered by descending id, first one per shot is the last.
+        lastRenders = {}
+
+        for publishedRender in publishedRenders:
+            lastRenders.setdefault( publishedRender.entity.id ,
+                                    publishedRender           )
+
+        return [ lastRenders[ shot.id ] for shot in inShotEntities
+                 if shot.id in lastRenders                         ]
+
+    @staticmethod
+    def getSlotKey( inPublishedFile ,
+                    inReferenceBool ):
+        '''Gets the key identifying what passed published file shows, a
+        reference publish for reference frames, its shot for shot renders.
+
+        @param(ddPipeApi.DDPublishedFile) inPublishedFile:
+        Published file to get the key for.
+
+        @param(bool) inReferenceBool:
+        True for reference frames, for shot renders if False.
+
+        @return(str):
+        Slot key of the published file.
+        '''
+
+        if inReferenceBool:
+            return 'publishedFile{}'.format( inPublishedFile.id )
+
+        return 'shot{}'.format( inPublishedFile.entity.id )
+
+    def prefetch( self ):
+        '''Starts published references and last shot renders queries in a
+        thread pool, then warms the header of the first frame of each
+        published file, main thread only reports progress.
+
+        @return(tuple):
+        Tuple of lists of ddPipeApi.DDPublishedFile ( references , renders ),
+        None if the process was cancelled.
+        '''
+
+        context = ddPipeApi.getCurrentContext()
+
+        if context is None:
+            raise AttributeError( 'Not able to find a context!' )
+
+        sequence = context.sequence
+
+        task = nuke.ProgressTask( 'LightKey references' )
+        task.setMessage( 'Querying published files' )
+
+        pool = multiprocessing.pool.ThreadPool( self.DL_PREFETCH_THREADS )
+
+        try:
+            referencesResult = pool.apply_async(
+                self.getPublishedReferences ,
+                ( sequence , )              )
+
+            rendersResult = pool.apply_async(
+                self.getLastPublishedRenders          ,
+                ( sequence.shots                      ,
+                  context.mainNomenclature            ) )
+
+            pendingQueries = [ referencesResult ,
+                               rendersResult    ]
+            results        = list( pendingQueries )
+
+            while True:
+
+                if task.isCancelled():
+                    return None
+
+                for queryResult in list( pendingQueries ):
+
+                    if not queryResult.ready():
+                        continue
+
+                    pendingQueries.remove( queryResult )
+
+                    # Raise any query error in main thread.
+                    for publishFile in queryResult.get() or []:
+                        results.append(
+                            pool.apply_async( self.warmFileHeader    ,
+                                              ( publishFile.localPath , ) ) )
+
+                    task.setMessage( 'Reading file headers' )
+
+                completed = len( [ result for result in results
+                                   if result.ready()              ] )
+
+                task.setProgress( int( 100 * completed / len( results ) ) )
+
+                if not pendingQueries and completed == len( results ):
+                    break
+
+                time.sleep( self.DL_PREFETCH_POLL_INTERVAL )
+
+        finally:
+            pool.terminate()
+
+            del task
+
+        return referencesResult.get() , rendersResult.get()
+
+    def refreshReadNodes( self                   ,
+                          inPublishedFilesList   ,
+                          inReferenceBool = True ):
+        '''Diffs existing tagged Read nodes against passed published files,
+        only replacing Reads whose published file changed, adding new ones
+        and removing vanished ones. Contact sheet is rebuilt only if a Read
+        has been modified.
+
+        @param(list) inPublishedFilesList:
+        List of ddPipeApi.DDPublishedFiles
+
+        @param(bool) inReferenceBool:
+        True to refresh reference frames, shot renders if False.
+
+        @return(bool):
+        True if nodes have been modified, False otherwise.
+        '''
+
+        if inReferenceBool:
+            label = self.DL_REFERENCE
+        else:
+            label = self.DL_SHOT_RENDER
+
+        existingReads = {}
+        otherNodes    = []
+
+        for node in self.__labelIndex.get( label , [] ):
+
+            slotKnob = node.knob( self.DL_KNOB_SLOT )
+
+            if node.Class() == 'Read' and slotKnob is not None:
+                existingReads[ slotKnob.value() ] = node
+
+            else:
+                # Contact sheet, backdrop and untagged Reads.
+                otherNodes.append( node )
+
+        modified  = False
+        readNodes = {}
+
+        for index , publishFile in enumerate( inPublishedFilesList or [] ):
+
+            readNode = existingReads.pop(
+                self.getSlotKey( publishFile     ,
+                                 inReferenceBool ) ,
+                None                               )
+
+            if readNode is not None:
+
+                publishedFileId = readNode.knob(
+                    self.DL_KNOB_PUBLISHED_FILE_ID ).value()
+                version = readNode.knob(
+                    self.DL_KNOB_PUBLISHED_FILE_VERSION ).value()
+
+                if ( publishedFileId == str( publishFile.id )            and
+                     version         == str( publishFile.versionNumber ) ):
+
+                    readNodes[ index ] = readNode
+
+                    continue
+
+                self.__deleteNode( readNode )
+
+            readNodes[ index ] = self.__createReadNode( publishFile     ,
+                                                        label           ,
+                                                        inReferenceBool )
+            modified = True
+
+        for readNode in existingReads.values():
+
+            self.__deleteNode( readNode )
+
+            modified = True
+
+        if not modified and ( otherNodes or not readNodes ):
+            return False
+
+        nukescripts.clear_selection_recursive()
+
+        for node in otherNodes:
+            self.__deleteNode( node )
+
+        if readNodes:
+
+            self.arrangeNodeInBackdrop( readNodes                   ,
+                                        inLeftBool = inReferenceBool )
+
+            self.createContactSheet( readNodes       ,
+                                     inReferenceBool )
+
+        nukescripts.clear_selection_recursive()
+
+        return True
+
+    @classmethod
+    def warmFileHeader( cls    ,
+                        inPath ):
+        '''Reads the header of the first frame of passed path, so the network
+        filesystem stat and first blocks are cached before Read creation.
+
+        @param(str|ddPath.sequence.DDSequence) inPath:
+        Published file local path.
+
+        @return(None):
+        No return value.
+        '''
+
+        path = inPath
+
+        if isinstance( path , ddPath.sequence.DDSequence ):
+            try:
+                path = path.getFile( path.getFirstFrame() )
+
+            except ValueError:
+                return
+
+        try:
+            with open( str( path ) , 'rb' ) as fileObj:
+                fileObj.read( cls.DL_HEADER_BYTES )
+
+        except ( IOError , OSError ):
+            pass
+
+        return
@@ -0,0 +1,169 @@
+################################################################################
+# L ATELIER ANIMATION INC.
+#
+# [2012] - [2020] L ATELIER ANIMATION INC. All Rights Reserved.
+#
+# NOTICE: All information contained herein is, and remains
+#         the property of L Atelier Animation Inc. and its suppliers,
+#         if any.  The intellectual and technical concepts contained
+#         herein are proprietary to L Atelier Animation Inc. and its
+#         suppliers and may be covered by Canadian, U.S. and/or
+#         Foreign Patents, patents in process, and are protected
+#         by trade secret or copyright law. Dissemination of this
+#         information or reproduction of this material is strictly
+#         forbidden unless prior written permission is obtained from
+#         L ATELIER ANIMATION INC.
+#
+################################################################################
+'''Cmd Module indexing nodes of the current script by class.
+
+Usage:
+    registry = dlNukePipe.nodeRegistry.DLNodeRegistry.getInstance()
+    nodes    = registry.getNodes( 'tbvDiOutput' , 'tbvDiCreate' )
+
+@package dlNukePipe.nodeRegistry
+@author  Esteban Ortega <esteban.ortega@latelieranimation.com>
+'''
+
+import nuke
+
+import dlNukePipe.nodeTraversal
+
+__all__ = ( 'DLNodeRegistry' , )
+
+class DLNodeRegistry( object ):
+    '''Maps node class to the live nodes of the current script, groups
+    included and gizmo internals excluded, so tools don't walk the whole
+    script to find a few gizmos.
+
+    Kept up to date by onCreate / onDestroy callbacks. Loading or closing a
+    script marks the registry dirty, it is rebuilt with a single traversal
+    on the next query rather than node by node while loading.
+    '''
+
+    ## Shared registry.
+    # type: DLNodeRegistry
+    __instance = None
+
+    def __init__( self ):
+        '''Initialize class.
+
+        @return(None):
+        No return value.
+        '''
+
+        ## Live nodes by class.
+        # type: dict[str, list[nuke.Node]]
+        self.__nodesByClass = {}
+
+        ## True if the registry must be rebuilt before next query.
+        # type: bool
+        self.__dirty = True
+
+        return
+
+    def __onCreate( self ):
+        '''Callback adding created node to the registry.
+
+        @return(None):
+        No return value.
+        '''
+
+        if self.__dirty:
+            return
+
+        node = nuke.thisNode()
+
+        if dlNukePipe.nodeTraversal.DLNodeTraversal.isGizmoInternal( node ):
+            return
+
+        self.__nodesByClass.setdefault( node.Class() , [] ).append( node )
+
+        return
+
+    def __onDestroy( self ):
+        '''Callback removing destroyed node from the registry.
+
+        @return(None):
+        No return value.
+        '''
+
+        if self.__dirty:
+            return
+
+        node  = nuke.thisNode()
+        nodes = self.__nodesByClass.get( node.Class() , [] )
+
+        if node in nodes:
+            nodes.remove( node )
+
+        return
+
+    def __onScriptChange( self ):
+        '''Callback marking the registry dirty when a script is loaded or
+        closed.
+
+        @return(None):
+        No return value.
+        '''
+
+        self.__dirty = True
+
+        return
+
+    @classmethod
+    def getInstance( cls ):
+        '''Gets the shared registry, registering its callbacks on first call.
+
+        @return(DLNodeRegistry):
+        Shared registry.
+        '''
+
+        if cls.__instance is None:
+            instance = cls()
+
+            nuke.addOnCreate( instance.__onCreate )
+            nuke.addOnDestroy( instance.__onDestroy )
+            nuke.addOnScriptLoad( instance.__onScriptChange )
+            nuke.addOnScriptClose( instance.__onScriptChange )
+
+            cls.__instance = instance
+
+        return cls.__instance
+
+    def getNodes( self          ,
+                  *inClassNames ):
+        '''Gets live nodes of passed classes.
+
+        @param(str) inClassNames:
+        Node class names, gizmo names for gizmos.
+
+        @return(list):
+        List of nuke.Node.
+        '''
+
+        if self.__dirty:
+            self.rebuild()
+
+        nodes = []
+
+        for className in inClassNames:
+            nodes.extend( self.__nodesByClass.get( className , [] ) )
+
+        return nodes
+
+    def rebuild( self ):
+        '''Rebuilds the registry from a single traversal of the script.
+
+        @return(None):
+        No return value.
+        '''
+
+        self.__nodesByClass = {}
+
+        for node in dlNukePipe.nodeTraversal.DLNodeTraversal.findNodes():
+            self.__nodesByClass.setdefault( node.Class() , [] ).append( node )
+
+        self.__dirty = False
+
+        return
@@ -0,0 +1,124 @@
+################################################################################
+# L ATELIER ANIMATION INC.
+#
+# [2012] - [2020] L ATELIER ANIMATION INC. All Rights Reserved.
+#
+# NOTICE: All information contained herein is, and remains
+#         the property of L Atelier Animation Inc. and its suppliers,
+#         if any.  The intellectual and technical concepts contained
+#         herein are proprietary to L Atelier Animation Inc. and its
+#         suppliers and may be covered by Canadian, U.S. and/or
+#         Foreign Patents, patents in process, and are protected
+#         by trade secret or copyright law. Dissemination of this
+#         information or reproduction of this material is strictly
+#         forbidden unless prior written permission is obtained from
+#         L ATELIER ANIMATION INC.
+#
+################################################################################
+'''Cmd Module to find nodes in the current script, groups included.
+
+Usage:
+    nodes = dlNukePipe.nodeTraversal.DLNodeTraversal.findNodes(
+        [ 'tbvAlbedoCc' , 'tbvEyeCc' ] )
+
+@package dlNukePipe.nodeTraversal
+@author  Esteban Ortega <esteban.ortega@latelieranimation.com>
+'''
+
+import nuke
+
+__all__ = ( 'DLNodeTraversal' , )
+
+class DLNodeTraversal( object ):
+    '''Finds nodes by class in the script, descending into Groups and
+    LiveGroups but never into gizmo internals.
+
+    Nothing is cached, tools needing repeated lookups use
+    dlNukePipe.nodeRegistry.
+    '''
+
+    ## Node classes whose children are traversed.
+    # type: tuple[str]
+    DL_CONTAINER_CLASSES = ( 'Group'     ,
+                             'LiveGroup' )
+
+    ## Key of the root container, as returned by getParentKey.
+    # type: str
+    DL_ROOT_KEY = ''
+
+    @classmethod
+    def findNodes( cls                 ,
+                   inClassNames = None ,
+                   inContainer  = None ):
+        '''Finds nodes of passed classes in a container and its groups,
+        with an explicit stack.
+
+        @param(list) inClassNames:
+        Node class names, gizmo names for gizmos, every class if None.
+
+        @param(nuke.Node) inContainer:
+        Container to search, root if None.
+
+        @return(list):
+        List of nuke.Node.
+        '''
+
+        if inContainer is None:
+            inContainer = nuke.root()
+
+        classNames = None if inClassNames is None else set( inClassNames )
+        nodes      = []
+        stack      = [ inContainer ]
+
+        while stack:
+
+            for node in stack.pop().nodes():
+
+                nodeClass = node.Class()
+
+                if classNames is None or nodeClass in classNames:
+                    nodes.append( node )
+
+                # Gizmos are groups too, their internals are never traversed.
+                if ( nodeClass in cls.DL_CONTAINER_CLASSES and
+                     not isinstance( node , nuke.Gizmo )   ):
+                    stack.append( node )
+
+        return nodes
+
+    @classmethod
+    def getParentKey( cls    ,
+                      inNode ):
+        '''Gets the key of the container of a node.
+
+        @param(nuke.Node) inNode:
+        Any node.
+
+        @return(str):
+        Full name of the parent group, DL_ROOT_KEY for root.
+        '''
+
+        return inNode.fullName().rpartition( '.' )[ 0 ] or cls.DL_ROOT_KEY
+
+    @classmethod
+    def isGizmoInternal( cls    ,
+                         inNode ):
+        '''Checks if a node is inside a gizmo.
+
+        @param(nuke.Node) inNode:
+        Any node.
+
+        @return(bool):
+        True if the node is part of a gizmo internals, False otherwise.
+        '''
+
+        parentKey = cls.getParentKey( inNode )
+
+        while parentKey != cls.DL_ROOT_KEY:
+
+            if isinstance( nuke.toNode( parentKey ) , nuke.Gizmo ):
+                return True
+
+            parentKey = parentKey.rpartition( '.' )[ 0 ]
+
+        return False
@@ -0,0 +1,412 @@
+################################################################################
+# L ATELIER ANIMATION INC.
+#
+# [2012] - [2020] L ATELIER ANIMATION INC. All Rights Reserved.
+#
+# NOTICE: All information contained herein is, and remains
+#         the property of L Atelier Animation Inc. and its suppliers,
+#         if any.  The intellectual and technical concepts contained
+#         herein are proprietary to L Atelier Animation Inc. and its
+#         suppliers and may be covered by Canadian, U.S. and/or
+#         Foreign Patents, patents in process, and are protected
+#         by trade secret or copyright law. Dissemination of this
+#         information or reproduction of this material is strictly
+#         forbidden unless prior written permission is obtained from
+#         L ATELIER ANIMATION INC.
+#
+################################################################################
+'''Cmd Module to cache local downscaled proxies of published frames.
+
+@package dlNukePipe.proxyCache
+@author  Esteban Ortega <esteban.ortega@latelieranimation.com>
+'''
+
+import os
+
+import nuke
+
+import ddLogger
+import ddPath
+
+__all__ = ( 'DLProxyCache' , )
+
+class DLProxyCache( object ):
+    '''Local cache of downscaled copies of the representative (first) frame
+    of published files, keyed by published file id and version, with least
+    recently used eviction by size.
+    '''
+
+    ## Environment variable overriding the cache directory.
+    # type: str
+    DL_ENV_CACHE_DIR = 'DL_NUKE_PROXY_CACHE_DIR'
+
+    ## Name of the knob storing the original published path on Read nodes.
+    # type: str
+    DL_KNOB_ORIGINAL_PATH = 'dlOriginalPath'
+
+    ## Name of the knob storing the original frame range on Read nodes.
+    # type: str
+    DL_KNOB_ORIGINAL_RANGE = 'dlOriginalRange'
+
+    ## Name of the knob storing the proxy path on Read nodes.
+    # type: str
+    DL_KNOB_PROXY_PATH = 'dlProxyPath'
+
+    ## Name of the knob toggling Read nodes between proxy and full resolution.
+    # type: str
+    DL_KNOB_TOGGLE = 'dlToggleFullRes'
+
+    ## Maximum size in bytes of the cache directory.
+    # type: int
+    DL_MAX_SIZE = 2 * 1024 ** 3
+
+    ## File type of the proxies.
+    # type: str
+    DL_PROXY_FILE_TYPE = 'jpg'
+
+    ## Width of the proxies, height keeps the source aspect ratio.
+    # type: int
+    DL_PROXY_WIDTH = 1024
+
+    def __init__( self                ,
+                  inCacheDirStr = None ,
+                  inMaxSizeInt  = None ):
+        '''Initialize class.
+
+        @param(str) inCacheDirStr:
+        Directory where proxies are stored, user cache directory if None.
+
+        @param(int) inMaxSizeInt:
+        Maximum size in bytes of the cache, DL_MAX_SIZE if None.
+
+        @return(None):
+        No return value.
+        '''
+
+        if inCacheDirStr is None:
+            inCacheDirStr = os.environ.get( self.DL_ENV_CACHE_DIR )
+
+        if inCacheDirStr is None:
+            inCacheDirStr = os.path.join(
+                os.environ.get( 'XDG_CACHE_HOME'                          ,
+                                os.path.expanduser( '~/.cache' )          ) ,
+                'dlNukePipe'                                                ,
+                'proxies'                                                   )
+
+        ## Directory where proxies are stored.
+        # type: str
+        self.cacheDir = inCacheDirStr
+
+        ## Maximum size in bytes of the cache.
+        # type: int
+        self.maxSize = inMaxSizeInt or self.DL_MAX_SIZE
+
+        return
+
+    def __createProxy( self            ,
+                       inPublishedFile ,
+                       inProxyPathStr  ):
+        '''Renders a downscaled copy of the first frame of passed published
+        file, written in a temporary file then renamed to be atomic.
+
+        @param(ddPipeApi.DDPublishedFile) inPublishedFile:
+        Published file to create a proxy for.
+
+        @param(str) inProxyPathStr:
+        Path of the proxy to create.
+
+        @return(bool):
+        True if the proxy has been created, False otherwise.
+        '''
+
+        localPath = inPublishedFile.localPath
+        frame     = 1
+
+        if isinstance( localPath , ddPath.sequence.DDSequence ):
+            try:
+                frame = localPath.getFirstFrame()
+
+            except ValueError:
+                return False
+
+        tempPathStr = '{}.{}.tmp.{}'.format(
+            os.path.splitext( inProxyPathStr )[ 0 ] ,
+            os.getpid()                             ,
+            self.DL_PROXY_FILE_TYPE                 )
+
+        readNode = nuke.nodes.Read( file = str( localPath ) )
+        readNode.knob( 'first' ).setValue( frame )
+        readNode.knob( 'last'  ).setValue( frame )
+
+        reformatNode = nuke.nodes.Reformat( type      = 'to box'            ,
+                                            box_fixed = True                ,
+                                            box_width = self.DL_PROXY_WIDTH )
+        reformatNode.knob( 'box_height' ).setValue(
+            int( self.DL_PROXY_WIDTH * readNode.height() /
+                 float( readNode.width() or 1 )         ) )
+        reformatNode.setInput( 0        ,
+                               readNode )
+
+        writeNode = nuke.nodes.Write( file      = tempPathStr             ,
+                                      file_type = self.DL_PROXY_FILE_TYPE )
+        writeNode.setInput( 0            ,
+                            reformatNode )
+
+        try:
+            nuke.execute( writeNode ,
+                          frame     ,
+                          frame     )
+
+            os.rename( tempPathStr    ,
+                       inProxyPathStr )
+
+        except ( RuntimeError , OSError ) as error:
+            ddLogger.DD_NUKE.warning(
+                'Not able to create proxy for "{}": {}'.format( localPath ,
+                                                                error     ) )
+
+            if os.path.exists( tempPathStr ):
+                os.remove( tempPathStr )
+
+            return False
+
+        finally:
+            for node in ( writeNode    ,
+                          reformatNode ,
+                          readNode     ):
+                nuke.delete( node )
+
+        return True
+
+    def evict( self ):
+        '''Removes least recently used proxies until cache size is under
+        maximum size.
+
+        @return(int):
+        Number of removed proxies.
+        '''
+
+        if not os.path.isdir( self.cacheDir ):
+            return 0
+
+        entries   = []
+        totalSize = 0
+
+        for fileName in os.listdir( self.cacheDir ):
+            pathStr = os.path.join( self.cacheDir ,
+                                    fileName      )
+            try:
+                stat = os.stat( pathStr )
+
+            except OSError:
+                continue
+
+            entries.append( ( stat.st_mtime ,
+                              stat.st_size  ,
+                              pathStr       ) )
+            totalSize += stat.st_size
+
+        removed = 0
+
+        for _ , size , pathStr in sorted( entries ):
+
+            if totalSize <= self.maxSize:
+                break
+
+            try:
+                os.remove( pathStr )
+
+            except OSError:
+                continue
+
+            totalSize -= size
+            removed   += 1
+
+        return removed
+
+    @staticmethod
+    def __getFrameRange( inPath ):
+        '''Gets the frame range of passed path.
+
+        @param(str|ddPath.sequence.DDSequence) inPath:
+        Published file local path.
+
+        @return(tuple):
+        First and last frames, (1, 1) if passed path is not a sequence.
+        '''
+
+        if isinstance( inPath , ddPath.sequence.DDSequence ):
+            try:
+                return ( inPath.getFirstFrame() ,
+                         inPath.getLastFrame()  )
+
+            except ValueError:
+                pass
+
+        return ( 1 ,
+                 1 )
+
+    @staticmethod
+    def __setFrameRange( inNkNode ,
+                         inFirst  ,
+                         inLast   ):
+        '''Sets the frame range knobs of passed Read node.
+
+        @param(nuke.Node) inNkNode:
+        Read node to modify.
+
+        @param(int) inFirst:
+        First frame.
+
+        @param(int) inLast:
+        Last frame.
+
+        @return(None):
+        No return value.
+        '''
+
+        for knobName , value in ( ( 'first'     , inFirst ) ,
+                                  ( 'last'      , inLast  ) ,
+                                  ( 'origfirst' , inFirst ) ,
+                                  ( 'origlast'  , inLast  ) ):
+            inNkNode.knob( knobName ).setValue( value )
+
+        return
+
+    def getProxy( self            ,
+                  inPublishedFile ):
+        '''Gets the proxy of passed published file, creating it on first use.
+
+        @param(ddPipeApi.DDPublishedFile) inPublishedFile:
+        Published file to get the proxy for.
+
+        @return(str):
+        Path of the proxy, None if it was not possible to create it.
+        '''
+
+        proxyPathStr = self.getProxyPath( inPublishedFile )
+
+        try:
+            if os.path.exists( proxyPathStr ):
+                # Mark as recently used for eviction.
+                os.utime( proxyPathStr ,
+                          None         )
+
+                return proxyPathStr
+
+            if not os.path.isdir( self.cacheDir ):
+                os.makedirs( self.cacheDir )
+
+        except OSError as error:
+            ddLogger.DD_NUKE.warning(
+                'Not able to use proxy cache "{}": {}'.format( self.cacheDir ,
+                                                               error         ) )
+            return None
+
+        if not self.__createProxy( inPublishedFile ,
+                                   proxyPathStr    ):
+            return None
+
+        self.evict()
+
+        return proxyPathStr
+
+    def getProxyPath( self            ,
+                      inPublishedFile ):
+        '''Gets the path of the proxy of passed published file.
+
+        @param(ddPipeApi.DDPublishedFile) inPublishedFile:
+        Published file to get the proxy path for.
+
+        @return(str):
+        Path of the proxy in cache directory.
+        '''
+
+        return os.path.join(
+            self.cacheDir                                            ,
+            '{}_v{:03d}.{}'.format( inPublishedFile.id              ,
+                                    inPublishedFile.versionNumber   ,
+                                    self.DL_PROXY_FILE_TYPE         ) )
+
+    @classmethod
+    def setReadPaths( cls             ,
+                      inReadNode      ,
+                      inOriginalPath  ,
+                      inProxyPathStr  ):
+        '''Points passed Read node to the proxy, keeping the original path
+        in a knob to toggle to full resolution.
+
+        @param(ddNukeApi.DDRead) inReadNode:
+        Read node to modify.
+
+        @param(str|ddPath.sequence.DDSequence) inOriginalPath:
+        Published file local path.
+
+        @param(str) inProxyPathStr:
+        Path of the proxy.
+
+        @return(None):
+        No return value.
+        '''
+
+        nkNode = inReadNode.nkNode
+
+        if nkNode.knob( cls.DL_KNOB_ORIGINAL_PATH ) is None:
+            nkNode.addKnob( nuke.String_Knob( cls.DL_KNOB_ORIGINAL_PATH ,
+                                              'Original Path'           ) )
+            nkNode.addKnob( nuke.String_Knob( cls.DL_KNOB_PROXY_PATH ,
+                                              'Proxy Path'           ) )
+            nkNode.addKnob( nuke.String_Knob( cls.DL_KNOB_ORIGINAL_RANGE ,
+                                              'Original Range'           ) )
+            nkNode.addKnob( nuke.PyScript_Knob(
+                cls.DL_KNOB_TOGGLE                                        ,
+                'Toggle Full Res'                                         ,
+                'import dlNukePipe.proxyCache\n'
+                'dlNukePipe.proxyCache.DLProxyCache.toggleFullRes( '
+                'nuke.thisNode() )'                                       ) )
+
+        first , last = cls.__getFrameRange( inOriginalPath )
+
+        nkNode.knob( cls.DL_KNOB_ORIGINAL_PATH ).setValue( str( inOriginalPath ) )
+        nkNode.knob( cls.DL_KNOB_PROXY_PATH ).setValue( inProxyPathStr )
+        nkNode.knob( cls.DL_KNOB_ORIGINAL_RANGE ).setValue(
+            '{} {}'.format( first ,
+                            last  ) )
+        nkNode.knob( 'file' ).setValue( inProxyPathStr )
+
+        # The proxy is a single still of the first frame.
+        cls.__setFrameRange( nkNode ,
+                             first  ,
+                             first  )
+
+        return
+
+    @classmethod
+    def toggleFullRes( cls       ,
+                       inNkNode  ):
+        '''Toggles passed Read node between its proxy and original path.
+
+        @param(nuke.Node) inNkNode:
+        Read node created with setReadPaths.
+
+        @return(None):
+        No return value.
+        '''
+
+        originalPathStr = inNkNode.knob( cls.DL_KNOB_ORIGINAL_PATH ).value()
+        proxyPathStr    = inNkNode.knob( cls.DL_KNOB_PROXY_PATH ).value()
+        first , last    = [ int( frame ) for frame in
+                            inNkNode.knob( cls.DL_KNOB_ORIGINAL_RANGE ).value().split() ]
+
+        if inNkNode.knob( 'file' ).value() == proxyPathStr:
+            inNkNode.knob( 'file' ).setValue( originalPathStr )
+            cls.__setFrameRange( inNkNode ,
+                                 first    ,
+                                 last     )
+        else:
+            inNkNode.knob( 'file' ).setValue( proxyPathStr )
+            cls.__setFrameRange( inNkNode ,
+                                 first    ,
+                                 first    )
+
+        return
@@ -0,0 +1,284 @@
+################################################################################
+# L ATELIER ANIMATION INC.
+#
+# [2012] - [2020] L ATELIER ANIMATION INC. All Rights Reserved.
+#
+# NOTICE: All information contained herein is, and remains
+#         the property of L Atelier Animation Inc. and its suppliers,
+#         if any.  The intellectual and technical concepts contained
+#         herein are proprietary to L Atelier Animation Inc. and its
+#         suppliers and may be covered by Canadian, U.S. and/or
+#         Foreign Patents, patents in process, and are protected
+#         by trade secret or copyright law. Dissemination of this
+#         information or reproduction of this material is strictly
+#         forbidden unless prior written permission is obtained from
+#         L ATELIER ANIMATION INC.
+#
+################################################################################
+'''Cmd Module to cache published file queries on disk.
+
+@package dlNukePipe.queryCache
+@author  Esteban Ortega <esteban.ortega@latelieranimation.com>
+'''
+
+import hashlib
+import json
+import os
+import time
+
+import ddLogger
+import ddPipeApi
+
+__all__ = ( 'DLQueryCache' , )
+
+class DLQueryCache( object ):
+    '''Disk cache of published file queries, storing the ids of the result.
+
+    Within the time to live the cached ids are used as is, records are
+    fetched back by id in a single query so every path returns the same
+    ddPipeApi.DDPublishedFile objects. Once expired the latest matching
+    published file id is queried and compared with the cached one, the
+    filtered query is only done again if a newer file was published.
+    '''
+
+    ## Environment variable overriding the cache directory.
+    # type: str
+    DL_ENV_CACHE_DIR = 'DL_NUKE_QUERY_CACHE_DIR'
+
+    ## Environment variable overriding the time to live in seconds.
+    # type: str
+    DL_ENV_TTL = 'DL_NUKE_QUERY_CACHE_TTL'
+
+    ## Default time to live of cached queries in seconds.
+    # type: float
+    DL_TTL = 3600.0
+
+    def __init__( self                 ,
+                  inCacheDirStr = None ,
+                  inTtlFloat    = None ):
+        '''Initialize class.
+
+        @param(str) inCacheDirStr:
+        Directory where queries are stored, user cache directory if None.
+
+        @param(float) inTtlFloat:
+        Time to live of cached queries in seconds, DL_ENV_TTL or DL_TTL if None.
+
+        @return(None):
+        No return value.
+        '''
+
+        if inCacheDirStr is None:
+            inCacheDirStr = os.environ.get( self.DL_ENV_CACHE_DIR )
+
+        if inCacheDirStr is None:
+            inCacheDirStr = os.path.join(
+                os.environ.get( 'XDG_CACHE_HOME'                          ,
+                                os.path.expanduser( '~/.cache' )          ) ,
+                'dlNukePipe'                                                ,
+                'queries'                                                   )
+
+        if inTtlFloat is None:
+            inTtlFloat = float( os.environ.get( self.DL_ENV_TTL ,
+                                                self.DL_TTL     ) )
+
+        ## Directory where queries are stored.
+        # type: str
+        self.cacheDir = inCacheDirStr
+
+        ## Time to live of cached queries in seconds.
+        # type: float
+        self.ttl = inTtlFloat
+
+        return
+
+    def __read( self      ,
+                inPathStr ):
+        '''Reads a cached query.
+
+        @param(str) inPathStr:
+        Path of the cached query.
+
+        @return(dict):
+        Cached query, None if missing or unreadable.
+        '''
+
+        try:
+            with open( inPathStr ) as cacheFile:
+                return json.load( cacheFile )
+
+        except ( IOError , OSError , ValueError ):
+            return None
+
+    def __write( self      ,
+                 inPathStr ,
+                 inEntry   ):
+        '''Writes a cached query in a temporary file then renames it to be
+        atomic.
+
+        @param(str) inPathStr:
+        Path of the cached query.
+
+        @param(dict) inEntry:
+        Cached query.
+
+        @return(None):
+        No return value.
+        '''
+
+        tempPathStr = '{}.{}.tmp'.format( inPathStr   ,
+                                          os.getpid() )
+
+        try:
+            if not os.path.isdir( self.cacheDir ):
+                os.makedirs( self.cacheDir )
+
+            with open( tempPathStr , 'w' ) as cacheFile:
+                json.dump( inEntry   ,
+                           cacheFile )
+
+            os.rename( tempPathStr ,
+                       inPathStr   )
+
+        except ( IOError , OSError ) as error:
+            ddLogger.DD_NUKE.warning(
+                'Not able to write query cache "{}": {}'.format( inPathStr ,
+                                                                 error     ) )
+
+        return
+
+    def getCachePath( self      ,
+                      inScopeId ,
+                      inKey     ):
+        '''Gets the path of a cached query.
+
+        @param(int) inScopeId:
+        Id of the entity the query is scoped to, used to invalidate.
+
+        @param(tuple) inKey:
+        JSON serializable key identifying the query within its scope.
+
+        @return(str):
+        Path of the cached query in cache directory.
+        '''
+
+        digest = hashlib.sha1(
+            json.dumps( inKey , sort_keys = True ).encode( 'utf-8' ) ).hexdigest()
+
+        return os.path.join( self.cacheDir                           ,
+                             '{}_{}.json'.format( inScopeId , digest ) )
+
+    def getPublishedFiles( self           ,
+                           inScopeId      ,
+                           inKey          ,
+                           inFilters      ,
+                           inOrder = None ):
+        '''Gets published files matching passed filters, from cache if still
+        valid. Timing and cache state are logged.
+
+        @param(int) inScopeId:
+        Id of the entity the query is scoped to, used to invalidate.
+
+        @param(tuple) inKey:
+        JSON serializable key identifying the query within its scope.
+
+        @param(list) inFilters:
+        ddPipeApi filters of the query.
+
+        @param(str) inOrder:
+        ddPipeApi order of the query, descending id if None.
+
+        @return(list):
+        List of ddPipeApi.DDPublishedFile.
+        '''
+
+        if inOrder is None:
+            inOrder = ddPipeApi.DDPublishedFile.DD_ORDER_ID_DESCENDING
+
+        startTime = time.time()
+        pathStr   = self.getCachePath( inScopeId ,
+                                       inKey     )
+        entry     = self.__read( pathStr )
+        state     = 'cold'
+
+        # Entries of other formats are filled again.
+        if entry is not None and 'ids' in entry:
+
+            if startTime - entry[ 'checkedTime' ] <= self.ttl:
+                state = 'warm'
+
+            else:
+                # Cheap check, a full query is only needed if a newer file
+                # has been published since the cache was filled.
+                latest = ddPipeApi.DDPublishedFile.getFirst(
+                    inFilters = inFilters                                          ,
+                    inOrder   = ddPipeApi.DDPublishedFile.DD_ORDER_ID_DESCENDING )
+
+                if ( latest.id if latest else None ) == entry[ 'maxId' ]:
+                    state = 'revalidated'
+
+                    entry[ 'checkedTime' ] = startTime
+                    self.__write( pathStr ,
+                                  entry   )
+
+        if state == 'cold':
+            publishedFiles = ddPipeApi.DDPublishedFile.getAll(
+                inFilters = inFilters ,
+                inOrder   = inOrder   )
+
+            ids = [ publishedFile.id for publishedFile in publishedFiles ]
+
+            self.__write( pathStr                                 ,
+                          { 'checkedTime' : startTime             ,
+                            'ids'         : ids                   ,
+                            'maxId'       : max( ids ) if ids else None } )
+
+        elif entry[ 'ids' ]:
+            publishedFiles = ddPipeApi.DDPublishedFile.getAll(
+                inFilters = [ ddPipeApi.DDPublishedFile.id.in_( entry[ 'ids' ] ) ] ,
+                inOrder   = inOrder                                               )
+
+        else:
+            publishedFiles = []
+
+        ddLogger.DD_NUKE.info(
+            'Published files query {} ( {} ) in {:.3f}s, {} files'.format(
+                inKey                                                    ,
+                state                                                    ,
+                time.time() - startTime                                  ,
+                len( publishedFiles )                                    ) )
+
+        return publishedFiles
+
+    def invalidate( self             ,
+                    inScopeId = None ):
+        '''Removes cached queries, to be called when publishing.
+
+        @param(int) inScopeId:
+        Id of the entity whose queries are removed, every query if None.
+
+        @return(int):
+        Number of removed cached queries.
+        '''
+
+        if not os.path.isdir( self.cacheDir ):
+            return 0
+
+        prefix  = '' if inScopeId is None else '{}_'.format( inScopeId )
+        removed = 0
+
+        for fileName in os.listdir( self.cacheDir ):
+
+            if not fileName.startswith( prefix ) or not fileName.endswith( '.json' ):
+                continue
+
+            try:
+                os.remove( os.path.join( self.cacheDir ,
+                                         fileName      ) )
+
+            except OSError:
+                continue
+
+            removed += 1
+
+        return removed
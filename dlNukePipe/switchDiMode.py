@@ -0,0 +1,445 @@
+################################################################################
+# L ATELIER ANIMATION INC.
+#
+# [2012] - [2020] L ATELIER ANIMATION INC. All Rights Reserved.
+#
+# NOTICE: All information contained herein is, and remains
+#         the property of L Atelier Animation Inc. and its suppliers,
+#         if any.  The intellectual and technical concepts contained
+#         herein are proprietary to L Atelier Animation Inc. and its
+#         suppliers and may be covered by Canadian, U.S. and/or
+#         Foreign Patents, patents in process, and are protected
+#         by trade secret or copyright law. Dissemination of this
+#         information or reproduction of this material is strictly
+#         forbidden unless prior written permission is obtained from
+#         L ATELIER ANIMATION INC.
+#
+################################################################################
+'''Cmd Module to switch tbvDiCreate and tbvDiOutput gizmos between
+Compositing and DI directly in .nk files, without Nuke.
+
+Usage:
+    python switchDiMode.py --mode DI /prod/seq/sq0010/comp
+
+@package dlNukePipe.switchDiMode
+@author  Esteban Ortega <esteban.ortega@latelieranimation.com>
+'''
+
+import argparse
+import multiprocessing
+import os
+import re
+import shutil
+import sys
+
+__all__ = ( 'DLSwitchDiMode' , )
+
+class DLSwitchDiMode( object ):
+    '''Edits mode knob of DI gizmos in .nk text. Nodes nested in groups are
+    written flat in .nk files, so every node block of the script is seen.
+    '''
+
+    ## Class names of the gizmos to switch.
+    # type: tuple[str]
+    DL_CLASS_NAMES = ( 'tbvDiOutput' ,
+                       'tbvDiCreate' )
+
+    ## Modes of the gizmos, by knob index. First one is the knob default,
+    ## which Nuke does not write in scripts.
+    # type: tuple[str]
+    DL_MODES = ( 'Compositing' ,
+                 'DI'          )
+
+    ## Name of the knob to switch.
+    # type: str
+    DL_KNOB_MODE = 'mode'
+
+    ## Regular expression matching the first line of a gizmo node block.
+    # type: re.RegexObject
+    DL_NODE_START_REGEX = re.compile(
+        r'^(\s*)({})\s*\{{\s*$'.format( '|'.join( DL_CLASS_NAMES ) ) )
+
+    ## Regular expression matching a knob line in a node block.
+    # type: re.RegexObject
+    DL_KNOB_REGEX = re.compile( r'^(\s+)(\w+)\s+(.*?)\s*$' )
+
+    @staticmethod
+    def getBraceDelta( inLineStr ):
+        '''Gets the brace depth change of a .nk line, ignoring escaped braces
+        and braces in double quoted strings.
+
+        @param(str) inLineStr:
+        Line of a .nk file.
+
+        @return(int):
+        Opened minus closed braces.
+        '''
+
+        delta   = 0
+        quoted  = False
+        escaped = False
+
+        for character in inLineStr:
+
+            if escaped:
+                escaped = False
+
+            elif character == '\\':
+                escaped = True
+
+            elif character == '"':
+                quoted = not quoted
+
+            elif quoted:
+                continue
+
+            elif character == '{':
+                delta += 1
+
+            elif character == '}':
+                delta -= 1
+
+        return delta
+
+    @classmethod
+    def getModeIndex( cls         ,
+                      inModeValue ):
+        '''Gets the index of a mode from its name or index.
+
+        @param(str) inModeValue:
+        Mode name or index, as written in .nk files or on command line.
+
+        @return(int):
+        Mode index.
+        '''
+
+        modeStr = str( inModeValue ).strip( '"{}' )
+
+        if modeStr.isdigit():
+            modeIndex = int( modeStr )
+
+        elif modeStr in cls.DL_MODES:
+            modeIndex = cls.DL_MODES.index( modeStr )
+
+        else:
+            raise ValueError( 'Unknown mode "{}"'.format( inModeValue ) )
+
+        if modeIndex >= len( cls.DL_MODES ):
+            raise ValueError( 'Unknown mode "{}"'.format( inModeValue ) )
+
+        return modeIndex
+
+    @classmethod
+    def switchText( cls         ,
+                    inTextStr   ,
+                    inModeIndex ):
+        '''Switches mode of every DI gizmo in .nk text.
+
+        @param(str) inTextStr:
+        Content of a .nk file.
+
+        @param(int) inModeIndex:
+        Index of the mode to switch to.
+
+        @return(tuple):
+        Tuple ( new text , number of switched nodes ).
+        '''
+
+        lines    = inTextStr.splitlines( True )
+        output   = []
+        switched = 0
+        index    = 0
+
+        while index < len( lines ):
+
+            line  = lines[ index ]
+            match = cls.DL_NODE_START_REGEX.match( line )
+            index += 1
+
+            output.append( line )
+
+            if match is None:
+                continue
+
+            # Collect the node block, up to its closing brace.
+            block = []
+            depth = 1
+
+            while index < len( lines ) and depth > 0:
+                depth += cls.getBraceDelta( lines[ index ] )
+                block.append( lines[ index ] )
+                index += 1
+
+            block , changed = cls.__switchBlock( block       ,
+                                                 inModeIndex )
+            switched += changed
+
+            output.extend( block )
+
+        return ''.join( output ) , switched
+
+    @classmethod
+    def __switchBlock( cls         ,
+                       inLines     ,
+                       inModeIndex ):
+        '''Switches mode knob in the lines of a node block.
+
+        @param(list) inLines:
+        Lines of the node block, closing brace included.
+
+        @param(int) inModeIndex:
+        Index of the mode to switch to.
+
+        @return(tuple):
+        Tuple ( new lines , 1 if switched else 0 ).
+        '''
+
+        lines     = list( inLines )
+        depth     = 1
+        modeLine  = None
+        nameLine  = None
+        indentStr = ' '
+        newline   = '\n'
+
+        for lineIndex , line in enumerate( lines ):
+
+            match = cls.DL_KNOB_REGEX.match( line ) if depth == 1 else None
+
+            if match:
+                indentStr = match.group( 1 )
+
+                if match.group( 2 ) == cls.DL_KNOB_MODE:
+                    modeLine = lineIndex
+
+                elif match.group( 2 ) == 'name' and nameLine is None:
+                    nameLine = lineIndex
+
+            if line.endswith( '\r\n' ):
+                newline = '\r\n'
+
+            depth += cls.getBraceDelta( line )
+
+        newLine = '{}{} {}{}'.format( indentStr                   ,
+                                      cls.DL_KNOB_MODE            ,
+                                      cls.DL_MODES[ inModeIndex ] ,
+                                      newline                     )
+
+        if modeLine is not None:
+            currentIndex = cls.getModeIndex(
+                cls.DL_KNOB_REGEX.match( lines[ modeLine ] ).group( 3 ) )
+
+            if currentIndex == inModeIndex:
+                return lines , 0
+
+            lines[ modeLine ] = newLine
+
+            return lines , 1
+
+        # Knob is at its default value when not written.
+        if inModeIndex == 0:
+            return lines , 0
+
+        # Knobs are written before the name, closing brace otherwise.
+        lines.insert( len( lines ) - 1 if nameLine is None else nameLine ,
+                      newLine                                            )
+
+        return lines , 1
+
+    @classmethod
+    def switchScript( cls                  ,
+                      inPathStr            ,
+                      inModeIndex          ,
+                      inDryRunBool = False ):
+        '''Switches mode of every DI gizmo in a .nk file, written in a
+        temporary file then renamed to be atomic.
+
+        @param(str) inPathStr:
+        Path of the .nk file.
+
+        @param(int) inModeIndex:
+        Index of the mode to switch to.
+
+        @param(bool) inDryRunBool:
+        If True the file is not written.
+
+        @return(int):
+        Number of switched nodes.
+        '''
+
+        with open( inPathStr ) as scriptFile:
+            textStr = scriptFile.read()
+
+        textStr , switched = cls.switchText( textStr     ,
+                                             inModeIndex )
+
+        if not switched or inDryRunBool:
+            return switched
+
+        tempPathStr = '{}.{}.tmp'.format( inPathStr   ,
+                                          os.getpid() )
+
+        try:
+            with open( tempPathStr , 'w' ) as scriptFile:
+                scriptFile.write( textStr )
+
+            shutil.copymode( inPathStr   ,
+                             tempPathStr )
+            os.rename( tempPathStr ,
+                       inPathStr   )
+
+        finally:
+            if os.path.exists( tempPathStr ):
+                os.remove( tempPathStr )
+
+        return switched
+
+    @staticmethod
+    def getScripts( inPaths ):
+        '''Gets .nk files from files and directories, searched recursively.
+
+        @param(list) inPaths:
+        List of .nk file or directory paths.
+
+        @return(list):
+        Sorted list of .nk file paths.
+        '''
+
+        scripts = set()
+
+        for pathStr in inPaths:
+
+            if os.path.isfile( pathStr ):
+                scripts.add( pathStr )
+
+                continue
+
+            for dirPathStr , _ , fileNames in os.walk( pathStr ):
+                for fileName in fileNames:
+                    if fileName.endswith( '.nk' ):
+                        scripts.add( os.path.join( dirPathStr ,
+                                                   fileName   ) )
+
+        return sorted( scripts )
+
+    @classmethod
+    def run( cls                    ,
+             inPaths                ,
+             inModeIndex            ,
+             inProcessesInt = None  ,
+             inDryRunBool   = False ):
+        '''Switches mode in every .nk file of passed paths in a process pool.
+
+        @param(list) inPaths:
+        List of .nk file or directory paths.
+
+        @param(int) inModeIndex:
+        Index of the mode to switch to.
+
+        @param(int) inProcessesInt:
+        Number of processes, number of cpus if None.
+
+        @param(bool) inDryRunBool:
+        If True files are not written.
+
+        @return(list):
+        List of tuple ( path , number of switched nodes , error str or None ).
+        '''
+
+        jobs = [ ( pathStr , inModeIndex , inDryRunBool )
+                 for pathStr in cls.getScripts( inPaths ) ]
+
+        pool = multiprocessing.Pool( inProcessesInt )
+
+        try:
+            return pool.map( _switchScriptJob ,
+                             jobs             )
+
+        finally:
+            pool.close()
+            pool.join()
+
+
+def _switchScriptJob( inJob ):
+    '''Process pool job switching a script, errors are returned instead of
+    raised so one bad script does not stop the others.
+
+    @param(tuple) inJob:
+    Tuple ( path , mode index , dry run bool ).
+
+    @return(tuple):
+    Tuple ( path , number of switched nodes , error str or None ).
+    '''
+
+    pathStr , modeIndex , dryRunBool = inJob
+
+    try:
+        return ( pathStr                                   ,
+                 DLSwitchDiMode.switchScript( pathStr    ,
+                                              modeIndex  ,
+                                              dryRunBool ) ,
+                 None                                      )
+
+    except ( IOError , OSError , ValueError ) as error:
+        return pathStr , 0 , str( error )
+
+
+def main( inArgs = None ):
+    '''Command line entry point.
+
+    @param(list) inArgs:
+    List of command line arguments, sys.argv if None.
+
+    @return(int):
+    Exit code, 1 if any script failed.
+    '''
+
+    parser = argparse.ArgumentParser(
+        description = 'Switch DI gizmos mode in .nk files.' )
+
+    parser.add_argument( 'paths'                                     ,
+                         nargs = '+'                                 ,
+                         help  = '.nk files or directories.'         )
+    parser.add_argument( '--mode'                                    ,
+                         required = True                             ,
+                         choices  = DLSwitchDiMode.DL_MODES          ,
+                         help     = 'Mode to switch to.'             )
+    parser.add_argument( '--processes'                               ,
+                         type    = int                               ,
+                         default = None                              ,
+                         help    = 'Number of processes.'            )
+    parser.add_argument( '--dry-run'                                 ,
+                         action = 'store_true'                       ,
+                         help   = 'Report without writing files.'    )
+
+    args = parser.parse_args( inArgs )
+
+    results = DLSwitchDiMode.run( args.paths                                ,
+                                  DLSwitchDiMode.getModeIndex( args.mode ) ,
+                                  args.processes                            ,
+                                  args.dry_run                              )
+
+    changed = 0
+    failed  = 0
+
+    for pathStr , switched , error in results:
+
+        if error is not None:
+            failed += 1
+            sys.stderr.write( 'FAILED  {}: {}\n'.format( pathStr ,
+                                                         error   ) )
+
+        elif switched:
+            changed += 1
+            sys.stdout.write( 'CHANGED {} ( {} nodes )\n'.format( pathStr  ,
+                                                                  switched ) )
+
+    sys.stdout.write( '{} scripts, {} changed, {} failed\n'.format(
+        len( results )                                             ,
+        changed                                                    ,
+        failed                                                     ) )
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit( main() )
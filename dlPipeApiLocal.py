@@ -0,0 +1,1209 @@
+################################################################################
+# L ATELIER ANIMATION INC.
+#
+# [2012] - [2020] L ATELIER ANIMATION INC. All Rights Reserved.
+#
+# NOTICE: All information contained herein is, and remains
+#         the property of L Atelier Animation Inc. and its suppliers,
+#         if any.  The intellectual and technical concepts contained
+#         herein are proprietary to L Atelier Animation Inc. and its
+#         suppliers and may be covered by Canadian, U.S. and/or
+#         Foreign Patents, patents in process, and are protected
+#         by trade secret or copyright law. Dissemination of this
+#         information or reproduction of this material is strictly
+#         forbidden unless prior written permission is obtained from
+#         L ATELIER ANIMATION INC.
+#
+################################################################################
+'''SQLite backed local stand-in for the ddPipeApi query surface used by the
+dl tools, to benchmark and regression test them without the production
+tracker. Every query goes through one connection which counts queries and
+can add an artificial latency per round trip.
+
+Usage:
+    import dlPipeApiLocal
+    dlPipeApiLocal.connect( '/tmp/pipe.sqlite' , inLatencyFloat = 0.05 )
+    dlPipeApiLocal.install()  # Registers the module as ddPipeApi.
+
+Seeding:
+    python dlPipeApiLocal.py /tmp/pipe.sqlite --sequences 20 --shots 40
+
+@package dlPipeApiLocal
+@author  Esteban Ortega <esteban.ortega@latelieranimation.com>
+'''
+
+import argparse
+import random
+import sqlite3
+import sys
+import threading
+import time
+
+__all__ = ( 'DDContext'               ,
+            'DDEntity'                ,
+            'DDEntityGroup'           ,
+            'DDLocalDatabase'         ,
+            'DDNomenclature'          ,
+            'DDProject'               ,
+            'DDPublishedFile'         ,
+            'DDSequence'              ,
+            'DDShot'                  ,
+            'DDStep'                  ,
+            'connect'                 ,
+            'getCurrentContext'       ,
+            'getCurrentContextEntity' ,
+            'getCurrentProject'       ,
+            'getDatabase'             ,
+            'install'                 ,
+            'nomenclature'            ,
+            'publishedFileType'       ,
+            'seed'                    ,
+            'setCurrentContext'       ,
+            'step'                    )
+
+class nomenclature( object ):
+    '''Nomenclature ids, mirrors ddPipeApi.nomenclature.
+    '''
+
+    DD_ID_LIGHTING    = 1
+    DD_ID_CONCEPT     = 2
+    DD_ID_REFERENCE   = 3
+    DD_ID_RENDER      = 4
+    DD_ID_GOBOMAP     = 5
+    DD_ID_ENVIRONMENT = 6
+    DD_ID_POV         = 7
+    DD_ID_COMPOSITING = 8
+
+class publishedFileType( object ):
+    '''Published file type ids, mirrors ddPipeApi.publishedFileType.
+    '''
+
+    DD_ID_JPG                   = 1
+    DD_ID_PNG                   = 2
+    DD_ID_EXR                   = 3
+    DD_ID_TEX                   = 4
+    DD_ID_NUKE                  = 5
+    DD_ID_GUERILLA_RENDER_GRAPH = 6
+
+class step( object ):
+    '''Step ids, mirrors ddPipeApi.step.
+    '''
+
+    DD_ID_SEQUENCE_LIGHTING = 1
+    DD_ID_SHOT_LIGHTING     = 2
+    DD_ID_COMPOSITING       = 3
+
+## Database schema.
+# type: str
+_DD_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS nomenclature (
+    id   INTEGER PRIMARY KEY ,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS step (
+    id   INTEGER PRIMARY KEY ,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entity (
+    id                 INTEGER PRIMARY KEY ,
+    kind               TEXT NOT NULL       ,
+    name               TEXT NOT NULL       ,
+    shortName          TEXT                ,
+    projectId          INTEGER             ,
+    sequenceId         INTEGER             ,
+    mainNomenclatureId INTEGER             ,
+    subNomenclatureId  INTEGER             ,
+    omitted            INTEGER DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS entityKind ON entity ( kind , projectId );
+CREATE INDEX IF NOT EXISTS entitySequence ON entity ( sequenceId );
+CREATE TABLE IF NOT EXISTS entityGroupShot (
+    entityGroupId INTEGER NOT NULL ,
+    shotId        INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entityGroupShotGroup ON entityGroupShot ( entityGroupId );
+CREATE TABLE IF NOT EXISTS publishedFile (
+    id                 INTEGER PRIMARY KEY ,
+    entityId           INTEGER NOT NULL    ,
+    mainNomenclatureId INTEGER             ,
+    subNomenclatureId  INTEGER             ,
+    type               INTEGER             ,
+    stepId             INTEGER             ,
+    token2             TEXT                ,
+    versionNumber      INTEGER             ,
+    localPath          TEXT                ,
+    workName           TEXT
+);
+CREATE INDEX IF NOT EXISTS publishedFileEntity ON publishedFile ( entityId , subNomenclatureId );
+'''
+
+## Current database connection.
+# type: DDLocalDatabase
+_DD_DATABASE = None
+
+## Current context.
+# type: DDContext
+_DD_CURRENT_CONTEXT = None
+
+
+class DDLocalDatabase( object ):
+    '''SQLite connection counting queries and adding an artificial latency
+    to each round trip.
+    '''
+
+    def __init__( self                 ,
+                  inPathStr            ,
+                  inLatencyFloat = 0.0 ):
+        '''Initialize class.
+
+        @param(str) inPathStr:
+        Path of the SQLite database, ':memory:' for an in memory one.
+
+        @param(float) inLatencyFloat:
+        Seconds slept on each query to simulate the tracker round trip.
+
+        @return(None):
+        No return value.
+        '''
+
+        ## Seconds slept on each query.
+        # type: float
+        self.latency = inLatencyFloat
+
+        ## Amount of queries executed since connection or last reset.
+        # type: int
+        self.queryCount = 0
+
+        ## Lock serializing access to the connection between threads.
+        # type: threading.Lock
+        self.__lock = threading.Lock()
+
+        ## SQLite connection.
+        # type: sqlite3.Connection
+        self.connection = sqlite3.connect( inPathStr                 ,
+                                           check_same_thread = False )
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript( _DD_SCHEMA )
+
+        return
+
+    def execute( self          ,
+                 inSqlStr      ,
+                 inParams = () ):
+        '''Executes a query, counted and delayed as a tracker round trip.
+
+        @param(str) inSqlStr:
+        SQL query.
+
+        @param(tuple) inParams:
+        Query parameters.
+
+        @return(list):
+        List of sqlite3.Row.
+        '''
+
+        if self.latency:
+            time.sleep( self.latency )
+
+        with self.__lock:
+            self.queryCount += 1
+
+            return self.connection.execute( inSqlStr ,
+                                            inParams ).fetchall()
+
+    def resetQueryCount( self ):
+        '''Resets the amount of executed queries.
+
+        @return(int):
+        Amount of queries executed before reset.
+        '''
+
+        with self.__lock:
+            queryCount , self.queryCount = self.queryCount , 0
+
+        return queryCount
+
+    def write( self          ,
+               inSqlStr      ,
+               inParams = () ):
+        '''Executes a write statement and commits it, counted as a query.
+
+        @param(str) inSqlStr:
+        SQL statement.
+
+        @param(tuple) inParams:
+        Statement parameters.
+
+        @return(int):
+        Id of the last inserted row.
+        '''
+
+        if self.latency:
+            time.sleep( self.latency )
+
+        with self.__lock:
+            self.queryCount += 1
+
+            cursor = self.connection.execute( inSqlStr ,
+                                              inParams )
+            self.connection.commit()
+
+            return cursor.lastrowid
+
+
+class DDFilter( object ):
+    '''Query filter built from a field comparison, like
+    DDPublishedFile.entity == shot or DDPublishedFile.type.in_( types ).
+    '''
+
+    def __init__( self          ,
+                  inColumnStr   ,
+                  inOperatorStr ,
+                  inValue       ):
+        '''Initialize class.
+
+        @param(str) inColumnStr:
+        Column name.
+
+        @param(str) inOperatorStr:
+        One of '=', '!=', 'IN'.
+
+        @param(object) inValue:
+        Compared value, a list for 'IN'.
+
+        @return(None):
+        No return value.
+        '''
+
+        self.column   = inColumnStr
+        self.operator = inOperatorStr
+        self.value    = inValue
+
+        return
+
+    def toSql( self ):
+        '''Converts the filter to a SQL condition.
+
+        @return(tuple):
+        Tuple ( condition str , list of parameters ).
+        '''
+
+        if self.operator == 'IN':
+            values = [ _toId( value ) for value in self.value ]
+
+            if not values:
+                return '0' , []
+
+            return ( '{} IN ({})'.format( self.column                    ,
+                                          ', '.join( '?' * len( values ) ) ) ,
+                     values                                                  )
+
+        value = _toId( self.value )
+
+        if value is None:
+            if self.operator == '=':
+                return '{} IS NULL'.format( self.column ) , []
+
+            return '{} IS NOT NULL'.format( self.column ) , []
+
+        return '{} {} ?'.format( self.column   ,
+                                 self.operator ) , [ value ]
+
+
+class DDField( object ):
+    '''Record field, compared at class level to build filters and read at
+    instance level to get the value, loading the record lazily.
+    '''
+
+    def __init__( self              ,
+                  inColumnStr       ,
+                  inTypeCls  = None ):
+        '''Initialize class.
+
+        @param(str) inColumnStr:
+        Column name.
+
+        @param(type) inTypeCls:
+        Record class the column id refers to, None for plain values.
+
+        @return(None):
+        No return value.
+        '''
+
+        self.column  = inColumnStr
+        self.typeCls = inTypeCls
+
+        return
+
+    def __eq__( self    ,
+                inValue ):
+        return DDFilter( self.column ,
+                         '='         ,
+                         inValue     )
+
+    def __ne__( self    ,
+                inValue ):
+        return DDFilter( self.column ,
+                         '!='        ,
+                         inValue     )
+
+    def __hash__( self ):
+        return id( self )
+
+    def __get__( self       ,
+                 inInstance ,
+                 inOwner    ):
+
+        if inInstance is None:
+            return self
+
+        value = inInstance._getColumn( self.column )
+
+        if value is None or self.typeCls is None:
+            return value
+
+        return self.typeCls( value )
+
+    def in_( self     ,
+             inValues ):
+        '''Builds a filter matching any of passed values.
+
+        @param(list) inValues:
+        Values to match.
+
+        @return(DDFilter):
+        Filter object.
+        '''
+
+        return DDFilter( self.column     ,
+                         'IN'            ,
+                         list( inValues ) )
+
+
+class _DDIdField( DDField ):
+    '''Id field, read on instances without loading the record row.
+    '''
+
+    def __get__( self       ,
+                 inInstance ,
+                 inOwner    ):
+
+        if inInstance is None:
+            return self
+
+        return inInstance._getId()
+
+
+def _toId( inValue ):
+    '''Converts records to their id for queries.
+
+    @param(object) inValue:
+    Record or plain value.
+
+    @return(object):
+    Record id or passed value.
+    '''
+
+    if isinstance( inValue , DDRecord ):
+        return inValue.id
+
+    return inValue
+
+
+class DDRecord( object ):
+    '''Base class of records, lazily loaded from their table by id.
+    '''
+
+    ## Ascending id order for getAll / getFirst.
+    # type: str
+    DD_ORDER_ID_ASCENDING = 'id ASC'
+
+    ## Descending id order for getAll / getFirst.
+    # type: str
+    DD_ORDER_ID_DESCENDING = 'id DESC'
+
+    ## Table of the record.
+    # type: str
+    _DD_TABLE = None
+
+    ## Kind of entity in entity table, None for other tables.
+    # type: str
+    _DD_KIND = None
+
+    ## Id of the record.
+    # type: int
+    id = _DDIdField( 'id' )
+
+    def __init__( self           ,
+                  inIdInt        ,
+                  inRow   = None ):
+        '''Initialize class.
+
+        @param(int) inIdInt:
+        Id of the record.
+
+        @param(sqlite3.Row) inRow:
+        Already fetched row, loaded on first access if None.
+
+        @return(None):
+        No return value.
+        '''
+
+        # Passed an existing record, or already initialized by
+        # DDEntity.__new__ resolving the entity kind.
+        if isinstance( inIdInt , DDRecord ) or '_DDRecord__id' in self.__dict__:
+            return
+
+        self.__id  = inIdInt
+        self.__row = inRow
+
+        return
+
+    def __eq__( self    ,
+                inOther ):
+
+        return ( isinstance( inOther , DDRecord )          and
+                 self._DD_TABLE == inOther._DD_TABLE       and
+                 self.id        == inOther.id              )
+
+    def __ne__( self    ,
+                inOther ):
+
+        return not self.__eq__( inOther )
+
+    def __hash__( self ):
+
+        return hash( ( self._DD_TABLE ,
+                       self.id        ) )
+
+    def __lt__( self    ,
+                inOther ):
+
+        return self.id < inOther.id
+
+    def __repr__( self ):
+
+        return '{}( {} )'.format( type( self ).__name__ ,
+                                  self.id               )
+
+    def _getColumn( self        ,
+                    inColumnStr ):
+        '''Gets a column value, loading the record row on first access.
+
+        @param(str) inColumnStr:
+        Column name.
+
+        @return(object):
+        Column value.
+        '''
+
+        if self.__row is None:
+            rows = getDatabase().execute(
+                'SELECT * FROM {} WHERE id = ?'.format( self._DD_TABLE ) ,
+                ( self.__id , )                                          )
+
+            if not rows:
+                raise ValueError( '{} {} does not exist'.format(
+                    type( self ).__name__                      ,
+                    self.__id                                  ) )
+
+            self.__row = rows[ 0 ]
+
+        return self.__row[ inColumnStr ]
+
+    def _getId( self ):
+        '''Gets the id of the record, without loading its row.
+
+        @return(int):
+        Record id.
+        '''
+
+        return self.__id
+
+    @classmethod
+    def getAll( cls              ,
+                inFilters = None ,
+                inOrder   = None ,
+                inFields  = None ,
+                inLimit   = None ):
+        '''Gets all records matching passed filters, in a single query.
+
+        @param(list) inFilters:
+        List of DDFilter, all combined with AND.
+
+        @param(str) inOrder:
+        DD_ORDER_ID_ASCENDING or DD_ORDER_ID_DESCENDING.
+
+        @param(list) inFields:
+        Accepted for compatibility, all fields are always fetched.
+
+        @param(int) inLimit:
+        Maximum amount of records.
+
+        @return(list):
+        List of records.
+        '''
+
+        conditions = []
+        params     = []
+
+        if cls._DD_KIND is not None:
+            conditions.append( 'kind = ?' )
+            params.append( cls._DD_KIND )
+
+        for dataFilter in inFilters or []:
+            condition , filterParams = dataFilter.toSql()
+            conditions.append( condition )
+            params.extend( filterParams )
+
+        sql = 'SELECT * FROM {}'.format( cls._DD_TABLE )
+
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join( conditions )
+
+        if inOrder:
+            sql += ' ORDER BY ' + inOrder
+
+        if inLimit:
+            sql += ' LIMIT {:d}'.format( inLimit )
+
+        return [ cls( row[ 'id' ] , row ) for row in getDatabase().execute(
+            sql                                                             ,
+            params                                                          ) ]
+
+    @classmethod
+    def getFirst( cls              ,
+                  inFilters = None ,
+                  inOrder   = None ,
+                  inFields  = None ):
+        '''Gets first record matching passed filters.
+
+        @param(list) inFilters:
+        List of DDFilter, all combined with AND.
+
+        @param(str) inOrder:
+        DD_ORDER_ID_ASCENDING or DD_ORDER_ID_DESCENDING.
+
+        @param(list) inFields:
+        Accepted for compatibility, all fields are always fetched.
+
+        @return(DDRecord):
+        First record, None if there is no match.
+        '''
+
+        records = cls.getAll( inFilters = inFilters ,
+                              inOrder   = inOrder   ,
+                              inLimit   = 1         )
+
+        if records:
+            return records[ 0 ]
+
+        return None
+
+
+class DDNomenclature( DDRecord ):
+    '''Nomenclature record.
+    '''
+
+    _DD_TABLE = 'nomenclature'
+
+    name = DDField( 'name' )
+
+
+class DDStep( DDRecord ):
+    '''Step record.
+    '''
+
+    _DD_TABLE = 'step'
+
+    name = DDField( 'name' )
+
+
+class DDEntity( DDRecord ):
+    '''Base class of tracker entities, DDEntity( entity ) returns passed
+    entity and DDEntity( id ) the entity of the right kind.
+    '''
+
+    _DD_TABLE = 'entity'
+
+    name = DDField( 'name' )
+
+    def __new__( cls            ,
+                 inIdInt        ,
+                 inRow   = None ):
+
+        if isinstance( inIdInt , DDEntity ):
+            return inIdInt
+
+        if cls is DDEntity:
+            if inRow is None:
+                rows = getDatabase().execute(
+                    'SELECT * FROM entity WHERE id = ?' ,
+                    ( inIdInt , )                       )
+
+                if not rows:
+                    raise ValueError( 'Entity {} does not exist'.format(
+                        inIdInt                                        ) )
+
+                inRow = rows[ 0 ]
+
+            cls = _DD_ENTITY_CLASSES[ inRow[ 'kind' ] ]
+
+            instance = object.__new__( cls )
+            instance.__init__( inIdInt ,
+                               inRow   )
+
+            return instance
+
+        return object.__new__( cls )
+
+
+class DDProject( DDEntity ):
+    '''Project entity.
+    '''
+
+    _DD_KIND = 'project'
+
+    shortName = DDField( 'shortName' )
+
+
+class DDSequence( DDEntity ):
+    '''Sequence entity.
+    '''
+
+    _DD_KIND = 'sequence'
+
+    project = DDField( 'projectId' ,
+                       DDProject   )
+
+    @property
+    def shots( self ):
+        '''Shots of the sequence.
+
+        @return(list):
+        List of DDShot ordered by name.
+        '''
+
+        return [ DDShot( row[ 'id' ] , row ) for row in getDatabase().execute(
+            'SELECT * FROM entity WHERE kind = ? AND sequenceId = ? '
+            'ORDER BY name'                                                  ,
+            ( DDShot._DD_KIND , self.id )                                    ) ]
+
+
+class DDShot( DDEntity ):
+    '''Shot entity.
+    '''
+
+    _DD_KIND = 'shot'
+
+    project  = DDField( 'projectId'  ,
+                        DDProject    )
+    sequence = DDField( 'sequenceId' ,
+                        DDSequence   )
+
+    def isOmitted( self ):
+        '''Checks if the shot is omitted.
+
+        @return(bool):
+        True if omitted, False otherwise.
+        '''
+
+        return bool( self._getColumn( 'omitted' ) )
+
+
+class _DDEntityGroupShots( object ):
+    '''Shots of an entity group, readable and writable on instances, usable
+    in inFields at class level.
+    '''
+
+    def __get__( self       ,
+                 inInstance ,
+                 inOwner    ):
+
+        if inInstance is None:
+            return self
+
+        return [ DDShot( row[ 'id' ] , row ) for row in getDatabase().execute(
+            'SELECT entity.* FROM entity JOIN entityGroupShot '
+            'ON entity.id = entityGroupShot.shotId '
+            'WHERE entityGroupShot.entityGroupId = ? ORDER BY entity.name'   ,
+            ( inInstance.id , )                                              ) ]
+
+    def __set__( self       ,
+                 inInstance ,
+                 inShots    ):
+
+        database = getDatabase()
+
+        database.write( 'DELETE FROM entityGroupShot WHERE entityGroupId = ?' ,
+                        ( inInstance.id , )                                   )
+
+        for shot in inShots:
+            database.write( 'INSERT INTO entityGroupShot VALUES ( ? , ? )' ,
+                            ( inInstance.id , _toId( shot ) )              )
+
+
+class DDEntityGroup( DDEntity ):
+    '''Entity group, environment or pov sharing a render graph between shots.
+    '''
+
+    _DD_KIND = 'entityGroup'
+
+    project          = DDField( 'projectId'          ,
+                                DDProject            )
+    mainNomenclature = DDField( 'mainNomenclatureId' ,
+                                DDNomenclature       )
+    subNomenclature  = DDField( 'subNomenclatureId'  ,
+                                DDNomenclature       )
+    shots            = _DDEntityGroupShots()
+
+
+## Entity classes by kind.
+# type: dict
+_DD_ENTITY_CLASSES = { cls._DD_KIND : cls for cls in ( DDProject     ,
+                                                       DDSequence    ,
+                                                       DDShot        ,
+                                                       DDEntityGroup ) }
+
+
+class DDWork( object ):
+    '''Work file a published file comes from.
+    '''
+
+    def __init__( self      ,
+                  inNameStr ):
+        '''Initialize class.
+
+        @param(str) inNameStr:
+        Name of the work file.
+
+        @return(None):
+        No return value.
+        '''
+
+        self.name = inNameStr
+
+        return
+
+
+class DDPublishedFile( DDRecord ):
+    '''Published file record.
+    '''
+
+    _DD_TABLE = 'publishedFile'
+
+    entity           = DDField( 'entityId'           ,
+                                DDEntity             )
+    mainNomenclature = DDField( 'mainNomenclatureId' ,
+                                DDNomenclature       )
+    subNomenclature  = DDField( 'subNomenclatureId'  ,
+                                DDNomenclature       )
+    type             = DDField( 'type' )
+    step             = DDField( 'stepId'             ,
+                                DDStep               )
+    token2           = DDField( 'token2' )
+    versionNumber    = DDField( 'versionNumber' )
+    localPath        = DDField( 'localPath' )
+
+    @property
+    def work( self ):
+        '''Work file the published file comes from.
+
+        @return(DDWork):
+        Work file object.
+        '''
+
+        return DDWork( self._getColumn( 'workName' ) )
+
+    def getContext( self ):
+        '''Gets the context of the published file entity.
+
+        @return(DDContext):
+        Context object.
+        '''
+
+        return DDContext( self.entity           ,
+                          self.mainNomenclature )
+
+
+class DDContext( object ):
+    '''Context of a shot or sequence, with its main nomenclature.
+    '''
+
+    def __init__( self                      ,
+                  inEntity                  ,
+                  inMainNomenclature = None ):
+        '''Initialize class.
+
+        @param(DDEntity) inEntity:
+        Shot, sequence or project of the context.
+
+        @param(DDNomenclature) inMainNomenclature:
+        Main nomenclature, lighting if None.
+
+        @return(None):
+        No return value.
+        '''
+
+        self.shot     = None
+        self.sequence = None
+        self.project  = None
+
+        if isinstance( inEntity , DDShot ):
+            self.shot     = inEntity
+            self.sequence = inEntity.sequence
+            self.project  = inEntity.project
+
+        elif isinstance( inEntity , DDSequence ):
+            self.sequence = inEntity
+            self.project  = inEntity.project
+
+        else:
+            self.project = inEntity
+
+        if inMainNomenclature is None:
+            inMainNomenclature = DDNomenclature( nomenclature.DD_ID_LIGHTING )
+
+        self.mainNomenclature = inMainNomenclature
+
+        return
+
+
+def connect( inPathStr            ,
+             inLatencyFloat = 0.0 ):
+    '''Connects the module to a SQLite database.
+
+    @param(str) inPathStr:
+    Path of the SQLite database, ':memory:' for an in memory one.
+
+    @param(float) inLatencyFloat:
+    Seconds slept on each query to simulate the tracker round trip.
+
+    @return(DDLocalDatabase):
+    Database connection.
+    '''
+
+    global _DD_DATABASE
+
+    _DD_DATABASE = DDLocalDatabase( inPathStr      ,
+                                    inLatencyFloat )
+
+    return _DD_DATABASE
+
+
+def getCurrentContext():
+    '''Gets current context, mirrors ddPipeApi.getCurrentContext.
+
+    @return(DDContext):
+    Current context, None if not set.
+    '''
+
+    return _DD_CURRENT_CONTEXT
+
+
+def getCurrentContextEntity():
+    '''Gets the entity of current context, mirrors
+    ddPipeApi.getCurrentContextEntity.
+
+    @return(DDEntity):
+    Shot, sequence or project of current context, None if not set.
+    '''
+
+    if _DD_CURRENT_CONTEXT is None:
+        return None
+
+    return ( _DD_CURRENT_CONTEXT.shot     or
+             _DD_CURRENT_CONTEXT.sequence or
+             _DD_CURRENT_CONTEXT.project  )
+
+
+def getCurrentProject():
+    '''Gets current project, mirrors ddPipeApi.getCurrentProject.
+
+    @return(DDProject):
+    Current project, None if there is no context.
+    '''
+
+    if _DD_CURRENT_CONTEXT is None:
+        return None
+
+    return _DD_CURRENT_CONTEXT.project
+
+
+def getDatabase():
+    '''Gets current database connection.
+
+    @return(DDLocalDatabase):
+    Database connection.
+    '''
+
+    if _DD_DATABASE is None:
+        raise RuntimeError( 'dlPipeApiLocal is not connected, call connect()' )
+
+    return _DD_DATABASE
+
+
+def install():
+    '''Registers this module as ddPipeApi, so tools importing ddPipeApi use
+    the local stand-in. Must be called before importing the tools.
+
+    @return(None):
+    No return value.
+    '''
+
+    sys.modules[ 'ddPipeApi' ] = sys.modules[ __name__ ]
+
+    return
+
+
+def setCurrentContext( inEntity                  ,
+                       inMainNomenclature = None ):
+    '''Sets current context.
+
+    @param(DDEntity) inEntity:
+    Shot, sequence or project of the context, None to reset it.
+
+    @param(DDNomenclature) inMainNomenclature:
+    Main nomenclature, lighting if None.
+
+    @return(DDContext):
+    New current context, None if reset.
+    '''
+
+    global _DD_CURRENT_CONTEXT
+
+    if inEntity is None:
+        _DD_CURRENT_CONTEXT = None
+
+        return None
+
+    _DD_CURRENT_CONTEXT = DDContext( inEntity           ,
+                                     inMainNomenclature )
+
+    return _DD_CURRENT_CONTEXT
+
+
+def seed( inProjectShortNameStr = 'demo' ,
+          inSequenceCount       = 10     ,
+          inShotCount           = 30     ,
+          inRenderVersionCount  = 5      ,
+          inReferenceCount      = 8      ,
+          inEntityGroupCount    = 4      ,
+          inGoboMapCount        = 20     ,
+          inRandomSeed          = 0      ):
+    '''Fills the connected database with a realistic project.
+
+    @param(str) inProjectShortNameStr:
+    Short name of the project.
+
+    @param(int) inSequenceCount:
+    Amount of sequences.
+
+    @param(int) inShotCount:
+    Amount of shots per sequence.
+
+    @param(int) inRenderVersionCount:
+    Maximum amount of published render versions per shot.
+
+    @param(int) inReferenceCount:
+    Amount of lightKey references per sequence.
+
+    @param(int) inEntityGroupCount:
+    Amount of entity groups per sequence.
+
+    @param(int) inGoboMapCount:
+    Amount of published gobo maps per sequence.
+
+    @param(int) inRandomSeed:
+    Seed of the random generator, for reproducible databases.
+
+    @return(DDProject):
+    Created project.
+    '''
+
+    randomGenerator = random.Random( inRandomSeed )
+    connection      = getDatabase().connection
+
+    def insert( inTableStr  ,
+                **inColumns ):
+        columns = sorted( inColumns )
+        cursor = connection.execute(
+            'INSERT INTO {} ( {} ) VALUES ( {} )'.format(
+                inTableStr                              ,
+                ', '.join( columns )                    ,
+                ', '.join( '?' * len( columns ) )       ) ,
+            [ inColumns[ column ] for column in columns ] )
+
+        return cursor.lastrowid
+
+    for namespace , table in ( ( nomenclature , 'nomenclature' ) ,
+                               ( step         , 'step'         ) ):
+        for attribute in dir( namespace ):
+            if attribute.startswith( 'DD_ID_' ):
+                connection.execute(
+                    'INSERT OR IGNORE INTO {} VALUES ( ? , ? )'.format( table ) ,
+                    ( getattr( namespace , attribute ) ,
+                      attribute[ 6: ].lower()          )                        )
+
+    projectId = insert( 'entity'                        ,
+                        kind      = DDProject._DD_KIND  ,
+                        name      = inProjectShortNameStr.capitalize() ,
+                        shortName = inProjectShortNameStr )
+
+    root = '/prod/{}'.format( inProjectShortNameStr )
+
+    for sequenceIndex in range( 1 , inSequenceCount + 1 ):
+
+        sequenceName = 'sq{:04d}'.format( sequenceIndex * 10 )
+        sequenceId   = insert( 'entity'                       ,
+                               kind      = DDSequence._DD_KIND ,
+                               name      = sequenceName        ,
+                               projectId = projectId           )
+
+        shotIds = []
+
+        for shotIndex in range( 1 , inShotCount + 1 ):
+            shotName = '{}_sh{:04d}'.format( sequenceName   ,
+                                             shotIndex * 10 )
+            shotId = insert( 'entity'                                  ,
+                             kind       = DDShot._DD_KIND              ,
+                             name       = shotName                     ,
+                             projectId  = projectId                    ,
+                             sequenceId = sequenceId                   ,
+                             omitted    = int( randomGenerator.random() < 0.05 ) )
+            shotIds.append( shotId )
+
+            for version in range( 1 , randomGenerator.randint( 0 , inRenderVersionCount ) + 1 ):
+                for token2 in ( None , 'denoise' ):
+                    insert( 'publishedFile'                                           ,
+                            entityId           = shotId                               ,
+                            mainNomenclatureId = nomenclature.DD_ID_LIGHTING          ,
+                            subNomenclatureId  = nomenclature.DD_ID_RENDER            ,
+                            type               = publishedFileType.DD_ID_EXR          ,
+                            stepId             = step.DD_ID_SHOT_LIGHTING             ,
+                            token2             = token2                               ,
+                            versionNumber      = version                              ,
+                            localPath          = '{}/{}/{}/render/v{:03d}/{}.%04d.exr'.format(
+                                root , sequenceName , shotName , version , shotName ) ,
+                            workName           = '{}_lighting_v{:03d}.gproject'.format(
+                                shotName , version )                                  )
+
+        for referenceIndex in range( 1 , inReferenceCount + 1 ):
+            insert( 'publishedFile'                                                 ,
+                    entityId           = sequenceId                                 ,
+                    mainNomenclatureId = randomGenerator.choice(
+                        ( nomenclature.DD_ID_LIGHTING , nomenclature.DD_ID_CONCEPT ) ) ,
+                    subNomenclatureId  = nomenclature.DD_ID_REFERENCE               ,
+                    type               = randomGenerator.choice(
+                        ( publishedFileType.DD_ID_JPG , publishedFileType.DD_ID_PNG ) ) ,
+                    stepId             = step.DD_ID_SEQUENCE_LIGHTING               ,
+                    versionNumber      = randomGenerator.randint( 1 , 4 )           ,
+                    localPath          = '{}/{}/reference/lightKey{:02d}.jpg'.format(
+                        root , sequenceName , referenceIndex )                      ,
+                    workName           = None                                       )
+
+        for groupIndex in range( 1 , inEntityGroupCount + 1 ):
+            groupId = insert( 'entity'                                          ,
+                              kind               = DDEntityGroup._DD_KIND       ,
+                              name               = '{}_{}'.format(
+                                  sequenceName , chr( ord( 'A' ) + groupIndex - 1 ) ) ,
+                              projectId          = projectId                    ,
+                              mainNomenclatureId = nomenclature.DD_ID_LIGHTING  ,
+                              subNomenclatureId  = randomGenerator.choice(
+                                  ( nomenclature.DD_ID_ENVIRONMENT ,
+                                    nomenclature.DD_ID_POV         ) )          )
+
+            for shotId in randomGenerator.sample( shotIds                          ,
+                                                  min( len( shotIds ) , 5 ) ):
+                connection.execute( 'INSERT INTO entityGroupShot VALUES ( ? , ? )' ,
+                                    ( groupId , shotId )                           )
+
+        for goboIndex in range( 1 , inGoboMapCount + 1 ):
+            for version in range( 1 , randomGenerator.randint( 1 , 3 ) + 1 ):
+                insert( 'publishedFile'                                            ,
+                        entityId           = sequenceId                            ,
+                        mainNomenclatureId = nomenclature.DD_ID_GOBOMAP            ,
+                        subNomenclatureId  = nomenclature.DD_ID_RENDER             ,
+                        type               = publishedFileType.DD_ID_TEX           ,
+                        stepId             = step.DD_ID_COMPOSITING                ,
+                        versionNumber      = version                               ,
+                        localPath          = '{}/{}/gobo/gobo{:02d}/v{:03d}/gobo{:02d}.tex'.format(
+                            root , sequenceName , goboIndex , version , goboIndex ) ,
+                        workName           = 'gobo{:02d}_v{:03d}.nk'.format(
+                            goboIndex , version )                                  )
+
+    connection.commit()
+
+    return DDProject( projectId )
+
+
+def main( inArgs = None ):
+    '''Command line entry point seeding a database.
+
+    @param(list) inArgs:
+    List of command line arguments, sys.argv if None.
+
+    @return(int):
+    Exit code.
+    '''
+
+    parser = argparse.ArgumentParser(
+        description = 'Seed a local ddPipeApi stand-in database.' )
+
+    parser.add_argument( 'path'                                   ,
+                         help = 'Path of the SQLite database.'    )
+    parser.add_argument( '--project'                              ,
+                         default = 'demo'                         ,
+                         help    = 'Project short name.'          )
+    parser.add_argument( '--sequences'                            ,
+                         type    = int                            ,
+                         default = 10                             ,
+                         help    = 'Amount of sequences.'         )
+    parser.add_argument( '--shots'                                ,
+                         type    = int                            ,
+                         default = 30                             ,
+                         help    = 'Amount of shots per sequence.' )
+    parser.add_argument( '--renderVersions'                       ,
+                         type    = int                            ,
+                         default = 5                              ,
+                         help    = 'Maximum render versions per shot.' )
+    parser.add_argument( '--references'                           ,
+                         type    = int                            ,
+                         default = 8                              ,
+                         help    = 'References per sequence.'     )
+    parser.add_argument( '--entityGroups'                         ,
+                         type    = int                            ,
+                         default = 4                              ,
+                         help    = 'Entity groups per sequence.'  )
+    parser.add_argument( '--goboMaps'                             ,
+                         type    = int                            ,
+                         default = 20                             ,
+                         help    = 'Gobo maps per sequence.'      )
+    parser.add_argument( '--seed'                                 ,
+                         type    = int                            ,
+                         default = 0                              ,
+                         help    = 'Random seed.'                 )
+
+    args = parser.parse_args( inArgs )
+
+    connect( args.path )
+
+    project = seed( inProjectShortNameStr = args.project       ,
+                    inSequenceCount       = args.sequences     ,
+                    inShotCount           = args.shots         ,
+                    inRenderVersionCount  = args.renderVersions ,
+                    inReferenceCount      = args.references    ,
+                    inEntityGroupCount    = args.entityGroups  ,
+                    inGoboMapCount        = args.goboMaps      ,
+                    inRandomSeed          = args.seed          )
+
+    sys.stdout.write( 'Seeded project {} ( id {} ) in {}\n'.format(
+        args.project                                              ,
+        project.id                                                ,
+        args.path                                                 ) )
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit( main() )
@@ -0,0 +1,28 @@
+################################################################################
+# L ATELIER ANIMATION INC.
+#
+# [2012] - [2020] L ATELIER ANIMATION INC. All Rights Reserved.
+#
+# NOTICE: All information contained herein is, and remains
+#         the property of L Atelier Animation Inc. and its suppliers,
+#         if any.  The intellectual and technical concepts contained
+#         herein are proprietary to L Atelier Animation Inc. and its
+#         suppliers and may be covered by Canadian, U.S. and/or
+#         Foreign Patents, patents in process, and are protected
+#         by trade secret or copyright law. Dissemination of this
+#         information or reproduction of this material is strictly
+#         forbidden unless prior written permission is obtained from
+#         L ATELIER ANIMATION INC.
+#
+################################################################################
+'''Pytest configuration, makes the repository packages importable.
+
+@package tests.conftest
+@author  Esteban Ortega <esteban.ortega@latelieranimation.com>
+'''
+
+import os
+import sys
+
+sys.path.insert( 0                                                  ,
+                 os.path.dirname( os.path.dirname( os.path.abspath( __file__ ) ) ) )
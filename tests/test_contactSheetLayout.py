@@ -0,0 +1,121 @@
+################################################################################
+# L ATELIER ANIMATION INC.
+#
+# [2012] - [2020] L ATELIER ANIMATION INC. All Rights Reserved.
+#
+# NOTICE: All information contained herein is, and remains
+#         the property of L Atelier Animation Inc. and its suppliers,
+#         if any.  The intellectual and technical concepts contained
+#         herein are proprietary to L Atelier Animation Inc. and its
+#         suppliers and may be covered by Canadian, U.S. and/or
+#         Foreign Patents, patents in process, and are protected
+#         by trade secret or copyright law. Dissemination of this
+#         information or reproduction of this material is strictly
+#         forbidden unless prior written permission is obtained from
+#         L ATELIER ANIMATION INC.
+#
+################################################################################
+'''Tests of the contact sheet layout math, no Nuke needed.
+
+@package tests.test_contactSheetLayout
+@author  Esteban Ortega <esteban.ortega@latelieranimation.com>
+'''
+
+import pytest
+
+import dlNukePipe.contactSheetLayout
+
+DLContactSheetLayout = dlNukePipe.contactSheetLayout.DLContactSheetLayout
+
+def test_singleInput():
+
+    layout = DLContactSheetLayout( 1         ,
+                                   16.0 / 9.0 )
+
+    assert ( layout.columns , layout.rows ) == ( 1 , 1 )
+    assert layout.tileWidth == DLContactSheetLayout.DL_MAX_TILE_WIDTH
+    assert ( layout.width , layout.height ) == ( layout.tileWidth  ,
+                                                 layout.tileHeight )
+    assert layout.getCell( 0 ) == ( 0 , 0 )
+
+def test_nonSquareCount():
+
+    layout = DLContactSheetLayout( 7   ,
+                                   1.0 )
+
+    assert layout.columns * layout.rows >= 7
+    assert layout.columns * ( layout.rows - 1 ) < 7
+    assert layout.width * layout.height <= DLContactSheetLayout.DL_MAX_PIXELS
+
+    # Last image starts a new row, in the first column.
+    row , column = divmod( 6              ,
+                           layout.columns )
+    assert layout.getCell( 6 ) == ( column * layout.tileWidth ,
+                                    row    * layout.tileHeight )
+
+    with pytest.raises( IndexError ):
+        layout.getCell( 7 )
+
+def test_pixelBudget():
+
+    layout = DLContactSheetLayout( 40                           ,
+                                   2.39                         ,
+                                   inMaxPixelsInt = 1920 * 1080 )
+
+    assert layout.tileWidth < DLContactSheetLayout.DL_MAX_TILE_WIDTH
+    assert layout.width * layout.height <= 1920 * 1080
+
+def test_mixedAspectRatios():
+
+    aspectRatios = [ 16.0 / 9.0 ,
+                     2.39       ,
+                     1.0        ,
+                     0.5        ]
+
+    layout = DLContactSheetLayout.fromAspectRatios( aspectRatios )
+
+    assert layout.count == len( aspectRatios )
+
+    for aspectRatio in aspectRatios:
+        width , height = layout.getFit( aspectRatio )
+
+        assert width  <= layout.tileWidth
+        assert height <= layout.tileHeight
+        assert width == layout.tileWidth or height == layout.tileHeight
+        assert abs( width / float( height ) - aspectRatio ) < 0.05 * aspectRatio
+
+    with pytest.raises( ValueError ):
+        DLContactSheetLayout.fromAspectRatios( [ 1.0 , 0.0 ] )
+
+def test_padding():
+
+    layout = DLContactSheetLayout( 6                           ,
+                                   1.0                         ,
+                                   inMaxPixelsInt = 1000 * 1000 ,
+                                   inGapInt       = 10          )
+
+    assert layout.width  == ( layout.columns * layout.tileWidth +
+                              ( layout.columns - 1 ) * 10       )
+    assert layout.height == ( layout.rows * layout.tileHeight +
+                              ( layout.rows - 1 ) * 10          )
+    assert layout.width * layout.height <= 1000 * 1000
+
+    assert layout.getCell( 1 ) == ( layout.tileWidth + 10 ,
+                                    0                     )
+    assert layout.getCell( layout.columns ) == ( 0                      ,
+                                                 layout.tileHeight + 10 )
+
+    with pytest.raises( ValueError ):
+        DLContactSheetLayout( 1             ,
+                              1.0           ,
+                              inGapInt = -1 )
+
+def test_invalidInputs():
+
+    with pytest.raises( ValueError ):
+        DLContactSheetLayout( 0   ,
+                              1.0 )
+
+    with pytest.raises( ValueError ):
+        DLContactSheetLayout( 1 ,
+                              0 )
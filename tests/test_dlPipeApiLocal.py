@@ -0,0 +1,68 @@
+################################################################################
+# L ATELIER ANIMATION INC.
+#
+# [2012] - [2020] L ATELIER ANIMATION INC. All Rights Reserved.
+#
+# NOTICE: All information contained herein is, and remains
+#         the property of L Atelier Animation Inc. and its suppliers,
+#         if any.  The intellectual and technical concepts contained
+#         herein are proprietary to L Atelier Animation Inc. and its
+#         suppliers and may be covered by Canadian, U.S. and/or
+#         Foreign Patents, patents in process, and are protected
+#         by trade secret or copyright law. Dissemination of this
+#         information or reproduction of this material is strictly
+#         forbidden unless prior written permission is obtained from
+#         L ATELIER ANIMATION INC.
+#
+################################################################################
+'''Smoke tests of the local ddPipeApi stand-in contexts.
+
+@package tests.test_dlPipeApiLocal
+@author  Esteban Ortega <esteban.ortega@latelieranimation.com>
+'''
+
+import pytest
+
+import dlPipeApiLocal
+
+@pytest.fixture
+def project():
+
+    dlPipeApiLocal.connect( ':memory:' )
+
+    yield dlPipeApiLocal.seed( inSequenceCount = 2 ,
+                               inShotCount     = 3 )
+
+    dlPipeApiLocal.setCurrentContext( None )
+
+def test_contextEntity( project ):
+
+    sequence = dlPipeApiLocal.DDSequence.getFirst(
+        inFilters = [ dlPipeApiLocal.DDSequence.project == project ] )
+    shot     = sequence.shots[ 0 ]
+
+    # Same checks as the gobo map setup path node, shot then sequence.
+    dlPipeApiLocal.setCurrentContext( shot )
+    entity = dlPipeApiLocal.getCurrentContextEntity()
+
+    assert isinstance( entity , dlPipeApiLocal.DDShot )
+    assert entity == shot
+
+    dlPipeApiLocal.setCurrentContext( sequence )
+    entity = dlPipeApiLocal.getCurrentContextEntity()
+
+    assert not isinstance( entity , dlPipeApiLocal.DDShot )
+    assert isinstance( entity , dlPipeApiLocal.DDSequence )
+    assert entity == sequence
+
+    dlPipeApiLocal.setCurrentContext( project )
+
+    assert dlPipeApiLocal.getCurrentContextEntity() == project
+
+def test_noContext():
+
+    dlPipeApiLocal.setCurrentContext( None )
+
+    assert dlPipeApiLocal.getCurrentContext() is None
+    assert dlPipeApiLocal.getCurrentContextEntity() is None
+    assert dlPipeApiLocal.getCurrentProject() is None
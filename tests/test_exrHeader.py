@@ -0,0 +1,117 @@
+################################################################################
+# L ATELIER ANIMATION INC.
+#
+# [2012] - [2020] L ATELIER ANIMATION INC. All Rights Reserved.
+#
+# NOTICE: All information contained herein is, and remains
+#         the property of L Atelier Animation Inc. and its suppliers,
+#         if any.  The intellectual and technical concepts contained
+#         herein are proprietary to L Atelier Animation Inc. and its
+#         suppliers and may be covered by Canadian, U.S. and/or
+#         Foreign Patents, patents in process, and are protected
+#         by trade secret or copyright law. Dissemination of this
+#         information or reproduction of this material is strictly
+#         forbidden unless prior written permission is obtained from
+#         L ATELIER ANIMATION INC.
+#
+################################################################################
+'''Tests of the OpenEXR header reader on generated headers.
+
+@package tests.test_exrHeader
+@author  Esteban Ortega <esteban.ortega@latelieranimation.com>
+'''
+
+import struct
+
+import pytest
+
+import dlGuerillaTools.exrHeader
+
+DLExrHeader = dlGuerillaTools.exrHeader.DLExrHeader
+
+def getAttribute( inNameStr ,
+                  inTypeStr ,
+                  inData    ):
+    '''Encodes an OpenEXR header attribute.
+    '''
+
+    return ( inNameStr.encode( 'latin-1' ) + b'\x00' +
+             inTypeStr.encode( 'latin-1' ) + b'\x00' +
+             struct.pack( '<i' , len( inData ) )     +
+             inData                                  )
+
+def getHeader( *inAttributes ):
+    '''Encodes a single part OpenEXR header, without offset tables.
+    '''
+
+    return ( DLExrHeader.DL_MAGIC       +
+             struct.pack( '<i' , 2 )    +
+             b''.join( inAttributes )   +
+             b'\x00'                    )
+
+@pytest.fixture
+def header():
+
+    upstreamFiles = b''.join( struct.pack( '<i' , len( path ) ) + path
+                              for path in ( b'/a/b.tex' , b'/c/d.tex' ) )
+
+    return getHeader( getAttribute( 'channels'                  ,
+                                    'int'                       ,
+                                    struct.pack( '<i' , 3 )     ) ,
+                      getAttribute( 'pixelAspectRatio'          ,
+                                    'float'                     ,
+                                    struct.pack( '<f' , 1.0 )   ) ,
+                      getAttribute( 'nuke/upstreamFiles'        ,
+                                    'stringvector'              ,
+                                    upstreamFiles               ) )
+
+def writeFile( inDirectory ,
+               inData      ):
+
+    path = inDirectory.join( 'image.exr' )
+    path.write_binary( inData )
+
+    return str( path )
+
+def test_attributes( tmpdir ,
+                     header ):
+
+    path = writeFile( tmpdir ,
+                      header )
+
+    exrHeader = DLExrHeader( path )
+
+    assert exrHeader.getAttribute( 'channels' ) == 3
+    assert exrHeader.getAttribute( 'pixelAspectRatio' ) == 1.0
+    assert exrHeader.types[ 'nuke/upstreamFiles' ] == 'stringvector'
+    assert DLExrHeader.getUpstreamFiles( path ) == '/a/b.tex, /c/d.tex'
+
+def test_truncated( tmpdir ,
+                    header ):
+
+    # Every cut, attribute sizes included, raises ValueError only.
+    for size in range( 8 , len( header ) ):
+        path = writeFile( tmpdir          ,
+                          header[ :size ] )
+
+        with pytest.raises( ValueError ):
+            DLExrHeader( path )
+
+def test_wrongAttributeSize( tmpdir ):
+
+    for typeName , data in ( ( 'int'    , b'\x01\x00' ) ,
+                             ( 'float'  , b'\x00' * 8 ) ,
+                             ( 'double' , b'\x00' * 4 ) ):
+        path = writeFile( tmpdir                                ,
+                          getHeader( getAttribute( 'value'  ,
+                                                   typeName ,
+                                                   data     ) ) )
+
+        with pytest.raises( ValueError ):
+            DLExrHeader( path )
+
+def test_truncatedStringVector():
+
+    with pytest.raises( ValueError ):
+        DLExrHeader.decode( 'stringvector'                      ,
+                            struct.pack( '<i' , 10 ) + b'short' )
@@ -0,0 +1,97 @@
+################################################################################
+# L ATELIER ANIMATION INC.
+#
+# [2012] - [2020] L ATELIER ANIMATION INC. All Rights Reserved.
+#
+# NOTICE: All information contained herein is, and remains
+#         the property of L Atelier Animation Inc. and its suppliers,
+#         if any.  The intellectual and technical concepts contained
+#         herein are proprietary to L Atelier Animation Inc. and its
+#         suppliers and may be covered by Canadian, U.S. and/or
+#         Foreign Patents, patents in process, and are protected
+#         by trade secret or copyright law. Dissemination of this
+#         information or reproduction of this material is strictly
+#         forbidden unless prior written permission is obtained from
+#         L ATELIER ANIMATION INC.
+#
+################################################################################
+'''Tests of the published file query cache against the local ddPipeApi
+stand-in.
+
+@package tests.test_queryCache
+@author  Esteban Ortega <esteban.ortega@latelieranimation.com>
+'''
+
+import logging
+import sys
+import types
+
+import pytest
+
+import dlPipeApiLocal
+
+dlPipeApiLocal.install()
+
+# Only the logger is needed from the studio libraries.
+try:
+    import ddLogger
+
+except ImportError:
+    ddLogger = types.ModuleType( 'ddLogger' )
+    ddLogger.DD_NUKE = logging.getLogger( 'ddLogger.nuke' )
+    sys.modules[ 'ddLogger' ] = ddLogger
+
+import dlNukePipe.queryCache
+
+@pytest.fixture
+def sequence():
+
+    dlPipeApiLocal.connect( ':memory:' )
+
+    project = dlPipeApiLocal.seed( inSequenceCount = 1 ,
+                                   inShotCount     = 3 )
+
+    return dlPipeApiLocal.DDSequence.getFirst(
+        inFilters = [ dlPipeApiLocal.DDSequence.project == project ] )
+
+def getFields( inPublishedFiles ):
+
+    return [ ( type( publishedFile )     ,
+               publishedFile.id            ,
+               publishedFile.versionNumber ,
+               publishedFile.localPath     ,
+               publishedFile.entity.id     ,
+               publishedFile.work.name     ) for publishedFile in inPublishedFiles ]
+
+def test_coldEqualsWarm( tmpdir   ,
+                         sequence ):
+
+    cache   = dlNukePipe.queryCache.DLQueryCache( str( tmpdir ) ,
+                                                  3600.0        )
+    filters = [ dlPipeApiLocal.DDPublishedFile.entity == sequence ]
+    key     = ( 'test' , )
+
+    cold = cache.getPublishedFiles( sequence.id ,
+                                    key         ,
+                                    filters     )
+
+    assert cold
+
+    dlPipeApiLocal.getDatabase().resetQueryCount()
+
+    warm = cache.getPublishedFiles( sequence.id ,
+                                    key         ,
+                                    filters     )
+
+    # Records are fetched back by id in a single query.
+    assert dlPipeApiLocal.getDatabase().resetQueryCount() == 1
+    assert getFields( warm ) == getFields( cold )
+
+    # Expired, the latest id did not change.
+    cache.ttl = -1.0
+
+    revalidated = cache.getPublishedFiles( sequence.id ,
+                                           key         ,
+                                           filters     )
+
+    assert getFields( revalidated ) == getFields( cold )